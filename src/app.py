@@ -1,26 +1,70 @@
 # src/app.py
 """Flask application handling HTTP requests for booking meeting rooms."""
 
-import uuid
-from flask import Flask, request, render_template, session, redirect, url_for
-from booking_agent.workflow import create_workflow
-from helper import dict_to_message, message_to_dict
+import copy
+import json
+import time
+from flask import (
+    Flask, Response, g, jsonify, request, render_template, session, redirect, url_for, stream_with_context
+)
+from langchain_core.messages import AIMessageChunk
+from booking_agent.workflow import create_workflow, FIND_MATCHING_ROOMS
 from booking_agent.prompt_config import DEFAULT_AGENT_STATE
-from config import FlaskConfig, logger
+from booking_agent.llm_cache import PARSE_CACHE
+from mock_apis.bulk_booking import bulk_book
+from session_store import create_session_interface
+from metrics import REGISTRY, REQUEST_SECONDS, PARSE_CACHE_STATS, CONTENT_TYPE
+from config import FlaskConfig, logger, BULK_BOOKING_MAX_ITEMS
 
 app = Flask(__name__)
 app.config.from_object(FlaskConfig)
+# Keep agent state on the server, only the signed session id goes in the cookie
+app.session_interface = create_session_interface()
 
 # Initialize workflow
 workflow = create_workflow()
 
+# Nodes whose LLM tokens are user-facing text and streamed to the browser
+STREAMED_NODES = {FIND_MATCHING_ROOMS}
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
 @app.before_request
 def initialize_session():
     """Ensure session and agent_state are properly initialized"""
+    if request.endpoint in ("metrics", "static", "booking_bulk"):
+        return
     if 'session_id' not in session:
-        session['session_id'] = str(uuid.uuid4())
+        session['session_id'] = session.sid
     if 'agent_state' not in session:
-        session['agent_state'] = DEFAULT_AGENT_STATE.copy()
+        session['agent_state'] = copy.deepcopy(DEFAULT_AGENT_STATE)
+
+@app.teardown_request
+def record_request_duration(exc=None):
+    """End-to-end latency; for streamed replies this runs once the stream ends."""
+    started = g.pop("request_started", None)
+    if started is not None and request.endpoint not in (None, "static", "metrics"):
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=request.endpoint)
+
+def latest_assistant_message(messages):
+    """Return the content of the latest assistant message, if any."""
+    for msg in reversed(messages):
+        if msg.type == "system" or msg.type == "assistant":
+            return msg.content
+    return None
+
+def sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route("/metrics")
+def metrics():
+    """Latency histograms and cache statistics in the Prometheus text format."""
+    for stat, value in PARSE_CACHE.stats().items():
+        PARSE_CACHE_STATS.set(value, stat=stat)
+    return Response(REGISTRY.render(), mimetype=None, content_type=CONTENT_TYPE)
 
 @app.route("/")
 def home():
@@ -40,22 +84,72 @@ def booking():
     # Load existing session
     # Update user input in the session
     session['agent_state']['user_input'] = request.form['user_input']
-    # Convert serialized messages (JSON) back to objects for LLM response
-    session['agent_state']['messages'] = [dict_to_message(msg) for msg in session['agent_state']['messages']]
 
     ######################## Process through workflow ########################
     logger.info(" >>>>> Processing through workflow, user input: %s")#, session['agent_state'])
-    response = workflow.invoke(session['agent_state'])
+    session['agent_state'].update(workflow.invoke(session['agent_state']))
     # 1. save LLM response to agent state in the session and 
     # Extract only the latest assistant message
-    assistant_message = None
-    for msg in reversed(session['agent_state']['messages']):
-        if msg.type == "system" or msg.type == "assistant":
-            assistant_message = msg.content
-            break    
-    # 2. Convert messages to serializable format (JSON) for Flask session
-    session['agent_state']['messages'] = [
-        message_to_dict(msg) for msg in session['agent_state']['messages']
-        ]
+    assistant_message = latest_assistant_message(session['agent_state']['messages'])
+    # 2. Messages stay as objects in the server-side session
     session.modified = True
     return render_template('index.html', response=assistant_message)
+
+@app.route('/booking/stream', methods=['POST'])
+def booking_stream():
+    """
+    Streaming variant of `/booking`: LLM tokens of user-facing nodes are sent as
+    `token` Server-Sent Events while the workflow runs, then the final assistant
+    reply is sent as a `message` event.
+    """
+    agent_state = session['agent_state']
+    agent_state['user_input'] = request.form['user_input']
+
+    def generate():
+        logger.info(" >>>>> Streaming through workflow")
+        final_state = agent_state
+        try:
+            for mode, chunk in workflow.stream(agent_state, stream_mode=["messages", "values"]):
+                if mode == "messages":
+                    token, metadata = chunk
+                    # Whole messages of the node's output come after its chunks, skip them
+                    if (metadata.get("langgraph_node") in STREAMED_NODES
+                            and isinstance(token, AIMessageChunk) and token.content):
+                        yield sse_event("token", {"content": token.content})
+                else:
+                    final_state = chunk
+        except Exception as e:
+            logger.error(f"Streaming workflow failed: {str(e)}")
+            yield sse_event("error", {"content": "Sorry! we are out of service now."})
+            return
+
+        assistant_message = latest_assistant_message(final_state['messages'])
+        # Headers (and the usual session save) went out before the body
+        session['agent_state'] = {**agent_state, **final_state}
+        app.session_interface.persist(app, session)
+        yield sse_event("message", {"content": assistant_message})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route('/booking/bulk', methods=['POST'])
+def booking_bulk():
+    """
+    Book many meetings in one request, without the conversational workflow.
+    The JSON body is `{"items": [...]}` (see `bulk_book` for the item fields);
+    the reply holds one result per item.
+    """
+    payload = request.get_json(silent=True)
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return jsonify({"error": 'Expected a JSON body {"items": [{...}, ...]}'}), 400
+    if len(items) > BULK_BOOKING_MAX_ITEMS:
+        return jsonify({"error": f"At most {BULK_BOOKING_MAX_ITEMS} items per request"}), 400
+
+    logger.info(" >>>>> Bulk booking of %d meetings", len(items))
+    results = bulk_book(items)
+    booked = sum(result["status"] == "booked" for result in results)
+    return jsonify({"booked": booked, "failed": len(results) - booked, "results": results})
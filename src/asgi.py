@@ -0,0 +1,124 @@
+# src/asgi.py
+"""
+ASGI entry point. `POST /booking/async` runs the async workflow with
+`workflow.ainvoke`, so a single process can hold many conversations waiting
+on the LLM at once. Every other route is served by the Flask app, and both
+share the server-side session store and session cookie.
+
+    uvicorn asgi:application --app-dir src --port 5001
+"""
+import copy
+import json
+import time
+import asyncio
+from http.cookies import SimpleCookie
+from typing import Optional
+from weakref import WeakValueDictionary
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app, latest_assistant_message
+from booking_agent.workflow import create_workflow
+from booking_agent.prompt_config import DEFAULT_AGENT_STATE
+from session_store import ServerSideSession
+from metrics import REQUEST_SECONDS
+from config import logger
+
+async_workflow = create_workflow(use_async=True)
+flask_asgi = WsgiToAsgi(flask_app)
+session_interface = flask_app.session_interface
+SESSION_COOKIE = session_interface.get_cookie_name(flask_app)
+
+# One lock per session so turns of the same conversation run one at a time.
+# Locks are dropped once no request holds them.
+_session_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+
+async def read_body(receive) -> bytes:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def send_json(send, status: int, payload: dict, headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def session_id_from_scope(scope) -> Optional[str]:
+    """Session id from the signed session cookie, if valid."""
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            cookie = SimpleCookie(value.decode())
+            if SESSION_COOKIE in cookie:
+                return session_interface.unsign_sid(flask_app, cookie[SESSION_COOKIE].value)
+    return None
+
+
+async def booking_async(scope, receive, send):
+    """
+    JSON API: `{"user_input": "..."}` -> `{"response": "...", "session_id": "..."}`.
+    """
+    try:
+        user_input = json.loads(await read_body(receive))["user_input"]
+    except (ValueError, KeyError, TypeError):
+        await send_json(send, 400, {"error": "Expected a JSON body with 'user_input'."})
+        return
+
+    sid = session_id_from_scope(scope)
+    session = None if sid else ServerSideSession(new=True)
+    lock = _session_locks.setdefault(sid or session.sid, asyncio.Lock())
+    async with lock:
+        if session is None:
+            data = session_interface.backend.get(sid)
+            session = ServerSideSession(data, sid=sid) if data is not None else ServerSideSession(new=True)
+        if "agent_state" not in session:
+            session["session_id"] = session.sid
+            session["agent_state"] = copy.deepcopy(DEFAULT_AGENT_STATE)
+        agent_state = session["agent_state"]
+        agent_state["user_input"] = user_input
+        try:
+            agent_state.update(await async_workflow.ainvoke(agent_state))
+        except Exception as e:
+            logger.error(f"Async workflow failed: {str(e)}")
+            await send_json(send, 500, {"error": "Sorry! we are out of service now."})
+            return
+        session_interface.persist(flask_app, session)
+
+    headers = []
+    if session.new:
+        cookie = (f"{SESSION_COOKIE}={session_interface.sign_sid(flask_app, session.sid)}; "
+                  "Path=/; HttpOnly; SameSite=Lax")
+        headers.append((b"set-cookie", cookie.encode()))
+    await send_json(
+        send, 200,
+        {"response": latest_assistant_message(agent_state["messages"]), "session_id": session.sid},
+        headers=headers,
+    )
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] == "http" and scope["path"] == "/booking/async" and scope["method"] == "POST":
+        started = time.perf_counter()
+        await booking_async(scope, receive, send)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint="booking_async")
+    else:
+        await flask_asgi(scope, receive, send)
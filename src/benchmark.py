@@ -0,0 +1,356 @@
+# src/benchmark.py
+"""
+Micro-benchmarks of the booking and room-search hot paths on synthetic data.
+
+Each scenario generates a room catalog and a booking history in a temporary
+directory, then times the tools, the booking file I/O and the workflow nodes
+(with a stub LLM) in a fresh interpreter pointed at that data. Results are
+written as JSON so runs can be compared across commits.
+
+    python src/benchmark.py --scenarios small medium --json logs/benchmark.json
+    python src/benchmark.py --rooms 5000 --bookings 200000
+    python src/benchmark.py --json logs/new.json --compare logs/benchmark.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# (rooms, bookings) per named scenario; xlarge is only run when asked for
+SCENARIOS = {
+    "small": (100, 1_000),
+    "medium": (1_000, 100_000),
+    "large": (10_000, 1_000_000),
+    "xlarge": (100_000, 10_000_000),
+}
+DEFAULT_SCENARIOS = ["small", "medium", "large"]
+
+BASE_EQUIPMENTS = [
+    "Projector", "4K Projector", "Whiteboard", "Smart Board", "Conference Phone",
+    "Video Conferencing", "TV Screen", "Sound System", "Microphone", "Webcam",
+    "Charging Stations", "Mini Fridge", "Coffee Machine", "Plants", "Natural Light",
+    "White Noise Machine", "Whiteboard Walls", "Standing Desks", "Bean Bags", "Flip Chart",
+]
+EQUIPMENTS = BASE_EQUIPMENTS + [f"Equipment {i}" for i in range(1, 31)]
+CAPACITIES = [2, 4, 6, 8, 10, 12, 15, 20, 30, 50]
+NAMES = ["Heba", "Tarek Nasr", "Yasmin El-Sayed", "Omar", "Lina", "Karim", "Sara", "Youssef"]
+BOOKINGS_START = datetime(2025, 1, 6, 8, 0)
+
+
+##==============================================================================
+# SYNTHETIC DATA
+##==============================================================================
+def generate_rooms(num_rooms: int, rng: random.Random) -> List[Dict]:
+    """Rooms with a random capacity and 1 to 5 pieces of equipment."""
+    return [
+        {
+            "id": room_id,
+            "name": f"Room {room_id}",
+            "capacity": rng.choice(CAPACITIES),
+            "equipments": rng.sample(EQUIPMENTS, rng.randint(1, 5)),
+        }
+        for room_id in range(1, num_rooms + 1)
+    ]
+
+def write_bookings(filepath: Path, num_rooms: int, num_bookings: int, rng: random.Random):
+    """
+    Write a bookings snapshot with `num_bookings` spread over the rooms. Bookings
+    of a room are sequential, non-overlapping and 0.5 to 3 hours long. The file
+    is streamed room by room so 10M bookings don't have to fit in memory twice.
+    """
+    per_room, extra = divmod(num_bookings, num_rooms)
+    with open(filepath, "w") as f:
+        f.write("{")
+        for room_id in range(1, num_rooms + 1):
+            count = per_room + (1 if room_id <= extra else 0)
+            start = BOOKINGS_START + timedelta(minutes=30 * rng.randint(0, 16))
+            bookings = []
+            for _ in range(count):
+                end = start + timedelta(minutes=30 * rng.randint(1, 6))
+                bookings.append({
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                    "booked_by": rng.choice(NAMES),
+                })
+                start = end + timedelta(minutes=30 * rng.randint(1, 16))
+            f.write(("" if room_id == 1 else ",") + json.dumps(str(room_id)) + ":" + json.dumps(bookings))
+        f.write("}")
+
+
+##==============================================================================
+# TIMING
+##==============================================================================
+def measure(fn: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict[str, float]:
+    """
+    Call `fn` `repeat` times and return timing statistics in milliseconds.
+    `setup` runs before each call, outside the timed section; its result is
+    passed to `fn`.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        started = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "repeat": repeat,
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+        "mean_ms": statistics.fmean(timings),
+    }
+
+
+##==============================================================================
+# WORKER: runs in a fresh interpreter with ROOMS_FILE / BOOKINGS_FILE set
+##==============================================================================
+def run_worker(num_rooms: int, num_bookings: int, seed: int) -> Dict[str, Dict]:
+    import copy
+    import logging
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    import config  # configures logging at INFO, lowered for the benchmark
+    logging.getLogger().setLevel(logging.WARNING)
+    from mock_apis import booking_services
+    from mock_apis.booking_services import (
+        load_bookings, save_bookings_tool, check_time_conflict_tool, get_booking_index,
+    )
+    from mock_apis.room_catalog import RoomCatalog
+    from mock_apis.room_services import load_rooms, find_matching_rooms_tool, find_similar_rooms_tool
+    from booking_agent import nodes
+    from booking_agent.llm_cache import PARSE_CACHE
+    from booking_agent.prompt_config import DEFAULT_AGENT_STATE
+
+    rng = random.Random(seed)
+    results: Dict[str, Dict] = {}
+    heavy_repeat = 1 if num_bookings >= 1_000_000 else 3
+
+    # ---- Booking file I/O and index ----
+    results["load_bookings"] = measure(load_bookings, heavy_repeat)
+    bookings = load_bookings()
+
+    def build_index():
+        booking_services._BOOKING_INDEXES.clear()
+        get_booking_index()
+    results["build_booking_index"] = measure(build_index, heavy_repeat)
+    index = get_booking_index()
+
+    def random_slot():
+        start = BOOKINGS_START + timedelta(days=rng.randint(0, 60), minutes=30 * rng.randint(0, 20))
+        return str(rng.randint(1, num_rooms)), start.isoformat(), rng.choice([0.5, 1, 2])
+
+    results["check_time_conflict_tool[index]"] = measure(
+        lambda args: check_time_conflict_tool(index, args[0], args[1], duration_hours=args[2]),
+        1000, setup=random_slot,
+    )
+    results["check_time_conflict_tool[dict]"] = measure(
+        lambda args: check_time_conflict_tool(bookings, args[0], args[1], duration_hours=args[2]),
+        1000, setup=random_slot,
+    )
+
+    def new_booking():
+        start = BOOKINGS_START + timedelta(days=rng.randint(400, 800), hours=rng.randint(0, 10))
+        booking = {"start_time": start.isoformat(),
+                   "end_time": (start + timedelta(hours=1)).isoformat(),
+                   "booked_by": rng.choice(NAMES)}
+        return str(rng.randint(1, num_rooms)), booking
+    results["save_bookings_tool"] = measure(lambda args: save_bookings_tool(*args), 50, setup=new_booking)
+
+    # ---- Room search ----
+    rooms = load_rooms()
+    results["build_room_catalog"] = measure(lambda: RoomCatalog(rooms), 3)
+    catalog = RoomCatalog(rooms)
+
+    def random_requirements():
+        return rng.choice(CAPACITIES), rng.sample(BASE_EQUIPMENTS, rng.randint(0, 2))
+    results["find_matching_rooms_tool"] = measure(
+        lambda args: find_matching_rooms_tool(catalog, capacity=args[0], equipments=args[1]),
+        1000, setup=random_requirements,
+    )
+    # The scan stops early once the best rooms have every requested equipment, so
+    # p95 (requests few rooms fully match) is the figure to watch, not the median
+    results["find_similar[any capacity]"] = measure(
+        lambda equipments: catalog.find_similar(0, equipments),
+        1000, setup=lambda: rng.sample(BASE_EQUIPMENTS, rng.randint(1, 3)),
+    )
+    # Rooms for 10 or more: the capacity cut still leaves ~60% of the catalog to score
+    results["find_similar[capacity>=10]"] = measure(
+        lambda equipments: catalog.find_similar(10, equipments),
+        1000, setup=lambda: rng.sample(BASE_EQUIPMENTS, rng.randint(1, 3)),
+    )
+    results["find_similar_rooms_tool"] = measure(
+        lambda args: find_similar_rooms_tool.invoke({"capacity": args[0], "equipments": args[1]}),
+        200, setup=random_requirements,
+    )
+
+    # ---- Workflow nodes with a stub LLM ----
+    start = BOOKINGS_START + timedelta(days=900, hours=2)
+    parsed_request = {
+        "start_date": start.strftime("%Y-%m-%d"),
+        "start_time": start.strftime("%I:%M:%S %p"),
+        "duration_hours": 1,
+        "capacity": 4,
+        "equipments": [BASE_EQUIPMENTS[2]],
+        "user_name": "Heba",
+        "clarification_needed": False,
+        "clarification_question": None,
+    }
+    stub_llm = FakeListChatModel(responses=[json.dumps(parsed_request)])
+    base_state = copy.deepcopy(DEFAULT_AGENT_STATE)
+    base_state.update({
+        # Not parseable by the fast path, so the (stub) LLM chain runs
+        "user_input": "Book something for our team meeting, same details as last time",
+        "parsed_request": dict(parsed_request),
+    })
+    matching_rooms = find_matching_rooms_tool(catalog, capacity=4, equipments=parsed_request["equipments"])
+    base_state["matching_rooms"] = matching_rooms
+    base_state["alternative_rooms"] = matching_rooms[:3]
+    base_state["selected_room"] = matching_rooms[0] if matching_rooms else rooms[0]
+    base_state["booking_result"] = True
+
+    def fresh_state():
+        PARSE_CACHE.clear()
+        return copy.deepcopy(base_state)
+
+    def clarification_state():
+        state = fresh_state()
+        state["parsed_request"].update(start_date=None, clarification_needed=True,
+                                       clarification_question="What date should I book the room for?")
+        return state
+
+    def booking_state():
+        state = fresh_state()
+        slot = BOOKINGS_START + timedelta(days=rng.randint(1000, 5000), hours=rng.randint(0, 10))
+        state["parsed_request"]["start_date"] = slot.strftime("%Y-%m-%d")
+        state["parsed_request"]["start_time"] = slot.strftime("%I:%M:%S %p")
+        state["selected_room"] = rng.choice(rooms)
+        return state
+
+    node_benchmarks = {
+        "parse_request": (lambda state: nodes.parse_request(state, stub_llm), fresh_state),
+        "find_matching_rooms": (lambda state: nodes.find_matching_rooms(state, stub_llm), fresh_state),
+        "find_booking_options": (nodes.find_booking_options, fresh_state),
+        "search_alternative_rooms": (nodes.search_alternative_rooms, fresh_state),
+        "select_room": (nodes.select_room, fresh_state),
+        "confirm_booking": (nodes.confirm_booking, booking_state),
+        "inform_user": (nodes.inform_user, fresh_state),
+        "ask_clarification": (nodes.ask_clarification, clarification_state),
+        "handle_error": (nodes.handle_error, fresh_state),
+    }
+    for name, (node, setup) in node_benchmarks.items():
+        results[f"node:{name}"] = measure(node, 50, setup=setup)
+    return results
+
+
+##==============================================================================
+# DRIVER
+##==============================================================================
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_scenario(name: str, num_rooms: int, num_bookings: int, seed: int) -> Dict:
+    """Generate the scenario's data and benchmark it in a subprocess."""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix=f"benchmark-{name}-") as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        started = time.perf_counter()
+        (tmp_dir / "rooms.json").write_text(json.dumps(generate_rooms(num_rooms, rng)))
+        write_bookings(tmp_dir / "bookings.json", num_rooms, num_bookings, rng)
+        generate_seconds = time.perf_counter() - started
+
+        env = dict(os.environ,
+                   ROOMS_FILE=str(tmp_dir / "rooms.json"),
+                   BOOKINGS_FILE=str(tmp_dir / "bookings.json"),
+                   BOOKING_BACKEND="json")
+        output = tmp_dir / "results.json"
+        subprocess.run(
+            [sys.executable, __file__, "--worker", "--rooms", str(num_rooms),
+             "--bookings", str(num_bookings), "--seed", str(seed), "--worker-output", str(output)],
+            cwd=SRC_DIR, env=env, check=True,
+        )
+        results = json.loads(output.read_text())
+    return {
+        "name": name,
+        "rooms": num_rooms,
+        "bookings": num_bookings,
+        "generate_seconds": generate_seconds,
+        "results": results,
+    }
+
+def print_report(report: Dict, baseline: Optional[Dict] = None):
+    previous = {
+        (scenario["name"], op): stats["median_ms"]
+        for scenario in (baseline or {}).get("scenarios", [])
+        for op, stats in scenario["results"].items()
+    }
+    for scenario in report["scenarios"]:
+        print(f"\n{scenario['name']}: {scenario['rooms']} rooms, {scenario['bookings']} bookings")
+        print(f"{'operation':<40} {'median ms':>11} {'p95 ms':>11}" + (f" {'vs base':>9}" if baseline else ""))
+        for op, stats in scenario["results"].items():
+            line = f"{op:<40} {stats['median_ms']:>11.3f} {stats['p95_ms']:>11.3f}"
+            base = previous.get((scenario["name"], op))
+            if base:
+                line += f" {stats['median_ms'] / base:>8.2f}x"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), help="Named scenarios to run")
+    parser.add_argument("--rooms", type=int, help="Custom scenario: number of rooms")
+    parser.add_argument("--bookings", type=int, help="Custom scenario: number of bookings")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic data")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare medians with")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        results = run_worker(args.rooms, args.bookings, args.seed)
+        args.worker_output.write_text(json.dumps(results))
+        return
+
+    if args.rooms and args.bookings:
+        scenarios = {"custom": (args.rooms, args.bookings)}
+    else:
+        scenarios = {name: SCENARIOS[name] for name in (args.scenarios or DEFAULT_SCENARIOS)}
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "scenarios": [],
+    }
+    for name, (num_rooms, num_bookings) in scenarios.items():
+        print(f"Running {name} ({num_rooms} rooms, {num_bookings} bookings)...", flush=True)
+        report["scenarios"].append(run_scenario(name, num_rooms, num_bookings, args.seed))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
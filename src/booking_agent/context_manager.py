@@ -0,0 +1,84 @@
+# src/booking_agent/context_manager.py
+"""Token-budgeted conversation context with a rolling summary of older turns."""
+from typing import Dict, List
+
+from langchain_core.messages import HumanMessage
+
+from config import CONTEXT_TOKEN_BUDGET, CONTEXT_RECENT_MESSAGES, CONTEXT_SUMMARY_LINE_CHARS
+
+# Fields of the parsed request worth carrying over in the context
+CARRIED_FIELDS = ["start_date", "start_time", "duration_hours", "capacity", "equipments", "user_name"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _format_message(msg) -> str:
+    return f"{'USER' if isinstance(msg, HumanMessage) else 'AGENT'}: {msg.content}"
+
+
+def _summarize_message(msg) -> str:
+    """One compact line for a message leaving the verbatim window."""
+    line = " ".join(_format_message(msg).split())
+    if len(line) > CONTEXT_SUMMARY_LINE_CHARS:
+        line = line[:CONTEXT_SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+    return line
+
+
+def update_summary(state: Dict) -> List[str]:
+    """
+    Fold the messages that fell out of the last `CONTEXT_RECENT_MESSAGES` into
+    the rolling summary. Only messages not folded before are processed, so the
+    cost per turn doesn't grow with the conversation.
+    """
+    messages = state["messages"]
+    summary = state.get("conversation_summary") or []
+    folded = state.get("summarized_messages") or 0
+    recent_start = max(len(messages) - CONTEXT_RECENT_MESSAGES, folded)
+    summary.extend(_summarize_message(msg) for msg in messages[folded:recent_start])
+    # The summary itself rolls: it never takes more than half of the budget
+    while summary and estimate_tokens("\n".join(summary)) > CONTEXT_TOKEN_BUDGET // 2:
+        summary.pop(0)
+    state["conversation_summary"] = summary
+    state["summarized_messages"] = recent_start
+    return summary
+
+
+def _known_details(parsed_request: Dict) -> str:
+    details = {
+        field: parsed_request[field] for field in CARRIED_FIELDS
+        if parsed_request and parsed_request.get(field) not in (None, [], "")
+    }
+    return ", ".join(f"{field}={value}" for field, value in details.items())
+
+
+def build_conversation_context(state: Dict, token_budget: int = CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    Conversation context for the LLM within `token_budget`: the rolling summary
+    of older turns, the details already extracted in `parsed_request`, and the
+    recent messages verbatim. Over budget, the oldest summary lines go first,
+    then the oldest recent messages (the latest message is always kept).
+    """
+    summary = list(update_summary(state))
+    recent = [_format_message(msg) for msg in state["messages"][state["summarized_messages"]:]]
+    known = _known_details(state.get("parsed_request") or {})
+
+    def render() -> str:
+        parts = []
+        if summary:
+            parts.append("EARLIER CONVERSATION (summary):\n" + "\n".join(summary))
+        if known:
+            parts.append(f"DETAILS SO FAR: {known}")
+        parts.append("\n".join(recent))
+        return "\n".join(parts)
+
+    context = render()
+    while estimate_tokens(context) > token_budget and (summary or len(recent) > 1):
+        if summary:
+            summary.pop(0)
+        else:
+            recent.pop(0)
+        context = render()
+    return context
@@ -0,0 +1,183 @@
+# src/booking_agent/fast_parser.py
+"""Rule-based extraction of well-formed booking requests, used before the LLM."""
+import re
+from functools import lru_cache
+from datetime import datetime, timedelta, date
+from typing import Iterable, List, Optional
+
+from booking_agent.schemas import BookingRequest
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december"]
+NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4,
+                "five": 5, "six": 6, "seven": 7, "eight": 8, "half an": 0.5, "half a": 0.5}
+
+_MONTH = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+DATE_PATTERNS = {
+    "iso": re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b"),
+    "relative": re.compile(r"\b(day after tomorrow|today|tomorrow)\b", re.IGNORECASE),
+    "weekday": re.compile(r"\b(next\s+|this\s+|on\s+)?(" + "|".join(WEEKDAYS) + r")\b", re.IGNORECASE),
+    "month_day": re.compile(r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b", re.IGNORECASE),
+    "day_month": re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTH + r"(?!\w)", re.IGNORECASE),
+}
+TIME_PATTERN = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s?m\b\.?", re.IGNORECASE)
+NOON_PATTERN = re.compile(r"\b(noon|midday)\b", re.IGNORECASE)
+DURATION_PATTERN = re.compile(
+    r"\bfor\s+(\d+(?:\.\d+)?|half an?|an?|one|two|three|four|five|six|seven|eight)\s*"
+    r"(hours?|hrs?|h|minutes?|mins?)\b",
+    re.IGNORECASE,
+)
+CAPACITY_PATTERN = re.compile(
+    r"\b(\d+)\s*(?:people|persons?|attendees|participants|guests|members|pax)\b", re.IGNORECASE
+)
+NO_EQUIPMENT_PATTERN = re.compile(
+    r"\b(no|without|don'?t need|do not need)\s+(any\s+)?(special\s+)?equipments?\b", re.IGNORECASE
+)
+NAME_PATTERN = re.compile(
+    r"(?i:\b(?:my name is|name is|name|i am|i'm|under the name of|under the name|under|booked by))"
+    r"\s*[:,]?\s+([A-Z][a-zA-Z'-]+(?:\s+[A-Z][a-zA-Z'-]+)?)"
+)
+
+
+def _month_number(name: str) -> int:
+    """Month number from a full or abbreviated month name."""
+    return next(i for i, month in enumerate(MONTHS, start=1) if month.startswith(name.lower()))
+
+
+@lru_cache(maxsize=4096)
+def _equipment_pattern(name: str) -> re.Pattern:
+    return re.compile(r"(?<!\w)" + re.escape(name) + r"(?!\w)", re.IGNORECASE)
+
+
+def _upcoming_weekday(today: date, weekday: int) -> date:
+    """Next date with the given weekday, strictly after today."""
+    return today + timedelta(days=(weekday - today.weekday() - 1) % 7 + 1)
+
+
+def _month_day(today: date, month: int, day: int) -> Optional[date]:
+    """Date of the given month and day in the current year, or next year if already past."""
+    try:
+        candidate = date(today.year, month, day)
+        if candidate < today:
+            candidate = date(today.year + 1, month, day)
+    except ValueError:
+        return None
+    return candidate
+
+
+def extract_date(text: str, today: date) -> Optional[date]:
+    """The single date mentioned in the text, or None if there is none or it is ambiguous."""
+    found = set()
+    for year, month, day in DATE_PATTERNS["iso"].findall(text):
+        try:
+            found.add(date(int(year), int(month), int(day)))
+        except ValueError:
+            return None
+    for word in DATE_PATTERNS["relative"].findall(text):
+        offsets = {"today": 0, "tomorrow": 1, "day after tomorrow": 2}
+        found.add(today + timedelta(days=offsets[word.lower()]))
+    for prefix, weekday in DATE_PATTERNS["weekday"].findall(text):
+        # "next <weekday>" means different days to different people
+        if prefix.strip().lower() == "next":
+            return None
+        found.add(_upcoming_weekday(today, WEEKDAYS.index(weekday.lower())))
+    for month, day in DATE_PATTERNS["month_day"].findall(text):
+        found.add(_month_day(today, _month_number(month), int(day)))
+    for day, month in DATE_PATTERNS["day_month"].findall(text):
+        found.add(_month_day(today, _month_number(month), int(day)))
+    if len(found) != 1 or None in found:
+        return None
+    return found.pop()
+
+
+def extract_time(text: str) -> Optional[str]:
+    """The single start time with explicit AM/PM, formatted as HH:MM:SS AM/PM."""
+    found = set()
+    for hour, minute, period in TIME_PATTERN.findall(text):
+        hour, minute = int(hour), int(minute or 0)
+        if not 1 <= hour <= 12 or minute > 59:
+            return None
+        found.add(f"{hour:02d}:{minute:02d}:00 {period.upper()}M")
+    if NOON_PATTERN.search(text):
+        found.add("12:00:00 PM")
+    return found.pop() if len(found) == 1 else None
+
+
+def extract_duration(text: str) -> Optional[float]:
+    """The single meeting duration, in hours."""
+    found = set()
+    for amount, unit in DURATION_PATTERN.findall(text):
+        amount = amount.lower()
+        value = NUMBER_WORDS[amount] if amount in NUMBER_WORDS else float(amount)
+        if unit.lower().startswith("m"):
+            value /= 60
+        found.add(value)
+    if len(found) != 1:
+        return None
+    duration = found.pop()
+    return duration if duration > 0 else None
+
+
+def extract_capacity(text: str) -> Optional[int]:
+    """The single number of attendees."""
+    found = {int(n) for n in CAPACITY_PATTERN.findall(text)}
+    if len(found) != 1:
+        return None
+    capacity = found.pop()
+    return capacity if capacity > 0 else None
+
+
+def extract_equipments(text: str, vocabulary: Iterable[str]) -> Optional[List[str]]:
+    """
+    Equipment names of the catalog mentioned in the text, longest names first so
+    that e.g. "4K Projector" is not also read as "Projector". ["nothing"] when
+    the user says no equipment is needed, None when equipment isn't mentioned.
+    """
+    if NO_EQUIPMENT_PATTERN.search(text):
+        return ["nothing"]
+    remaining = text
+    found = []
+    for name in sorted(vocabulary, key=len, reverse=True):
+        pattern = _equipment_pattern(name)
+        if pattern.search(remaining):
+            found.append(name)
+            remaining = pattern.sub(" ", remaining)
+    return found or None
+
+
+def extract_user_name(text: str) -> Optional[str]:
+    """The single name given for the booking."""
+    found = set(NAME_PATTERN.findall(text))
+    return found.pop() if len(found) == 1 else None
+
+
+def fast_parse_request(text: str, now: datetime, vocabulary: Iterable[str]) -> Optional[BookingRequest]:
+    """
+    Extract a complete booking request without the LLM. Returns None unless every
+    required field is found exactly once and the requested time is in the future,
+    in which case the caller falls back to the LLM.
+    """
+    start_date = extract_date(text, now.date())
+    start_time = extract_time(text)
+    duration_hours = extract_duration(text)
+    capacity = extract_capacity(text)
+    equipments = extract_equipments(text, vocabulary)
+    user_name = extract_user_name(text)
+    if None in (start_date, start_time, duration_hours, capacity, equipments, user_name):
+        return None
+
+    start = datetime.strptime(f"{start_date.isoformat()} {start_time}", "%Y-%m-%d %I:%M:%S %p")
+    if start <= now:
+        return None
+
+    return BookingRequest(
+        start_date=start_date.isoformat(),
+        start_time=start_time,
+        duration_hours=duration_hours,
+        capacity=capacity,
+        equipments=equipments,
+        user_name=user_name,
+        clarification_needed=False,
+        clarification_question=None,
+    )
@@ -0,0 +1,107 @@
+# src/booking_agent/llm_batcher.py
+"""Coalescing of concurrent LLM calls from different sessions."""
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from config import logger, LLM_BATCH_MAX_SIZE, LLM_BATCH_WAIT_MS, LLM_BATCH_CONCURRENCY
+
+
+class MicroBatcher(Runnable):
+    """
+    Wraps an LLM so that calls arriving within `max_wait_ms` of each other (up
+    to `max_batch_size`) are dispatched together through `llm.batch`, and each
+    result is handed back to the session that asked for it. Used in chains like
+    the LLM itself (`prompt | batcher | parser`), from sync or async nodes.
+
+    This is request coalescing, not provider-side batching: LangChain chat
+    models (and the router) implement `batch` as one concurrent `invoke` per
+    input, so the provider still sees one request per call, each counted
+    against the router's in-flight cap. What it buys is a bound on the calls
+    dispatched at once (`concurrency` batches of `max_batch_size`), at the cost
+    of up to `max_wait_ms` of extra latency for the first call of a batch.
+    A model with a real batch endpoint can be wrapped the same way.
+    """
+
+    def __init__(self, llm, max_batch_size: int = LLM_BATCH_MAX_SIZE,
+                 max_wait_ms: float = LLM_BATCH_WAIT_MS, concurrency: int = LLM_BATCH_CONCURRENCY):
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm-batch")
+        self._collector: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_collector(self):
+        if self._collector is None:
+            with self._start_lock:
+                if self._collector is None:
+                    self._collector = threading.Thread(
+                        target=self._collect, name="llm-batch-collector", daemon=True
+                    )
+                    self._collector.start()
+
+    def submit(self, input, config: Optional[RunnableConfig] = None) -> Future:
+        """Queue one call for the next batch; the future resolves to its result."""
+        self._ensure_collector()
+        future: Future = Future()
+        self._queue.put((input, config, future))
+        return future
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[tuple]):
+        inputs = [input for input, _, _ in batch]
+        configs = [config or {} for _, config, _ in batch]
+        with self._start_lock:
+            self.batches += 1
+            self.items += len(batch)
+        try:
+            results = self.llm.batch(inputs, configs, return_exceptions=True)
+        except Exception as e:
+            logger.error(f"LLM batch of {len(batch)} calls failed: {str(e)}")
+            results = [e] * len(batch)
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def invoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        if kwargs:
+            # Per-call options can't be shared by a batch
+            return self.llm.invoke(input, config, **kwargs)
+        return self.submit(input, config).result()
+
+    async def ainvoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        if kwargs:
+            return await self.llm.ainvoke(input, config, **kwargs)
+        return await asyncio.wrap_future(self.submit(input, config))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
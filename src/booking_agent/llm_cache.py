@@ -0,0 +1,83 @@
+# src/booking_agent/llm_cache.py
+"""Bounded LRU cache with TTL expiry for LLM responses."""
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from config import PARSE_CACHE_SIZE, PARSE_CACHE_TTL_SECONDS, PARSE_CACHE_TIME_BUCKET_MINUTES
+
+
+class LRUTTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire `ttl` seconds after insertion.
+    Hit, miss and eviction counters are kept for tuning.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def normalize_context(conversation_context: str) -> str:
+    """Case-fold and collapse whitespace so trivially different inputs share a key."""
+    return re.sub(r"\s+", " ", conversation_context).strip().lower()
+
+
+def parse_cache_key(conversation_context: str, current_date: str, now: float) -> tuple:
+    """
+    Key of a `parse_request` extraction: the normalized context, the current date
+    and a time bucket, since relative times are resolved against the current time.
+    """
+    bucket = int(now // (PARSE_CACHE_TIME_BUCKET_MINUTES * 60))
+    return (normalize_context(conversation_context), current_date, bucket)
+
+
+# Shared cache of `parse_request` extractions
+PARSE_CACHE = LRUTTLCache(maxsize=PARSE_CACHE_SIZE, ttl=PARSE_CACHE_TTL_SECONDS)
@@ -0,0 +1,261 @@
+# src/booking_agent/llm_router.py
+"""
+Routing of LLM calls over several providers (e.g. Groq, Gemini, Ollama) with
+latency-aware selection, failover, circuit breaking and in-flight caps.
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from metrics import LLM_CALL_SECONDS
+from config import logger, LLM_ROUTER_WINDOW, LLM_ROUTER_WINDOW_SECONDS, \
+    LLM_ROUTER_FAILURE_THRESHOLD, LLM_ROUTER_COOLDOWN_SECONDS, LLM_ROUTER_MAX_IN_FLIGHT, \
+    LLM_ROUTER_ACQUIRE_TIMEOUT_SECONDS
+
+
+class NoProviderAvailable(RuntimeError):
+    """Every provider is failing, has an open circuit or stayed at its in-flight cap."""
+
+
+class ProviderHealth:
+    """
+    Latency and error rate of one provider over its last `window` calls within
+    `window_seconds` (so a provider skipped since it degraded is tried again once
+    its bad samples age out), plus its circuit breaker:
+    `failure_threshold` consecutive failures open the circuit for `cooldown`
+    seconds, after which a single trial call is let through (half-open).
+    `slots` caps the concurrent calls at `max_in_flight`.
+    """
+
+    def __init__(self, window: int = LLM_ROUTER_WINDOW,
+                 window_seconds: float = LLM_ROUTER_WINDOW_SECONDS,
+                 failure_threshold: int = LLM_ROUTER_FAILURE_THRESHOLD,
+                 cooldown: float = LLM_ROUTER_COOLDOWN_SECONDS,
+                 max_in_flight: int = LLM_ROUTER_MAX_IN_FLIGHT):
+        # (timestamp, latency or None if the call failed)
+        self.samples = deque(maxlen=window)
+        self.window_seconds = window_seconds
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_in_flight = max_in_flight
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.in_flight = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def _recent(self) -> deque:
+        horizon = time.monotonic() - self.window_seconds
+        while self.samples and self.samples[0][0] < horizon:
+            self.samples.popleft()
+        return self.samples
+
+    def p95(self) -> Optional[float]:
+        latencies = sorted(latency for _, latency in self._recent() if latency is not None)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def error_rate(self) -> float:
+        samples = self._recent()
+        if not samples:
+            return 0.0
+        return sum(latency is None for _, latency in samples) / len(samples)
+
+    def can_acquire(self) -> bool:
+        """Whether the circuit lets a call through (the in-flight cap aside)."""
+        state = self.state
+        if state == "open":
+            return False
+        return state == "closed" or not self.trial_in_flight
+
+    def acquire(self):
+        self.in_flight += 1
+        if self.state == "half_open":
+            self.trial_in_flight = True
+
+    def release(self, latency: float, ok: bool):
+        self.in_flight -= 1
+        self.trial_in_flight = False
+        self.samples.append((time.monotonic(), latency if ok else None))
+        if ok:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            return
+        self.consecutive_failures += 1
+        if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            # A failed trial call re-opens the circuit for another cooldown
+            self.opened_at = time.monotonic()
+
+    def score(self, default_latency: float) -> float:
+        """Lower is healthier: p95 latency penalized by the error rate."""
+        p95 = self.p95()
+        return (default_latency if p95 is None else p95) * (1 + 4 * self.error_rate())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "p95_seconds": self.p95(),
+            "error_rate": self.error_rate(),
+            "in_flight": self.in_flight,
+            "calls": len(self._recent()),
+        }
+
+
+class RoutedProvider:
+    """A provider client, created by `loader` on first use, with its health."""
+
+    def __init__(self, name: str, loader: Callable[[], Any], health: ProviderHealth):
+        self.name = name
+        self.loader = loader
+        self.health = health
+        self._client = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._load_lock:
+                if self._client is None:
+                    self._client = self.loader()
+        return self._client
+
+
+class LLMRouter(Runnable):
+    """
+    Chat model facade routing each call to the healthiest provider. Providers
+    are ranked by rolling p95 latency and error rate (ties keep the configured
+    order, so the first provider is preferred until it degrades); a failed call
+    fails over to the next one. Providers are loaded lazily, so the fallbacks'
+    SDKs are only imported when they are first needed. When every healthy
+    provider is at its in-flight cap, a call waits up to `acquire_timeout`
+    seconds for a slot instead of failing.
+
+    Works in LCEL chains (`prompt | router | parser`); the run config is passed
+    on, so token streaming of the underlying chat model still reaches LangGraph.
+    `batch` is the `Runnable` default: one routed `invoke` per input, so each
+    item fails over on its own and holds its own in-flight slot.
+    """
+
+    def __init__(self, providers: Dict[str, Callable[[], Any]], default_latency: float = 1.0,
+                 health_factory: Callable[[], ProviderHealth] = ProviderHealth,
+                 acquire_timeout: float = LLM_ROUTER_ACQUIRE_TIMEOUT_SECONDS):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers: List[RoutedProvider] = [
+            RoutedProvider(name, loader, health_factory()) for name, loader in providers.items()
+        ]
+        self.default_latency = default_latency
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> List[RoutedProvider]:
+        with self._lock:
+            ranked = sorted(
+                enumerate(self.providers),
+                key=lambda item: (item[1].health.score(self.default_latency), item[0]),
+            )
+        return [provider for _, provider in ranked]
+
+    def _acquire(self, provider: RoutedProvider, timeout: Optional[float] = None) -> bool:
+        """
+        Take a slot of the provider if its circuit lets the call through, waiting
+        up to `timeout` seconds for a slot (not at all when None).
+        """
+        health = provider.health
+        with self._lock:
+            if not health.can_acquire():
+                return False
+        if not (health.slots.acquire(timeout=timeout) if timeout else health.slots.acquire(blocking=False)):
+            return False
+        with self._lock:
+            # The circuit may have opened, or a trial started, while waiting
+            if not health.can_acquire():
+                health.slots.release()
+                return False
+            health.acquire()
+        return True
+
+    def _release(self, provider: RoutedProvider, started: float, ok: bool):
+        latency = time.perf_counter() - started
+        with self._lock:
+            provider.health.release(latency, ok)
+        provider.health.slots.release()
+        LLM_CALL_SECONDS.observe(latency, provider=provider.name, outcome="ok" if ok else "error")
+
+    def _next_provider(self, tried: Set[str], wait: bool = True) -> Optional[RoutedProvider]:
+        """
+        The healthiest untried provider with a free slot. When all of them are at
+        their in-flight cap, wait for a slot of the healthiest one (if `wait`).
+        """
+        candidates = [provider for provider in self._candidates() if provider.name not in tried]
+        for provider in candidates:
+            if self._acquire(provider):
+                return provider
+        if not wait:
+            return None
+        for provider in candidates:
+            with self._lock:
+                allowed = provider.health.can_acquire()
+            if allowed:
+                return provider if self._acquire(provider, timeout=self.acquire_timeout) else None
+        return None
+
+    async def _anext_provider(self, tried: Set[str]) -> Optional[RoutedProvider]:
+        provider = self._next_provider(tried, wait=False)
+        if provider is None:
+            # Wait for a slot off the event loop
+            provider = await asyncio.to_thread(self._next_provider, tried)
+        return provider
+
+    def _no_provider(self, errors: List[str]) -> NoProviderAvailable:
+        detail = "; ".join(errors) if errors else "all circuits open or at capacity"
+        return NoProviderAvailable(f"No LLM provider available ({detail})")
+
+    def invoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        errors, tried = [], set()
+        while (provider := self._next_provider(tried)) is not None:
+            tried.add(provider.name)
+            started = time.perf_counter()
+            try:
+                result = provider.client.invoke(input, config, **kwargs)
+            except Exception as e:
+                self._release(provider, started, ok=False)
+                logger.warning(f"LLM provider '{provider.name}' failed: {str(e)}")
+                errors.append(f"{provider.name}: {str(e)}")
+                continue
+            self._release(provider, started, ok=True)
+            return result
+        raise self._no_provider(errors)
+
+    async def ainvoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        errors, tried = [], set()
+        while (provider := await self._anext_provider(tried)) is not None:
+            tried.add(provider.name)
+            started = time.perf_counter()
+            try:
+                result = await provider.client.ainvoke(input, config, **kwargs)
+            except Exception as e:
+                self._release(provider, started, ok=False)
+                logger.warning(f"LLM provider '{provider.name}' failed: {str(e)}")
+                errors.append(f"{provider.name}: {str(e)}")
+                continue
+            self._release(provider, started, ok=True)
+            return result
+        raise self._no_provider(errors)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {provider.name: provider.health.stats() for provider in self.providers}
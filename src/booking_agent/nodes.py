@@ -2,6 +2,7 @@
 
 """Individual nodes and conditions for the workflow of booking meeting rooms."""
 import random
+import asyncio
 from datetime import datetime
 from langgraph.graph import END
 from langchain.output_parsers import PydanticOutputParser
@@ -9,58 +10,110 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from datetime import datetime, timedelta
 
 from helper import *
-from config import logger
+from config import (
+    logger, FAST_PATH_ENABLED, ROOM_LISTING_MODE, ALTERNATIVE_TIMES_WINDOW_HOURS, ALTERNATIVE_TIMES_PER_ROOM
+)
 from mock_apis.booking_services import *
 from mock_apis.room_services import *
 from booking_agent.schemas import AgentState, BookingRequest
+from booking_agent.llm_cache import PARSE_CACHE, parse_cache_key
+from booking_agent.fast_parser import fast_parse_request
+from booking_agent.context_manager import build_conversation_context
+from booking_agent.room_renderer import render_room_listing
 
 ##==============================================================================
 # NODE FUNCTIONS
 ##==============================================================================
 # NODE [01]. Parsing user requests Node
-def parse_request(state: AgentState, llm) -> AgentState:
-    logger.info(" ------------------ NODE: PARSE REQUEST ------------------ ")
-
+def _prepare_parse_request(state: AgentState, llm) -> tuple:
+    """
+    Steps shared by the sync and async parse nodes before the LLM is called.
+    Returns (chain, chain_inputs, cache_key, parsed_data), where `parsed_data` is
+    already set when the fast path or the cache answered the request.
+    """
     ######################## (1.) Initialization ######################
-    current_date = datetime.now().strftime('%Y-%m-%d')    # e.g, 2025-05-12
-    current_time = datetime.now().strftime('%I:%M:%S %p') # e.g, 02:45:30 PM
+    now = datetime.now()
+    current_date = now.strftime('%Y-%m-%d')    # e.g, 2025-05-12
+    current_time = now.strftime('%I:%M:%S %p') # e.g, 02:45:30 PM
     logger.info(" >>>>> CURRENT DATE: %s", current_date)
     logger.info(" >>>>> CURRENT TIME: %s", current_time)
     # Initialize parser used for user request parsing
     parser = PydanticOutputParser(pydantic_object=BookingRequest)
     # Apply template to the inputrequest to inject the predefined template prompt
     prompt_template = apply_request_prompt(parser)
-    # Initialize LLM
-    try:
-        # llm = initialize_llm(name="groq")
-        # Create chain
-        chain = prompt_template | llm | parser
-        ############## (2.) Update conversation history ##################
-        # logger.info(" >>>>> USER INPUT : %s", state['user_input'])
-        state["messages"].append(HumanMessage(content=state['user_input']))
-        # Build full request context from conversation history ####
-        conversation_context = "\n".join(
-            f"{'USER' if isinstance(msg, HumanMessage) else 'AGENT'}: {msg.content}"
-            for msg in state["messages"]
+    # Create chain
+    chain = prompt_template | llm | parser
+
+    ############## (2.) Update conversation history ##################
+    # logger.info(" >>>>> USER INPUT : %s", state['user_input'])
+    state["messages"].append(HumanMessage(content=state['user_input']))
+    # Errors of the previous turn must not route this one
+    state["error_message"] = None
+    # Build the request context within the token budget ####
+    conversation_context = build_conversation_context(state)
+    logger.info("\n>>>>> CONVERSION CONTEXT: %s", conversation_context)
+    chain_inputs = {"user_request": conversation_context,
+                    "current_date": current_date,
+                    "current_time": current_time}
+
+    ######################## (3.) Skip the LLM if possible ########################
+    # Well-formed requests are extracted by rules without calling the LLM
+    if FAST_PATH_ENABLED:
+        parsed_data = fast_parse_request(
+            state["user_input"], now, get_room_catalog().equipment_index
         )
-        logger.info("\n>>>>> CONVERSION CONTEXT: %s", conversation_context)
+        if parsed_data is not None:
+            logger.info(" >>>>> FAST PATH: request parsed without the LLM")
+            return chain, chain_inputs, None, parsed_data
+    # Identical contexts within the same time bucket reuse the cached extraction
+    cache_key = parse_cache_key(conversation_context, current_date, now.timestamp())
+    cached_data = PARSE_CACHE.get(cache_key)
+    logger.info(" >>>>> PARSE CACHE: %s", PARSE_CACHE.stats())
+    if cached_data is not None:
+        return chain, chain_inputs, cache_key, cached_data.model_copy(deep=True)
+    return chain, chain_inputs, cache_key, None
 
-        ######################## (3.) Invoke chain ########################
-        parsed_data = chain.invoke({"user_request": conversation_context,
-                                    "current_date": current_date,
-                                    "current_time": current_time})
-        
-        logger.info("\n >>>>>>> PARSED REQUEST: %s", parsed_data.model_dump())
-        state.update({
-            "parsed_request": parsed_data.model_dump(),
-            "user_name_for_booking": parsed_data.user_name,
-            })
+def _complete_parse_request(state: AgentState, parsed_data: BookingRequest) -> AgentState:
+    parsed_request = parsed_data.model_dump()
+    # Map the extracted equipment names to the catalog's before they are matched
+    if parsed_request.get("equipments"):
+        parsed_request["equipments"] = get_room_catalog().vocabulary.resolve_all(parsed_request["equipments"])
+    logger.info("\n >>>>>>> PARSED REQUEST: %s", parsed_request)
+    state.update({
+        "parsed_request": parsed_request,
+        "user_name_for_booking": parsed_data.user_name,
+        })
+    return state
+
+def parse_request(state: AgentState, llm) -> AgentState:
+    logger.info(" ------------------ NODE: PARSE REQUEST ------------------ ")
+    try:
+        chain, chain_inputs, cache_key, parsed_data = _prepare_parse_request(state, llm)
+        if parsed_data is None:
+            parsed_data = chain.invoke(chain_inputs)
+            PARSE_CACHE.set(cache_key, parsed_data.model_copy(deep=True))
+        _complete_parse_request(state, parsed_data)
     except Exception as e:
         state["error_message"] = f"Failed to parse request: {str(e)}"   
         return state
     
     return state
 
+async def aparse_request(state: AgentState, llm) -> AgentState:
+    """Async counterpart of `parse_request`, awaiting the LLM."""
+    logger.info(" ------------------ NODE: PARSE REQUEST (ASYNC) ------------------ ")
+    try:
+        chain, chain_inputs, cache_key, parsed_data = _prepare_parse_request(state, llm)
+        if parsed_data is None:
+            parsed_data = await chain.ainvoke(chain_inputs)
+            PARSE_CACHE.set(cache_key, parsed_data.model_copy(deep=True))
+        _complete_parse_request(state, parsed_data)
+    except Exception as e:
+        state["error_message"] = f"Failed to parse request: {str(e)}"
+        return state
+
+    return state
+
 # NODE [02]. Ask Clarification Node
 def ask_clarification(state: AgentState) -> AgentState:
     """
@@ -68,14 +121,21 @@ def ask_clarification(state: AgentState) -> AgentState:
     """
     logger.info(" ------------------ NODE: ASK CLARIFICATION ------------------ ")
 
-    try:
-        clarification_msg = state['parsed_request']['clarification_question']
-    except Exception as e:
-        logger.error(f"LLM didn't respond by clarification question: {str(e)}")
-        missed_fields = get_missing_fields(state["parsed_request"])
-        # Retrieve random question from predefined list
+    clarification_msg = state['parsed_request'].get('clarification_question')
+    if not clarification_msg:
+        logger.error("LLM didn't respond by clarification question")
+        # Questions are keyed by field, the name one by its state key
+        missed_fields = [
+            "user_name_for_booking" if field == "user_name" else field
+            for field in get_missing_fields(state["parsed_request"])
+        ]
         msgs = load_clarification_msgs()
-        clarification_msg = random.choice(msgs[missed_fields[0]])
+        if missed_fields and missed_fields[0] in msgs:
+            # Retrieve random question from predefined list
+            clarification_msg = random.choice(msgs[missed_fields[0]])
+        else:
+            # Complete request, but neither a matching nor an alternative room
+            clarification_msg = msgs['no_matching_rooms']
 
     
     state["clarification_question"] = clarification_msg
@@ -86,6 +146,44 @@ def ask_clarification(state: AgentState) -> AgentState:
     return state
 
 # NODE [03]. Searching for rooms that matches the capacity and equipment
+def _prepare_matching_rooms(state: AgentState, llm):
+    """
+    Find the matching rooms and build the chain summarizing them. The chain is
+    None unless `ROOM_LISTING_MODE` is "llm": the listing is then rendered from
+    the templates without an LLM round trip.
+    """
+    existing_rooms = get_room_catalog()
+    capacity = state["parsed_request"]["capacity"]
+    equipments = state["parsed_request"].get("equipments", [])
+    
+    matching_rooms = find_matching_rooms_tool(
+        existing_rooms,
+        capacity=capacity,
+        equipments=equipments
+    )
+    
+    state["matching_rooms"] = matching_rooms
+    if ROOM_LISTING_MODE != "llm":
+        return None, matching_rooms
+    # Ask LLM to make this in summerized response
+    conversation_context = build_conversation_context(state)
+    rooms_prompt = apply_rooms_prompt(matching_rooms)
+    chain = rooms_prompt | llm 
+    logger.info("\n>>>>> CONVERSION CONTEXT: %s", conversation_context)
+    return chain, matching_rooms
+
+def _complete_matching_rooms(state: AgentState, matching_rooms_conclusion: str) -> AgentState:
+    logger.info(" >>>>>>> MATCHING ROOMS: %s", matching_rooms_conclusion)
+    state["messages"].append(SystemMessage(content=matching_rooms_conclusion))
+    logger.info(" >>>>>>> MATCHING ROOMS: %s", state["messages"])
+    return state
+
+def _matching_rooms_failed(state: AgentState, e: Exception) -> AgentState:
+    logger.error(f"Error finding matching rooms: {str(e)}")
+    state["matching_rooms"] = []
+    state["error_message"] = f"Failed to find matching rooms: {str(e)}"
+    return state
+
 def find_matching_rooms(state: AgentState, llm) -> AgentState:
     """
     Find all rooms that match the user's requirements (capacity, equipment).
@@ -93,43 +191,34 @@ def find_matching_rooms(state: AgentState, llm) -> AgentState:
     logger.info(" ------------------ NODE: GET MATCHING ROOMS ------------------ ")
  
     try:
-        existing_rooms = load_rooms()
-        capacity = state["parsed_request"]["capacity"]
-        equipments = state["parsed_request"].get("equipments", [])
-        
-        matching_rooms = find_matching_rooms_tool(
-            existing_rooms,
-            capacity=capacity,
-            equipments=equipments
-        )
-        
-        state["matching_rooms"] = matching_rooms
-        # Ask LLM to make this in summerized response
-        conversation_context = "\n".join(
-            f"{'USER' if isinstance(msg, HumanMessage) else 'AGENT'}: {msg.content}"
-            for msg in state["messages"]
-        )
-        rooms_prompt = apply_rooms_prompt(matching_rooms)
-        chain = rooms_prompt | llm 
-        logger.info("\n>>>>> CONVERSION CONTEXT: %s", conversation_context)
+        chain, matching_rooms = _prepare_matching_rooms(state, llm)
+        if chain is None:
+            return _complete_matching_rooms(state, render_room_listing(matching_rooms))
         # Invoke chain 
         matching_rooms_conclusion = chain.invoke({"rooms": matching_rooms}).content
-        logger.info(" >>>>>>> MATCHING ROOMS: %s", matching_rooms_conclusion)
+        return _complete_matching_rooms(state, matching_rooms_conclusion)
 
-        state["messages"].append(SystemMessage(content=matching_rooms_conclusion))
-        logger.info(" >>>>>>> MATCHING ROOMS: %s", state["messages"])
-        return state
+    except Exception as e:
+        return _matching_rooms_failed(state, e)
+
+async def afind_matching_rooms(state: AgentState, llm) -> AgentState:
+    """Async counterpart of `find_matching_rooms`, awaiting the LLM."""
+    logger.info(" ------------------ NODE: GET MATCHING ROOMS (ASYNC) ------------------ ")
+
+    try:
+        chain, matching_rooms = _prepare_matching_rooms(state, llm)
+        if chain is None:
+            return _complete_matching_rooms(state, render_room_listing(matching_rooms))
+        matching_rooms_conclusion = (await chain.ainvoke({"rooms": matching_rooms})).content
+        return _complete_matching_rooms(state, matching_rooms_conclusion)
 
     except Exception as e:
-        logger.error(f"Error finding matching rooms: {str(e)}")
-        state["matching_rooms"] = []
-        state["error_message"] = f"Failed to find matching rooms: {str(e)}"
-        return state
+        return _matching_rooms_failed(state, e)
 
 # NODE [04]. Define the availability of the matching rooms
 def find_booking_options(state: AgentState) -> AgentState:
     """
-    For each matching room, check if it's available at the requested time.
+    Check which of the matching rooms are available at the requested time.
     """
     logger.info(" ------------------ NODE: GET AVAILABLE ROOMS ------------------ ")
     
@@ -137,23 +226,27 @@ def find_booking_options(state: AgentState) -> AgentState:
     unavailable_rooms = []
     
     try:
-        existing_bookings = load_bookings()
-        for room in state["matching_rooms"]:
-            # Check if room is available in the given time slot
-            if check_time_conflict_tool(
-                existing_bookings=existing_bookings, room_id=room.id,
-                start_time=state["parsed_request"]["start_time"],
-                duration_hours=state["parsed_request"]["duration_hours"]
-            ):
-                unavailable_rooms.append(room)
-            else:
+        booking_store = get_booking_store()
+        start_time = get_request_start_time(state["parsed_request"])
+        # Check all matching rooms against the requested time slot at once
+        free_rooms = booking_store.free_rooms(
+            [room["id"] for room in state["matching_rooms"]],
+            start_time=start_time,
+            duration_hours=state["parsed_request"]["duration_hours"]
+        )
+        for room, is_free in zip(state["matching_rooms"], free_rooms):
+            if is_free:
                 available_rooms.append(room)
+            else:
+                unavailable_rooms.append(room)
 
         logger.info(" >>>>>>> AVAILABLE ROOMS: %s",
                    "NO AVAILABLE ROOMS" if not available_rooms else available_rooms)
         
         state["available_rooms"] = available_rooms
         state["unavailable_rooms"] = unavailable_rooms
+        # The first free room is the one confirm_booking books
+        state["selected_room"] = available_rooms[0] if available_rooms else None
         
     except Exception as e:
         logger.error(f"Error checking room availability: {str(e)}")
@@ -202,9 +295,9 @@ def select_room(state: AgentState) -> AgentState:
             selected = available_rooms[0]
             state["selected_room"] = selected
             state["llm_response"] = (
-                f"I've selected {selected.name} for you which has:\n"
-                f"- Capacity: {selected.capacity} people\n"
-                f"- Equipment: {', '.join(selected.equipments)}"
+                f"I've selected {selected['name']} for you which has:\n"
+                f"- Capacity: {selected['capacity']} people\n"
+                f"- Equipment: {', '.join(selected['equipments'])}"
             )
         else:
             state["selected_room"] = None
@@ -227,18 +320,24 @@ def suggest_alternative_times(state: AgentState) -> AgentState:
     logger.info(" ------------------ NODE: SEARCH ALTERNATIVE TIMES ------------------ ")
     
     try:
-        if not state.get("selected_room"):
-            raise ValueError("No room selected to find alternatives for")
-            
-        alternative_times = {}
-        for room in state.get("matching_rooms", []):
-            times = check_time_conflict_tool(
-                room_id=room.id,
-                start_time=state["parsed_request"]["start_time"],
-                duration_hours=state["parsed_request"]["duration_hours"]
-            )
-            if times:
-                alternative_times[room.id] = times
+        rooms = state.get("unavailable_rooms") or state.get("matching_rooms", [])
+        if not rooms:
+            raise ValueError("No matching rooms to find alternative times for")
+
+        start_time = get_request_start_time(state["parsed_request"])
+        duration_hours = state["parsed_request"]["duration_hours"]
+        # Free slots long enough for the meeting, from the requested time on
+        free_slots = get_room_reserved_time_slots(
+            [room["id"] for room in rooms],
+            get_booking_store().load_all(),
+            window_start=start_time,
+            window_end=start_time + timedelta(hours=ALTERNATIVE_TIMES_WINDOW_HOURS),
+            duration_hours=duration_hours,
+        )
+        alternative_times = {
+            room["name"]: free_slots[str(room["id"])][:ALTERNATIVE_TIMES_PER_ROOM]
+            for room in rooms if free_slots[str(room["id"])]
+        }
 
         if alternative_times:
             state["llm_response"] = format_available_times_msg(alternative_times)
@@ -267,21 +366,21 @@ def confirm_booking(state: AgentState) -> AgentState:
         booking_data = state["parsed_request"]
         room = state["selected_room"]
         
-        end_time = datetime.fromisoformat(booking_data["start_time"]) + \
-                   timedelta(hours=booking_data["duration_hours"])
+        start_time = get_request_start_time(booking_data)
+        end_time = start_time + timedelta(hours=booking_data["duration_hours"])
         
         # Create the booking using the tool
-        booking_result = book_room_tool(
-            room_id=room.id,
-            start_time=booking_data["start_time"],
-            end_time=end_time.isoformat(),
-            user_name=booking_data["user_name"]
-        )
+        booking_result = book_room_tool.invoke({
+            "room_id": room["id"],
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "user_name": booking_data["user_name"]
+        })
         
         state["booking_result"] = True if booking_result else False
         if booking_result:
             state["user_booking_confirmation"] = "yes"
-            state["llm_response"] = f"Successfully booked {room.name} for you!"
+            state["llm_response"] = f"Successfully booked {room['name']} for you!"
         else:
             raise ValueError("Booking creation failed")
             
@@ -305,17 +404,17 @@ def search_alternative_rooms(state: AgentState) -> AgentState:
         equipments = state["parsed_request"].get("equipments", [])
         
         # Find similar rooms using the similarity tool
-        alternative_rooms = find_similar_rooms_tool(
-            capacity=capacity,
-            equipments=equipments
-        )
+        alternative_rooms = find_similar_rooms_tool.invoke({
+            "capacity": capacity,
+            "equipments": equipments
+        })
         
         state["alternative_rooms"] = alternative_rooms if alternative_rooms else []
         
         if alternative_rooms:
             logger.info(f" >>>>>>> FOUND {len(alternative_rooms)} ALTERNATIVE ROOMS")
             state["llm_response"] = "I found some alternative rooms that might work for you: \n" + \
-                "\n".join([f"- {room.name}: Capacity {room.capacity}, Equipment: {', '.join(room.equipments)}"
+                "\n".join([f"- {room['name']}: Capacity {room['capacity']}, Equipment: {', '.join(room['equipments'])}"
                           for room in alternative_rooms])
         else:
             logger.info(" >>>>>>> NO ALTERNATIVE ROOMS FOUND")
@@ -372,4 +471,34 @@ def inform_user(state: AgentState) -> AgentState:
         state["llm_response"] = "Sorry, I encountered an error while preparing the booking confirmation."
     
     state["messages"].append(SystemMessage(content=state["llm_response"]))
-    return state
\ No newline at end of file
+    return state
+
+
+##==============================================================================
+# ASYNC NODE FUNCTIONS
+# Blocking work (booking store, data files) runs in a worker thread so the
+# event loop stays free while it waits.
+##==============================================================================
+async def aask_clarification(state: AgentState) -> AgentState:
+    return await asyncio.to_thread(ask_clarification, state)
+
+async def afind_booking_options(state: AgentState) -> AgentState:
+    return await asyncio.to_thread(find_booking_options, state)
+
+async def ahandle_error(state: AgentState) -> AgentState:
+    return await asyncio.to_thread(handle_error, state)
+
+async def aselect_room(state: AgentState) -> AgentState:
+    return select_room(state)
+
+async def asuggest_alternative_times(state: AgentState) -> AgentState:
+    return await asyncio.to_thread(suggest_alternative_times, state)
+
+async def aconfirm_booking(state: AgentState) -> AgentState:
+    return await asyncio.to_thread(confirm_booking, state)
+
+async def asearch_alternative_rooms(state: AgentState) -> AgentState:
+    return await asyncio.to_thread(search_alternative_rooms, state)
+
+async def ainform_user(state: AgentState) -> AgentState:
+    return inform_user(state)
@@ -93,6 +93,8 @@ DEFAULT_AGENT_STATE={
     'user_input': "",
     'llm_response': "",
     'messages': [],
+    'conversation_summary': [],
+    'summarized_messages': 0,
     'parsed_request': {
         'start_date': None,
         'start_time': None,
@@ -0,0 +1,154 @@
+# src/booking_agent/replay_llm.py
+"""
+Record/replay stand-in for the chat model, to drive the workflow offline.
+
+In record mode every call goes to a real chat model and the prompt/completion
+pair is appended to a JSONL cassette. In replay mode completions are served
+from the cassette by prompt hash, after a synthetic latency, without network.
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+# Values that change between runs and must not change the prompt hash
+VOLATILE_PATTERNS = [
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}\b"), "<DATE>"),
+    (re.compile(r"\b\d{1,2}:\d{2}(:\d{2})?\s?[AP]M\b", re.IGNORECASE), "<TIME>"),
+]
+ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+
+
+class CassetteMiss(LookupError):
+    """No recorded completion for the prompt."""
+
+
+def normalize_prompt(messages: List[BaseMessage]) -> str:
+    """Prompt text with dates and times masked and whitespace collapsed."""
+    text = "\n".join(f"{msg.type}: {msg.content}" for msg in messages)
+    for pattern, placeholder in VOLATILE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return " ".join(text.split())
+
+def prompt_hash(messages: List[BaseMessage]) -> str:
+    return hashlib.sha256(normalize_prompt(messages).encode()).hexdigest()
+
+def shift_dates(text: str, days: int) -> str:
+    """
+    Move every ISO date in a recorded completion by `days`, so relative dates
+    ("tomorrow") resolved at record time still point to the future on replay.
+    """
+    if not days:
+        return text
+
+    def shift(match):
+        try:
+            return (date(*map(int, match.groups())) + timedelta(days=days)).isoformat()
+        except ValueError:
+            return match.group(0)
+    return ISO_DATE.sub(shift, text)
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Chat model serving recorded completions (`mode="replay"`) or recording the
+    completions of `recorder` (`mode="record"`) in the `cassette` JSONL file.
+    Replayed calls sleep `latency_ms` ± `jitter_ms` to mimic a provider.
+    """
+
+    cassette: Path
+    mode: str = "replay"
+    recorder: Optional[Any] = None
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: Optional[int] = None
+
+    _entries: Dict[str, List[Dict]] = PrivateAttr(default=None)
+    _served: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _rng: Any = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _load(self) -> Dict[str, List[Dict]]:
+        """Cassette entries by prompt hash, read once."""
+        if self._entries is None:
+            entries: Dict[str, List[Dict]] = {}
+            try:
+                with open(self.cassette, "r") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entries.setdefault(entry["hash"], []).append(entry)
+            except FileNotFoundError:
+                pass
+            self._entries = entries
+            self._rng = random.Random(self.seed)
+        return self._entries
+
+    def _replay(self, messages: List[BaseMessage]) -> str:
+        key = prompt_hash(messages)
+        with self._lock:
+            recorded = self._load().get(key)
+            if not recorded:
+                raise CassetteMiss(f"No recorded completion for prompt {key[:12]} in {self.cassette}")
+            # Several recordings of the same prompt are served in turn
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        entry = recorded[served % len(recorded)]
+        days = (date.today() - date.fromisoformat(entry["recorded_at"])).days
+        return shift_dates(entry["completion"], days)
+
+    def _delay(self) -> float:
+        with self._lock:
+            self._load()
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _record(self, messages: List[BaseMessage], completion: str, latency: float):
+        entry = {
+            "hash": prompt_hash(messages),
+            "prompt": normalize_prompt(messages),
+            "completion": completion,
+            "recorded_at": date.today().isoformat(),
+            "latency_ms": round(latency * 1000, 1),
+        }
+        with self._lock:
+            self._load().setdefault(entry["hash"], []).append(entry)
+            Path(self.cassette).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cassette, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def _result(self, content: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.mode == "record":
+            started = time.perf_counter()
+            completion = self.recorder.invoke(messages, stop=stop, **kwargs).content
+            self._record(messages, completion, time.perf_counter() - started)
+            return self._result(completion)
+        time.sleep(self._delay())
+        return self._result(self._replay(messages))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.mode == "record":
+            started = time.perf_counter()
+            completion = (await self.recorder.ainvoke(messages, stop=stop, **kwargs)).content
+            self._record(messages, completion, time.perf_counter() - started)
+            return self._result(completion)
+        await asyncio.sleep(self._delay())
+        return self._result(self._replay(messages))
@@ -0,0 +1,52 @@
+# src/booking_agent/room_renderer.py
+"""Template rendering of room listings, used instead of an LLM call to phrase them."""
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+from config import ROOM_MESSAGES_FILE
+
+
+@lru_cache(maxsize=4)
+def load_room_messages(filepath: Path = ROOM_MESSAGES_FILE) -> Dict:
+    """
+    Load the room listing phrasings once. The `str.format` templates are kept as
+    tuples so a listing is only a few `random.choice` and `format` calls.
+    """
+    with open(filepath, "r") as file:
+        messages = json.load(file)
+    return {key: tuple(value) if isinstance(value, list) else value for key, value in messages.items()}
+
+
+def _equipment_text(equipments: List[str], none_text: str) -> str:
+    if not equipments:
+        return none_text
+    if len(equipments) == 1:
+        return equipments[0]
+    return ", ".join(equipments[:-1]) + " and " + equipments[-1]
+
+
+def render_room_listing(rooms: List[Dict], rng: random.Random = random) -> str:
+    """
+    User-facing message listing the matching rooms, with a randomly picked
+    phrasing for the intro, each room line and the outro.
+    """
+    messages = load_room_messages()
+    if not rooms:
+        return rng.choice(messages["empty"])
+
+    intro = rng.choice(messages["intro_one"] if len(rooms) == 1 else messages["intro_many"])
+    room_template = rng.choice(messages["room"])
+    lines = [intro.format(count=len(rooms))]
+    lines.extend(
+        room_template.format(
+            name=room["name"],
+            capacity=room["capacity"],
+            equipments=_equipment_text(room.get("equipments", []), messages["no_equipment"]),
+        )
+        for room in rooms
+    )
+    lines.append(rng.choice(messages["outro"]))
+    return "\n".join(lines)
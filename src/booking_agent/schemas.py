@@ -13,6 +13,8 @@ class AgentState(TypedDict):
     # Core Conversation
     user_input: str
     messages: List[Union[HumanMessage, SystemMessage]]  # Chat history
+    conversation_summary: Optional[List[str]]  # Rolling summary of older messages
+    summarized_messages: Optional[int]         # Number of messages folded into the summary
     
     # Request Processing
     parsed_request: Optional[Dict]         # Structured request: {date, times, attendees, equipment}
@@ -1,12 +1,16 @@
 # src/booking_agent/workflow.py
 """Workflow using LangGraph for booking meeting rooms."""
 
+import inspect
+from functools import wraps
 from langgraph.graph import StateGraph, END
 from booking_agent.schemas import AgentState
 from booking_agent.nodes import *
 from booking_agent.conditions import *
-from helper import initialize_llm
-from config import TEMPERATURE
+from helper import initialize_llm_router
+from booking_agent.llm_batcher import MicroBatcher
+from metrics import NODE_SECONDS, EDGE_SECONDS
+from config import TEMPERATURE, LLM_BATCH_ENABLED
 # (
 #     parse_request, ask_clarification, handle_error,
 #     find_matching_rooms, find_booking_options, 
@@ -27,30 +31,80 @@ CONFIRM_BOOKING = "confirm_booking_node"
 INFORM_USER = "inform_user_node"
 CHECK_TIME_CONFLICT = "check_time_conflict_node"
 
-def create_workflow():
+def timed_node(name: str, node):
+    """Wrap a sync or async node so its duration is recorded under `name`."""
+    if inspect.iscoroutinefunction(node):
+        @wraps(node)
+        async def timed(state):
+            with NODE_SECONDS.time(node=name):
+                return await node(state)
+    else:
+        @wraps(node)
+        def timed(state):
+            with NODE_SECONDS.time(node=name):
+                return node(state)
+    return timed
+
+def timed_edge(source: str, path):
+    """Wrap the routing function of a conditional edge leaving `source`."""
+    @wraps(path)
+    def timed(state):
+        with EDGE_SECONDS.time(source=source):
+            return path(state)
+    return timed
+
+def create_workflow(use_async: bool = False):
+    """
+    Build and compile the booking graph. With `use_async=True` the nodes are the
+    async counterparts, to be run with `workflow.ainvoke` / `workflow.astream`.
+    """
 
     #########################################################################
     # INTIALIZE WORKFLOW
     #########################################################################
     workflow = StateGraph(AgentState)
-    llm = initialize_llm(name="groq", temp=TEMPERATURE)
+    llm = initialize_llm_router(temp=TEMPERATURE)
+    # Extraction calls of concurrent sessions can share provider requests
+    parse_llm = MicroBatcher(llm) if LLM_BATCH_ENABLED else llm
     # workflow.set_state(AgentState.INITIAL)
     # workflow.set_transition_logger(lambda from_node, to_node: print(f"Transition: {from_node} -> {to_node}"))
 
     #########################################################################
     # SET NODES
     #########################################################################
+    if use_async:
+        async def parse_request_node(state):
+            return await aparse_request(state, parse_llm)
+
+        async def find_matching_rooms_node(state):
+            return await afind_matching_rooms(state, llm)
+
+        nodes = {
+            PARSE_REQUEST: parse_request_node,
+            ASK_CLARIFICATION: aask_clarification,
+            HANDLE_ERROR: ahandle_error,
+            FIND_MATCHING_ROOMS: find_matching_rooms_node,
+            FIND_BOOKING_OPTIONS: afind_booking_options,
+            SEARCH_ALTERNATIVE_ROOMS: asearch_alternative_rooms,
+            CHOOSE_ALTERNATIVE_ROOMS: aselect_room,
+            CONFIRM_BOOKING: aconfirm_booking,
+            INFORM_USER: ainform_user,
+        }
+    else:
+        nodes = {
+            PARSE_REQUEST: lambda state: parse_request(state, parse_llm),
+            ASK_CLARIFICATION: ask_clarification,
+            HANDLE_ERROR: handle_error,
+            FIND_MATCHING_ROOMS: lambda state: find_matching_rooms(state, llm),
+            FIND_BOOKING_OPTIONS: find_booking_options,
+            SEARCH_ALTERNATIVE_ROOMS: search_alternative_rooms,
+            CHOOSE_ALTERNATIVE_ROOMS: select_room,
+            CONFIRM_BOOKING: confirm_booking,
+            INFORM_USER: inform_user,
+        }
 
-    workflow.add_node(PARSE_REQUEST, lambda state: parse_request(state, llm))
-    workflow.add_node(ASK_CLARIFICATION, ask_clarification)
-    workflow.add_node(HANDLE_ERROR, handle_error)
-    workflow.add_node(FIND_MATCHING_ROOMS, lambda state: find_matching_rooms(state, llm))
-    workflow.add_node("test", lambda state: "All is good")
-    workflow.add_node(FIND_BOOKING_OPTIONS, find_booking_options)
-    workflow.add_node(SEARCH_ALTERNATIVE_ROOMS, search_alternative_rooms)
-    workflow.add_node(CHOOSE_ALTERNATIVE_ROOMS, select_room)
-    workflow.add_node(CONFIRM_BOOKING, confirm_booking)
-    workflow.add_node(INFORM_USER, inform_user)
+    for name, node in nodes.items():
+        workflow.add_node(name, timed_node(name, node))
 
     #########################################################################
     # SET EDGES
@@ -58,7 +112,7 @@ def create_workflow():
     # Edge: Parse request -> Clarify or Find matching rooms
     workflow.add_conditional_edges(
         PARSE_REQUEST,
-        is_clear_request,
+        timed_edge(PARSE_REQUEST, is_clear_request),
         {
             "ask_clarification": ASK_CLARIFICATION,
             "find_matching_rooms": FIND_MATCHING_ROOMS,
@@ -69,15 +123,13 @@ def create_workflow():
     # Edge: Find matching rooms -> Booking options or Alternative rooms
     workflow.add_conditional_edges(
         FIND_MATCHING_ROOMS,
-        lambda state: state.get("matching_rooms", False),        
+        timed_edge(FIND_MATCHING_ROOMS, lambda state: bool(state.get("matching_rooms"))),
         {
-            True: "test", # FIND_BOOKING_OPTIONS,
-            False: END, # SEARCH_ALTERNATIVE_ROOMS
+            True: FIND_BOOKING_OPTIONS,
+            False: SEARCH_ALTERNATIVE_ROOMS
         }
     )
 
-    workflow.add_edge(HANDLE_ERROR, END)
-    workflow.add_edge("test", END)
     #########################################################################
     # SET ENTRY POINT
     #########################################################################
@@ -86,7 +138,7 @@ def create_workflow():
     # Edge: Find booking options -> Confirm booking or Handle error
     workflow.add_conditional_edges(
         FIND_BOOKING_OPTIONS,
-        lambda state: True if len(state.get("available_rooms", [])) > 0 else False,
+        timed_edge(FIND_BOOKING_OPTIONS, lambda state: True if len(state.get("available_rooms", [])) > 0 else False),
         {
             True: CONFIRM_BOOKING,
             False: HANDLE_ERROR
@@ -96,7 +148,7 @@ def create_workflow():
     # Edge: Confirm booking -> Inform user or Handle error
     workflow.add_conditional_edges(
         CONFIRM_BOOKING,
-        lambda state: state.get("booking_result", False),
+        timed_edge(CONFIRM_BOOKING, lambda state: state.get("booking_result", False)),
         {
             True: INFORM_USER,
             False: HANDLE_ERROR
@@ -106,17 +158,17 @@ def create_workflow():
     # Edge: Search alternative rooms -> Choose alternative or Ask clarification
     workflow.add_conditional_edges(
         SEARCH_ALTERNATIVE_ROOMS,
-        lambda state: True if len(state.get("alternative_rooms", [])) > 0 else False,
+        timed_edge(SEARCH_ALTERNATIVE_ROOMS, lambda state: True if len(state.get("alternative_rooms", [])) > 0 else False),
         {
             True: CHOOSE_ALTERNATIVE_ROOMS,
             False: ASK_CLARIFICATION  # Ask user if they want to modify their requirements
         }
     )
 
-    # Edge: Ask clarification -> Find matching rooms
+    # Edge: Handle error -> Ask clarification or End
     workflow.add_conditional_edges(
         HANDLE_ERROR,
-        lambda state: state.get("clarification_needed", False),
+        timed_edge(HANDLE_ERROR, lambda state: state.get("clarification_needed", False)),
         {
             True: ASK_CLARIFICATION,
             False: END
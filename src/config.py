@@ -34,9 +34,15 @@ LANGCHAIN_ENDPOINT = os.environ["LANGCHAIN_ENDPOINT"]
 LANGCHAIN_API_KEY = os.environ["LANGCHAIN_API_KEY"]
 
 # File Paths
-ROOMS_FILE = PROJECT_DIR / "data/rooms.json"
-BOOKINGS_FILE = PROJECT_DIR / "data/bookings.json"
+# Rooms and bookings files can be pointed elsewhere, e.g. at synthetic data by the benchmarks
+ROOMS_FILE = Path(os.getenv("ROOMS_FILE", PROJECT_DIR / "data/rooms.json"))
+BOOKINGS_FILE = Path(os.getenv("BOOKINGS_FILE", PROJECT_DIR / "data/bookings.json"))
+BOOKINGS_DB_FILE = PROJECT_DIR / "data/bookings.db"
+BOOKING_SHARDS_DIR = PROJECT_DIR / "data/booking_shards"
+SESSIONS_DB_FILE = PROJECT_DIR / "data/sessions.db"
 MSG_JSON_FILE = PROJECT_DIR / "data/clarification_messages.json"
+ROOM_MESSAGES_FILE = PROJECT_DIR / "data/room_messages.json"
+EQUIPMENT_SYNONYMS_FILE = PROJECT_DIR / "data/equipment_synonyms.json"
 LOGS_DIR = PROJECT_DIR / "logs"
 
 
@@ -44,6 +50,68 @@ LOGS_DIR = PROJECT_DIR / "logs"
 recursion_limit = 50
 # sys.setrecursionlimit(recursion_limit)
 DELAY = timedelta(hours=0.5)
+# Resolution of the per-day occupancy grid used for batched availability checks
+OCCUPANCY_SLOT_MINUTES = int(os.getenv("OCCUPANCY_SLOT_MINUTES", "15"))
+# Days of the occupancy grid kept materialized, least recently queried evicted first
+OCCUPANCY_MAX_DAYS = int(os.getenv("OCCUPANCY_MAX_DAYS", "90"))
+# Alternative times offered for busy rooms: hours searched after the requested start,
+# and free slots listed per room
+ALTERNATIVE_TIMES_WINDOW_HOURS = float(os.getenv("ALTERNATIVE_TIMES_WINDOW_HOURS", "24"))
+ALTERNATIVE_TIMES_PER_ROOM = int(os.getenv("ALTERNATIVE_TIMES_PER_ROOM", "3"))
+# Rule-based extraction of well-formed requests before calling the LLM
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "1") == "1"
+# How matching rooms are presented: "template" (precompiled phrasings) or "llm"
+ROOM_LISTING_MODE = os.getenv("ROOM_LISTING_MODE", "template")
+# Minimum trigram similarity (0-1) for resolving an unknown equipment name to a catalog one,
+# and the lead it needs over the next most similar catalog name
+EQUIPMENT_MATCH_THRESHOLD = float(os.getenv("EQUIPMENT_MATCH_THRESHOLD", "0.65"))
+EQUIPMENT_MATCH_MARGIN = float(os.getenv("EQUIPMENT_MATCH_MARGIN", "0.1"))
+# Largest number of meetings accepted by one /booking/bulk request
+BULK_BOOKING_MAX_ITEMS = int(os.getenv("BULK_BOOKING_MAX_ITEMS", "500"))
+# Longest meeting accepted by the bulk booking API, in hours
+BULK_BOOKING_MAX_HOURS = float(os.getenv("BULK_BOOKING_MAX_HOURS", "24"))
+# LLM providers routed by create_workflow, in order of preference
+LLM_ROUTER_PROVIDERS = [name.strip() for name in os.getenv("LLM_ROUTER_PROVIDERS", "groq,gemini,ollama").split(",") if name.strip()]
+# Rolling window of calls (count and age) per provider, consecutive failures opening its circuit,
+# seconds before a trial call, and concurrent calls allowed per provider
+LLM_ROUTER_WINDOW = int(os.getenv("LLM_ROUTER_WINDOW", "50"))
+LLM_ROUTER_WINDOW_SECONDS = float(os.getenv("LLM_ROUTER_WINDOW_SECONDS", "60"))
+LLM_ROUTER_FAILURE_THRESHOLD = int(os.getenv("LLM_ROUTER_FAILURE_THRESHOLD", "3"))
+LLM_ROUTER_COOLDOWN_SECONDS = float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "30"))
+LLM_ROUTER_MAX_IN_FLIGHT = int(os.getenv("LLM_ROUTER_MAX_IN_FLIGHT", "16"))
+# Seconds a call waits for a free slot when every healthy provider is at its in-flight cap
+LLM_ROUTER_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("LLM_ROUTER_ACQUIRE_TIMEOUT_SECONDS", "30"))
+# Record/replay chat model ("replay" provider): "record" captures the completions
+# of REPLAY_LLM_RECORD_PROVIDER, "replay" serves them with synthetic latency
+REPLAY_LLM_MODE = os.getenv("REPLAY_LLM_MODE", "replay")
+REPLAY_LLM_CASSETTE = Path(os.getenv("REPLAY_LLM_CASSETTE", PROJECT_DIR / "data/llm_cassette.jsonl"))
+REPLAY_LLM_RECORD_PROVIDER = os.getenv("REPLAY_LLM_RECORD_PROVIDER", "groq")
+REPLAY_LLM_LATENCY_MS = float(os.getenv("REPLAY_LLM_LATENCY_MS", "0"))
+REPLAY_LLM_JITTER_MS = float(os.getenv("REPLAY_LLM_JITTER_MS", "0"))
+# Coalescing of parse_request LLM calls across sessions (one provider request per call
+# still): max batch size, milliseconds the first call waits for others, and batches in flight
+LLM_BATCH_ENABLED = os.getenv("LLM_BATCH_ENABLED", "0") == "1"
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+LLM_BATCH_WAIT_MS = float(os.getenv("LLM_BATCH_WAIT_MS", "10"))
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+# Server-side Flask sessions: "memory" (per-process LRU) or "sqlite" (shared by workers)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+# Conversation context sent to the LLM: token budget, messages kept verbatim,
+# and length of each line of the rolling summary of older messages
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+CONTEXT_RECENT_MESSAGES = int(os.getenv("CONTEXT_RECENT_MESSAGES", "6"))
+CONTEXT_SUMMARY_LINE_CHARS = int(os.getenv("CONTEXT_SUMMARY_LINE_CHARS", "160"))
+# Cache of LLM extractions in parse_request
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "1024"))
+PARSE_CACHE_TTL_SECONDS = float(os.getenv("PARSE_CACHE_TTL_SECONDS", "600"))
+PARSE_CACHE_TIME_BUCKET_MINUTES = int(os.getenv("PARSE_CACHE_TIME_BUCKET_MINUTES", "5"))
+# Booking storage backend: "json" (snapshot + journal files), "sharded" or "sqlite"
+BOOKING_BACKEND = os.getenv("BOOKING_BACKEND", "json")
+# Number of hash buckets for the sharded backend, 0 means one shard per room
+BOOKING_SHARD_BUCKETS = int(os.getenv("BOOKING_SHARD_BUCKETS", "0"))
+# Number of journaled bookings after which the journal is folded into the snapshot
+JOURNAL_COMPACT_THRESHOLD = int(os.getenv("JOURNAL_COMPACT_THRESHOLD", "500"))
 
 # Ensure logs directory exists
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,14 +1,11 @@
-
 # src/helper.py
 import json
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
+from datetime import datetime
 from langchain.prompts import PromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain.output_parsers import PydanticOutputParser
 
-from typing import Dict
+from typing import Callable, Dict, List
 
 from config import *
 from booking_agent.schemas import *
@@ -21,30 +18,67 @@ REQUIRED_FIELDS = [
     "equipments", "user_name", "capacity"
 ]
 
+##==============================================================================
+# LLM PROVIDERS: SDKs are imported only when their provider is initialized
+##==============================================================================
+def _load_ollama(temp: float):
+    from langchain_ollama import ChatOllama
+    llm = ChatOllama(model_name=OLLAMA_MODEL_NAME,
+                     ollama_api_key=OLLAMA_API_KEY,
+                     temperature=temp)
+    logger.info(f">>>> Load Ollama: {OLLAMA_MODEL_NAME} model correctly.")
+    return llm
+
+def _load_gemini(temp: float):
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL_NAME,  # Explicitly pass the model
+                                 google_api_key=GEMINI_API_KEY,
+                                 temperature=temp)
+    logger.info(f">>>> Load Gemini: {GEMINI_MODEL_NAME} model correctly.")
+    return llm
+
+def _load_groq(temp: float):
+    from langchain_groq import ChatGroq
+    llm = ChatGroq(model_name=GROQ_MODEL_NAME,
+                   groq_api_key=GROQ_API_KEY,
+                   temperature=temp)
+    logger.info(f">>>> Load Groq: {GROQ_MODEL_NAME} model correctly.")
+    return llm
+
+def _load_replay(temp: float):
+    from booking_agent.replay_llm import ReplayChatModel
+    recorder = None
+    if REPLAY_LLM_MODE == "record":
+        recorder = initialize_llm(REPLAY_LLM_RECORD_PROVIDER, temp)
+    llm = ReplayChatModel(cassette=REPLAY_LLM_CASSETTE,
+                          mode=REPLAY_LLM_MODE,
+                          recorder=recorder,
+                          latency_ms=REPLAY_LLM_LATENCY_MS,
+                          jitter_ms=REPLAY_LLM_JITTER_MS)
+    logger.info(f">>>> Load Replay LLM ({REPLAY_LLM_MODE}): {REPLAY_LLM_CASSETTE}.")
+    return llm
+
+LLM_PROVIDERS: Dict[str, Callable] = {
+    "ollama": _load_ollama,
+    "gemini": _load_gemini,
+    "groq": _load_groq,
+    "replay": _load_replay,
+}
+
+def register_llm_provider(name: str, loader: Callable):
+    """
+    Register a function that takes the temperature and returns a chat model.
+    """
+    LLM_PROVIDERS[name.lower()] = loader
+
 def initialize_llm(name: str, temp: float=0.0):
     """
     Initialize the LLM with tools. we can choose from different types of LLMs.
     """
-    if name.lower() == "ollama":
-        llm = ChatOllama(model_name=OLLAMA_MODEL_NAME,
-                          ollama_api_key=OLLAMA_API_KEY,
-                          temperature=temp)
-        logger.info(f">>>> Load Ollama: {OLLAMA_MODEL_NAME} model correctly.")
-    
-    elif name.lower() == "gemini":
-        llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL_NAME,  # Explicitly pass the model
-                                      google_api_key=GEMINI_API_KEY,
-                                      temperature=temp)
-        logger.info(f">>>> Load Gemini: {GEMINI_MODEL_NAME} model correctly.")
-
-    elif name.lower() == "groq":
-        llm = ChatGroq(model_name=GROQ_MODEL_NAME,
-                        groq_api_key=GROQ_API_KEY,
-                        temperature=temp)
-        logger.info(f">>>> Load Groq: {GROQ_MODEL_NAME} model correctly.")
-
-    else:
+    loader = LLM_PROVIDERS.get(name.lower())
+    if loader is None:
         raise ValueError(f"Unsupported LLM: {name}")
+    llm = loader(temp)
     
     # llm.bind_tools([
     #     save_bookings_tool,
@@ -57,6 +91,19 @@ def initialize_llm(name: str, temp: float=0.0):
 
     return llm
 
+def initialize_llm_router(names: List[str] = LLM_ROUTER_PROVIDERS, temp: float = 0.0):
+    """
+    Route LLM calls over several providers, with failover and circuit breaking.
+    Each provider is only initialized when the router first sends it a call.
+    """
+    from booking_agent.llm_router import LLMRouter
+    for name in names:
+        if name.lower() not in LLM_PROVIDERS:
+            raise ValueError(f"Unsupported LLM: {name}")
+    return LLMRouter({
+        name.lower(): (lambda name=name: initialize_llm(name, temp)) for name in names
+    })
+
 def apply_request_prompt(parsing_schema: PydanticOutputParser) -> PromptTemplate: 
     """
     Apply the prompt template to the LLM. Variables are defined in prompt_config.py
@@ -118,6 +165,19 @@ def get_missing_fields(parsed_request: dict) -> list:
         # or (parsed_request[field] == "nothing")
         or (field == "duration_hours" and parsed_request[field] <= 0)
     ]
+
+def get_request_start_time(parsed_request: dict) -> datetime:
+    """
+    Combine the parsed `start_date` (YYYY-MM-DD) and `start_time` (HH:MM:SS AM/PM)
+    into a single datetime. ISO formatted start times are accepted as they are.
+    """
+    start_time = parsed_request["start_time"]
+    try:
+        return datetime.fromisoformat(start_time)
+    except ValueError:
+        return datetime.strptime(f"{parsed_request['start_date']} {start_time}",
+                                 "%Y-%m-%d %I:%M:%S %p")
+
 def load_clarification_msgs(filepath:str = MSG_JSON_FILE) -> Dict:
     """
     Load clarification messages from a JSON file.
@@ -127,18 +187,23 @@ def load_clarification_msgs(filepath:str = MSG_JSON_FILE) -> Dict:
 
 
 
-# def format_available_times_msg(available_times: dict) -> str:
-#     """
-#     Generate a user-friendly message listing available times for matching rooms.
-#     """
-#     if not available_times:
-#         return "No available times found for the matching rooms."
-
-#     messages = [
-#         f"Room '{room}' NOT available at the following times: {', '.join(times)}"
-#         for room, times in available_times.items()
-#     ]
-#     return "Here are the available times for the matching rooms:\n" + "\n".join(messages)
+def format_available_times_msg(available_times: Dict[str, List[Dict]]) -> str:
+    """
+    Generate a user-friendly message listing the free slots of each room, by room name.
+    """
+    if not available_times:
+        return "No available times found for the matching rooms."
+
+    messages = []
+    for room, slots in available_times.items():
+        times = []
+        for slot in slots:
+            start, end = datetime.fromisoformat(slot["start_time"]), datetime.fromisoformat(slot["end_time"])
+            # The day of the end is only repeated when it differs
+            end_format = "%I:%M %p" if end.date() == start.date() else "%a %d %b %I:%M %p"
+            times.append(f"{start:%a %d %b %I:%M %p} to {end.strftime(end_format)}")
+        messages.append(f"- {room}: free from {', '.join(times)}")
+    return "These rooms are free at other times:\n" + "\n".join(messages)
 
 #### Deprecated: Let LLM handle the clarifications ####
 # def get_clarification_question(state: AgentState) -> str:
@@ -0,0 +1,294 @@
+# src/load_test.py
+"""
+Concurrent load generator replaying multi-turn conversations against the app.
+
+Each line of the conversations file is one conversation:
+`{"id": "...", "turns": ["first user message", "second user message", ...]}`.
+Every conversation is played by its own virtual user (own cookie, so its own
+server-side session), in-process through the Flask test client or over HTTP.
+Conversations start at `--rate` per second (Poisson arrivals, 0 = as fast as
+possible) with at most `--users` in flight.
+
+    python src/load_test.py --users 20 --total 200
+    python src/load_test.py --target http://127.0.0.1:5000 --users 50 --rate 10 --json logs/load.json
+
+Run the in-process mode with `LLM_ROUTER_PROVIDERS=replay` to load-test without
+calling a real LLM.
+
+Bookings made during the run are checked for double bookings. Chat turns book
+at most one room each, at times picked by the conversations, so contention is
+best tested with `--endpoint /booking/bulk`. There every virtual user books one
+meeting through the bulk API, on `--contended-rooms` rooms and
+`--contended-slots` hourly slots, so users race for the same rooms:
+
+    python src/load_test.py --endpoint /booking/bulk --users 50 --total 500
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import statistics
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parent
+DEFAULT_CONVERSATIONS = SRC_DIR.parent / "data" / "load_conversations.jsonl"
+BULK_ENDPOINT = "/booking/bulk"
+
+
+def load_conversations(filepath: Path) -> List[Dict]:
+    """Conversations with at least one turn, in file order."""
+    conversations = []
+    with open(filepath, "r") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            turns = entry.get("turns") or ([entry["user_input"]] if entry.get("user_input") else [])
+            if turns:
+                conversations.append({"id": entry.get("id", f"line-{number}"), "turns": turns})
+    if not conversations:
+        raise ValueError(f"No conversations found in {filepath}")
+    return conversations
+
+
+def contended_bookings(total: int, rooms: int, slots: int, seed: int) -> List[Dict]:
+    """
+    One single-turn "conversation" per virtual user, whose turn is a bulk booking
+    request for one of `rooms` rooms at one of `slots` hourly slots, a month out.
+    """
+    from mock_apis.room_services import get_room_catalog
+    rng = random.Random(seed)
+    room_ids = [room["id"] for room in get_room_catalog().rooms[:rooms]]
+    first_slot = (datetime.now() + timedelta(days=30)).replace(hour=9, minute=0, second=0, microsecond=0)
+    conversations = []
+    for i in range(total):
+        item = {
+            "user_name": f"load-user-{i}",
+            "room_id": rng.choice(room_ids),
+            "start_time": (first_slot + timedelta(hours=rng.randrange(slots))).isoformat(),
+            "duration_hours": 1,
+        }
+        conversations.append({"id": f"booking-{i}", "turns": [json.dumps({"items": [item]})]})
+    return conversations
+
+
+##==============================================================================
+# VIRTUAL USERS: one client (and cookie jar) per conversation
+##==============================================================================
+def inprocess_client_factory(endpoint: str) -> Callable[[], Callable[[str], int]]:
+    from app import app
+
+    def new_user():
+        client = app.test_client()
+
+        def send(user_input: str) -> int:
+            if endpoint == BULK_ENDPOINT:
+                return client.post(endpoint, json=json.loads(user_input)).status_code
+            if endpoint.endswith("/stream"):
+                response = client.post(endpoint, data={"user_input": user_input})
+                body = response.get_data(as_text=True)
+                return 500 if "event: error" in body else response.status_code
+            return client.post(endpoint, data={"user_input": user_input}).status_code
+        return send
+    return new_user
+
+def http_client_factory(base_url: str, endpoint: str, timeout: float) -> Callable[[], Callable[[str], int]]:
+    url = base_url.rstrip("/") + endpoint
+
+    def new_user():
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+        def send(user_input: str) -> int:
+            if endpoint == BULK_ENDPOINT:
+                body = user_input.encode()
+                headers = {"Content-Type": "application/json"}
+            elif endpoint.endswith("/async"):
+                body = json.dumps({"user_input": user_input}).encode()
+                headers = {"Content-Type": "application/json"}
+            else:
+                body = urllib.parse.urlencode({"user_input": user_input}).encode()
+                headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            try:
+                with opener.open(urllib.request.Request(url, data=body, headers=headers), timeout=timeout) as response:
+                    response.read()
+                    return response.status
+            except urllib.error.HTTPError as e:
+                return e.code
+        return send
+    return new_user
+
+
+##==============================================================================
+# DOUBLE BOOKINGS
+##==============================================================================
+def count_double_bookings(bookings: Dict[str, List[Dict]]) -> int:
+    """Number of bookings overlapping an earlier booking of the same room."""
+    overlaps = 0
+    for room_bookings in bookings.values():
+        intervals = sorted(
+            (datetime.fromisoformat(b["start_time"]), datetime.fromisoformat(b["end_time"]))
+            for b in room_bookings
+        )
+        latest_end = None
+        for start, end in intervals:
+            if latest_end is not None and start < latest_end:
+                overlaps += 1
+            latest_end = end if latest_end is None else max(latest_end, end)
+    return overlaps
+
+def current_double_bookings() -> Optional[int]:
+    """Double bookings in the configured booking store, if it is reachable from here."""
+    try:
+        from mock_apis.booking_services import get_booking_store
+        return count_double_bookings(get_booking_store().load_all())
+    except Exception as e:
+        print(f"Warning: could not read bookings: {e}", file=sys.stderr)
+        return None
+
+
+##==============================================================================
+# RUN
+##==============================================================================
+def percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def run_load(conversations: List[Dict], new_user: Callable, users: int, rate: float,
+             total: int, seed: int) -> Dict:
+    """Play `total` conversations (cycling through the file) and collect turn results."""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    turns = 0
+    lock = threading.Lock()
+
+    def play(conversation: Dict):
+        nonlocal turns
+        send = new_user()
+        for user_input in conversation["turns"]:
+            started = time.perf_counter()
+            try:
+                status = send(user_input)
+                error = None if status < 400 else f"HTTP {status}"
+            except Exception as e:
+                error = type(e).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                turns += 1
+                if error:
+                    errors[error] = errors.get(error, 0) + 1
+                else:
+                    latencies.append(elapsed)
+            if error:
+                # The rest of the conversation depends on this turn
+                break
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users, thread_name_prefix="virtual-user") as pool:
+        next_start = started
+        for i in range(total):
+            if rate > 0:
+                next_start += rng.expovariate(rate)
+                time.sleep(max(0.0, next_start - time.perf_counter()))
+            pool.submit(play, conversations[i % len(conversations)])
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    failed = sum(errors.values())
+    return {
+        "conversations": total,
+        "turns": turns,
+        "duration_seconds": duration,
+        "throughput_turns_per_second": turns / duration if duration else 0.0,
+        "throughput_conversations_per_second": total / duration if duration else 0.0,
+        "latency_seconds": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "mean": statistics.fmean(latencies) if latencies else None,
+            "max": latencies[-1] if latencies else None,
+        },
+        "errors": failed,
+        "error_rate": failed / turns if turns else 0.0,
+        "errors_by_type": errors,
+    }
+
+def print_report(report: Dict):
+    latency = report["latency_seconds"]
+    ms = lambda value: "n/a" if value is None else f"{value * 1000:.1f} ms"
+    print(f"Target:        {report['target']} {report['endpoint']}")
+    print(f"Users / rate:  {report['users']} / {report['rate'] or 'max'} conversations/s")
+    print(f"Conversations: {report['conversations']} ({report['turns']} turns) in {report['duration_seconds']:.2f} s")
+    print(f"Throughput:    {report['throughput_turns_per_second']:.2f} turns/s")
+    print(f"Latency:       p50 {ms(latency['p50'])}, p95 {ms(latency['p95'])}, p99 {ms(latency['p99'])}")
+    print(f"Errors:        {report['errors']} ({report['error_rate']:.1%}) {report['errors_by_type'] or ''}")
+    if report["double_bookings"] is not None:
+        print(f"Double bookings: {report['double_bookings']} new "
+              f"({report['double_bookings_total']} in the store)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--conversations", type=Path, default=DEFAULT_CONVERSATIONS,
+                        help="JSONL file of conversations")
+    parser.add_argument("--target", default="inprocess",
+                        help="'inprocess' (Flask test client) or the base URL of a running server")
+    parser.add_argument("--endpoint", default="/booking",
+                        help="/booking, /booking/stream, /booking/bulk, or /booking/async on the ASGI server")
+    parser.add_argument("--contended-rooms", type=int, default=3,
+                        help="With /booking/bulk: rooms the virtual users compete for")
+    parser.add_argument("--contended-slots", type=int, default=4,
+                        help="With /booking/bulk: hourly slots the virtual users compete for")
+    parser.add_argument("--users", type=int, default=10, help="Maximum concurrent virtual users")
+    parser.add_argument("--rate", type=float, default=0.0, help="New conversations per second (0 = max)")
+    parser.add_argument("--total", type=int, help="Conversations to play (default: each once)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="HTTP timeout per turn in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the arrival process")
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    args = parser.parse_args()
+
+    if args.endpoint == BULK_ENDPOINT:
+        conversations = contended_bookings(args.total or args.users * 10, args.contended_rooms,
+                                           args.contended_slots, args.seed)
+    else:
+        conversations = load_conversations(args.conversations)
+    if args.target == "inprocess":
+        new_user = inprocess_client_factory(args.endpoint)
+    else:
+        new_user = http_client_factory(args.target, args.endpoint, args.timeout)
+
+    # Over HTTP this reads the store configured here, i.e. the server's only if shared
+    double_bookings_before = current_double_bookings()
+    report = run_load(conversations, new_user, args.users, args.rate,
+                      args.total or len(conversations), args.seed)
+    double_bookings_after = current_double_bookings()
+
+    report.update({
+        "target": args.target,
+        "endpoint": args.endpoint,
+        "users": args.users,
+        "rate": args.rate,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "double_bookings_total": double_bookings_after,
+        "double_bookings": (
+            None if double_bookings_before is None or double_bookings_after is None
+            else double_bookings_after - double_bookings_before
+        ),
+    })
+    print_report(report)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# src/metrics.py
+"""
+Latency histograms and gauges, exposed in the Prometheus text format by the
+`/metrics` route of the Flask app.
+"""
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds, from sub-millisecond index lookups to slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Cumulative histogram per label combination, like a Prometheus histogram."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {repr(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Last set value per label combination."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return "\n".join(line for metric in self.metrics for line in metric.collect()) + "\n"
+
+
+REGISTRY = Registry()
+
+NODE_SECONDS = REGISTRY.register(Histogram(
+    "booking_agent_node_duration_seconds", "Duration of workflow nodes.", ["node"]))
+EDGE_SECONDS = REGISTRY.register(Histogram(
+    "booking_agent_edge_duration_seconds", "Duration of conditional edge functions, by source node.", ["source"]))
+LLM_CALL_SECONDS = REGISTRY.register(Histogram(
+    "booking_agent_llm_call_duration_seconds", "Duration of LLM calls, by provider and outcome.",
+    ["provider", "outcome"]))
+STORE_OP_SECONDS = REGISTRY.register(Histogram(
+    "booking_agent_store_operation_duration_seconds", "Duration of booking store operations.",
+    ["backend", "operation"]))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "booking_agent_request_duration_seconds", "End-to-end duration of HTTP requests, by endpoint.",
+    ["endpoint"]))
+PARSE_CACHE_STATS = REGISTRY.register(Gauge(
+    "booking_agent_parse_cache", "Parse cache statistics (size, hits, misses, ...).", ["stat"]))
@@ -0,0 +1,224 @@
+# src/mock_apis/booking_index.py
+"""In-memory interval index over room bookings for fast conflict checks."""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+from config import DELAY, OCCUPANCY_SLOT_MINUTES, OCCUPANCY_MAX_DAYS
+from mock_apis.occupancy_grid import OccupancyGrid
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(value: Union[str, datetime]) -> int:
+    """
+    Convert an ISO string or naive datetime to whole seconds since the epoch.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int((value - EPOCH).total_seconds())
+
+
+def from_epoch(seconds: int) -> datetime:
+    """
+    Convert seconds since the epoch back to a naive datetime.
+    """
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class RoomIntervals:
+    """
+    Sorted booking intervals of a single room, stored as compact columns.
+
+    Intervals are kept sorted by start with the `DELAY` buffer already added
+    to their end. `max_ends[i]` holds the largest end among the first `i + 1`
+    intervals, so an overlap query is one bisect plus one lookup. `users`
+    holds ids into the `booked_by` table of the owning `BookingIndex`.
+    """
+
+    __slots__ = ("starts", "ends", "max_ends", "users")
+
+    def __init__(self):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.max_ends = array("q")
+        self.users = array("q")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def from_entries(cls, entries: List[Tuple[int, int, int]]) -> "RoomIntervals":
+        """
+        Build the columns from already padded (start, end, user) entries in one
+        sort and one pass over the prefix maxima, instead of one `add` each.
+        """
+        room = cls()
+        # Stable sort: equal starts keep their order, as with successive `add`s
+        entries = sorted(entries, key=lambda entry: entry[0])
+        room.starts = array("q", [start for start, _, _ in entries])
+        room.ends = array("q", [end for _, end, _ in entries])
+        room.users = array("q", [user for _, _, user in entries])
+        running = None
+        max_ends = []
+        for end in room.ends:
+            running = end if running is None or end > running else running
+            max_ends.append(running)
+        room.max_ends = array("q", max_ends)
+        return room
+
+    def add(self, start: int, end: int, user: int = -1):
+        """Insert a single already padded interval and keep the prefix maxima valid."""
+        pos = bisect_right(self.starts, start)
+        self.starts.insert(pos, start)
+        self.ends.insert(pos, end)
+        self.max_ends.insert(pos, end)
+        self.users.insert(pos, user)
+        running = self.max_ends[pos - 1] if pos > 0 else end
+        for i in range(pos, len(self.ends)):
+            running = max(running, self.ends[i])
+            self.max_ends[i] = running
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check whether [start, end) intersects any stored interval."""
+        # Only intervals starting before `end` can overlap the query
+        k = bisect_left(self.starts, end)
+        return k > 0 and self.max_ends[k - 1] > start
+
+    def overlapping(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Return the stored intervals intersecting [start, end), sorted by start."""
+        k = bisect_left(self.starts, end)
+        found = []
+        # Walk back while an earlier interval may still reach past `start`
+        while k > 0 and self.max_ends[k - 1] > start:
+            k -= 1
+            if self.ends[k] > start:
+                found.append((self.starts[k], self.ends[k]))
+        return found[::-1]
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        return list(zip(self.starts, self.ends))
+
+
+class BookingIndex:
+    """
+    Per-room interval index built once from the bookings JSON dict.
+
+    It is the in-memory form of the bookings: times are parsed to epoch seconds
+    once at load time and `booked_by` names are interned in a shared table.
+    `to_bookings` converts back to the JSON layout at the persistence boundary.
+    """
+
+    def __init__(self, delay: timedelta = DELAY, slot_minutes: int = OCCUPANCY_SLOT_MINUTES,
+                 max_days: int = OCCUPANCY_MAX_DAYS):
+        self.delay_seconds = int(delay.total_seconds())
+        self.rooms: Dict[str, RoomIntervals] = {}
+        self.users: List[Optional[str]] = []
+        self._user_ids: Dict[Optional[str], int] = {}
+        self.grid = OccupancyGrid(self._day_intervals, slot_minutes=slot_minutes, max_days=max_days)
+
+    @classmethod
+    def from_bookings(
+            cls, existing_bookings: Dict[str, List[Dict]], delay: timedelta = DELAY
+        ) -> "BookingIndex":
+        """Parse every booking once and index it by room id, building each room in bulk."""
+        index = cls(delay=delay)
+        entries: Dict[str, List[Tuple[int, int, int]]] = {}
+        for room_id, room_bookings in existing_bookings.items():
+            room_entries = entries.setdefault(str(room_id), [])
+            for booking in room_bookings:
+                room_entries.append((
+                    to_epoch(booking["start_time"]),
+                    to_epoch(booking["end_time"]) + index.delay_seconds,
+                    index._user_id(booking.get("booked_by")),
+                ))
+        for room_id, room_entries in entries.items():
+            if room_entries:
+                index.rooms[room_id] = RoomIntervals.from_entries(room_entries)
+        # Grid days are materialized from `rooms` on first query, nothing to mark
+        return index
+
+    def _user_id(self, booked_by: Optional[str]) -> int:
+        user = self._user_ids.get(booked_by)
+        if user is None:
+            user = self._user_ids[booked_by] = len(self.users)
+            self.users.append(booked_by)
+        return user
+
+    def add(self, room_id: Union[int, str],
+            start_time: Union[str, datetime], end_time: Union[str, datetime],
+            booked_by: Optional[str] = None):
+        """Index a booking; the `DELAY` buffer is applied to its end here."""
+        start, end = to_epoch(start_time), to_epoch(end_time) + self.delay_seconds
+        # Under the grid lock, so a day being materialized sees the booking whole
+        with self.grid.lock:
+            room = self.rooms.setdefault(str(room_id), RoomIntervals())
+            room.add(start, end, self._user_id(booked_by))
+            self.grid.mark(room_id, start, end)
+
+    def room_bookings(self, room_id: Union[int, str]) -> List[Dict[str, Optional[str]]]:
+        """Bookings of a room in the JSON layout, sorted by start time."""
+        room = self.rooms.get(str(room_id))
+        if not room:
+            return []
+        return [
+            {
+                "start_time": from_epoch(start).isoformat(),
+                "end_time": from_epoch(end - self.delay_seconds).isoformat(),
+                "booked_by": self.users[user],
+            }
+            for start, end, user in zip(room.starts, room.ends, room.users)
+        ]
+
+    def to_bookings(self) -> Dict[str, List[Dict[str, Optional[str]]]]:
+        """All bookings in the JSON layout of `bookings.json`."""
+        return {room_id: self.room_bookings(room_id) for room_id in self.rooms}
+
+    def _day_intervals(self, day_start: int, day_end: int) -> Dict[str, List[Tuple[int, int]]]:
+        """Padded intervals of every room touching [day_start, day_end), for the grid."""
+        intervals = {}
+        for room_id, room in self.rooms.items():
+            found = room.overlapping(day_start, day_end)
+            if found:
+                intervals[room_id] = found
+        return intervals
+
+    def has_conflict(
+            self, room_id: Union[int, str], start_time: Union[str, datetime],
+            end_time: Optional[Union[str, datetime]] = None,
+            duration_hours: Optional[float] = None,
+        ) -> bool:
+        """Check if the room is already booked at any point of the requested time."""
+        room = self.rooms.get(str(room_id))
+        if not room:
+            return False
+        start = to_epoch(start_time)
+        if end_time is not None:
+            end = to_epoch(end_time)
+        else:
+            end = start + int(duration_hours * 3600)
+        return room.overlaps(start, end)
+
+    def free_rooms(
+            self, room_ids: List[Union[int, str]], start_time: Union[str, datetime],
+            end_time: Optional[Union[str, datetime]] = None,
+            duration_hours: Optional[float] = None,
+        ) -> List[bool]:
+        """
+        Tell for each room whether it is free for the requested time, using one
+        vectorized lookup in the occupancy grid. Rooms the grid flags as busy
+        are re-checked exactly, since the grid rounds bookings out to whole slots.
+        """
+        start = to_epoch(start_time)
+        end = to_epoch(end_time) if end_time is not None else start + int(duration_hours * 3600)
+        busy = self.grid.busy(room_ids, start, end)
+        return [
+            not (flagged and self.rooms[str(room_id)].overlaps(start, end))
+            for room_id, flagged in zip(room_ids, busy)
+        ]
+
+    def room_intervals(self, room_id: Union[int, str]) -> List[Tuple[int, int]]:
+        """Return the padded (start, end) epoch intervals of a room, sorted by start."""
+        room = self.rooms.get(str(room_id))
+        return room.intervals() if room else []
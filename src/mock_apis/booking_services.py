@@ -1,58 +1,293 @@
 # src/mock_apis/booking_services.py
+import os
 import json
+import zlib
+import fcntl
+import sqlite3
+import threading
+from contextlib import contextmanager
+from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Optional, Union, Dict
+from typing import List, Optional, Tuple, Union, Dict
 
 from langchain_core.tools import tool
 
-from config import BOOKINGS_FILE, DELAY
+from config import (
+    BOOKINGS_FILE, BOOKINGS_DB_FILE, BOOKING_BACKEND, BOOKING_SHARDS_DIR,
+    BOOKING_SHARD_BUCKETS, DELAY, JOURNAL_COMPACT_THRESHOLD
+)
+from metrics import STORE_OP_SECONDS
+from mock_apis.booking_index import BookingIndex, to_epoch, from_epoch
+from mock_apis.free_slots import find_free_slots
 
+# Cached index per bookings file, rebuilt only when the file changes on disk
+_BOOKING_INDEXES: Dict[Path, tuple] = {}
+# Number of entries currently in each journal, counted once on first write
+_JOURNAL_SIZES: Dict[Path, int] = {}
+# Process-wide lock per bookings file, see `journal_lock`
+_JOURNAL_LOCKS: Dict[Path, "_JournalLock"] = {}
+_JOURNAL_LOCKS_GUARD = threading.Lock()
+# Key of the snapshot holding the sequence number of the last journal entry folded into it
+SNAPSHOT_SEQ_KEY = "__journal_seq__"
 
-# @tool("load_bookings", description="Load existing bookings from external file.")
-def load_bookings(
-        filepath: Path = BOOKINGS_FILE
-    ) -> Dict[str, List[Dict[str, Union[str, datetime]]]]:
-    """Load existing bookings from external file."""
+
+def journal_path(filepath: Path = BOOKINGS_FILE) -> Path:
+    """Path of the append-only journal that goes with a bookings snapshot."""
+    filepath = Path(filepath)
+    return filepath.with_name(f"{filepath.stem}.journal.jsonl")
+
+def lock_path(filepath: Path = BOOKINGS_FILE) -> Path:
+    """Path of the sidecar file `flock`ed while the bookings files are written."""
+    filepath = Path(filepath)
+    return filepath.with_name(f"{filepath.name}.lock")
+
+
+class _JournalLock:
+    """Thread lock plus `flock` of one bookings file, re-entrant within a thread."""
+
+    def __init__(self, filepath: Path):
+        self.path = lock_path(filepath)
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+@contextmanager
+def journal_lock(filepath: Path = BOOKINGS_FILE):
+    """
+    Hold the bookings file exclusively, against other threads and processes.
+    Re-entrant, so a booking can compact the journal while holding it.
+    """
+    filepath = Path(filepath)
+    with _JOURNAL_LOCKS_GUARD:
+        lock = _JOURNAL_LOCKS.setdefault(filepath, _JournalLock(filepath))
+    with lock.thread_lock:
+        if lock.depth == 0:
+            lock.file = open(lock.path, "a")
+            fcntl.flock(lock.file, fcntl.LOCK_EX)
+        lock.depth += 1
+        try:
+            yield
+        finally:
+            lock.depth -= 1
+            if lock.depth == 0:
+                fcntl.flock(lock.file, fcntl.LOCK_UN)
+                lock.file.close()
+                lock.file = None
+
+def _fsync_directory(path: Path):
+    """Persist a rename in `path`'s directory."""
+    fd = os.open(Path(path).parent, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _load_snapshot(filepath: Path) -> Tuple[Dict[str, List[Dict[str, Union[str, datetime]]]], int]:
+    """Load the compacted bookings snapshot and the journal sequence number it includes."""
     existing_data: Dict[str, List[Dict[str, Union[str, datetime]]]] = {}
     try:
         with open(filepath, "r") as f:
             existing_data = json.load(f)
+    except FileNotFoundError:
+        existing_data = {}
     except json.JSONDecodeError:
         print(f"Warning: Could not decode existing JSON in {filepath}. Starting fresh.")
         existing_data = {}
-    return existing_data
+    return existing_data, int(existing_data.pop(SNAPSHOT_SEQ_KEY, 0))
+
+def _replay_journal(filepath: Path, bookings: Dict[str, List[Dict]], after_seq: int = 0) -> Tuple[int, int]:
+    """
+    Append the journaled bookings numbered after `after_seq` (the others are
+    already in the snapshot) to `bookings`. Return the number of entries
+    appended and the last sequence number seen. A torn last line (crash
+    during append) is skipped.
+    """
+    count, last_seq = 0, after_seq
+    try:
+        with open(journal_path(filepath), "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Warning: Skipping corrupted journal entry in {journal_path(filepath)}.")
+                    continue
+                # Entries written before sequence numbers were introduced have none
+                seq = entry.pop("seq", None)
+                if seq is not None:
+                    last_seq = max(last_seq, seq)
+                    if seq <= after_seq:
+                        continue
+                if "room_id" not in entry:
+                    # Header written by the last compaction
+                    continue
+                room_id = str(entry.pop("room_id"))
+                bookings.setdefault(room_id, []).append(entry)
+                count += 1
+    except FileNotFoundError:
+        pass
+    return count, last_seq
+
+def _load_bookings(filepath: Path) -> Tuple[Dict[str, List[Dict[str, Union[str, datetime]]]], int]:
+    existing_data, snapshot_seq = _load_snapshot(filepath)
+    _, last_seq = _replay_journal(filepath, existing_data, after_seq=snapshot_seq)
+    return existing_data, last_seq
 
+# @tool("load_bookings", description="Load existing bookings from external file.")
+def load_bookings(
+        filepath: Path = BOOKINGS_FILE
+    ) -> Dict[str, List[Dict[str, Union[str, datetime]]]]:
+    """Load existing bookings: the snapshot followed by the journal replay."""
+    return _load_bookings(filepath)[0]
+
+def compact_bookings(filepath: Path = BOOKINGS_FILE):
+    """
+    Fold the journal into the snapshot, under the bookings file lock. The new
+    snapshot records the sequence number of the last entry it folds, is written
+    to a temporary file and atomically swapped in before the journal is cleared.
+    A crash before the journal is cleared leaves entries the replay skips.
+    """
+    filepath = Path(filepath)
+    with journal_lock(filepath):
+        bookings, last_seq = _load_bookings(filepath)
+        tmp_path = filepath.with_name(f"{filepath.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({**bookings, SNAPSHOT_SEQ_KEY: last_seq}, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+        _fsync_directory(filepath)
+        # The header carries the sequence on, so the next entries are numbered after it
+        with open(journal_path(filepath), "w") as f:
+            f.write(json.dumps({"seq": last_seq}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        _JOURNAL_SIZES[filepath] = 0
+
+def _repair_journal_tail(f) -> int:
+    """
+    Truncate a torn last line (crash during an append) off the journal opened
+    in `f`, so the next entry starts on its own line, and return the sequence
+    number of the last entry (0 if it has none).
+    """
+    end = pos = f.seek(0, os.SEEK_END)
+    tail = b""
+    # The last complete line lies between the last two newlines
+    while pos > 0 and tail.count(b"\n") < 2:
+        step = min(4096, pos)
+        pos -= step
+        f.seek(pos)
+        tail = f.read(step) + tail
+    complete = tail.rfind(b"\n") + 1
+    if pos + complete < end:
+        print(f"Warning: Dropping torn journal entry in {f.name}.")
+        f.truncate(pos + complete)
+    lines = tail[:complete].splitlines()
+    try:
+        return int(json.loads(lines[-1]).get("seq", 0)) if lines else 0
+    except (ValueError, AttributeError, TypeError):
+        return 0
 
 # @tool("save_bookings", description="Save bookings to the database.")
 def save_bookings_tool(
         room_id: Union[int, str], 
         booking: Dict, file_path: Path = BOOKINGS_FILE
     ):
-    """Save bookings to the database."""
-    bookings = load_bookings(file_path=file_path)
-    room_id = str(room_id)
-    room_bookings = bookings.get(room_id, [])
-    print(f"Current bookings for room {room_id}: {room_bookings}")
-    room_bookings.append(booking)
-    bookings[room_id] = room_bookings
+    """
+    Save a booking by appending it as one JSON line to the journal.
+    The journal is compacted into the snapshot every `JOURNAL_COMPACT_THRESHOLD` entries.
+    """
+    append_bookings([(room_id, booking)], file_path=file_path)
+
+def append_bookings(
+        bookings: List[Tuple[Union[int, str], Dict]], file_path: Path = BOOKINGS_FILE
+    ):
+    """
+    Append (room id, booking) pairs to the journal in a single write and fsync,
+    under the bookings file lock, then compact the journal if it reached
+    `JOURNAL_COMPACT_THRESHOLD` entries. Entries are numbered after the last one.
+    """
+    file_path = Path(file_path)
+    if not bookings:
+        return
+    with journal_lock(file_path):
+        if file_path not in _JOURNAL_SIZES:
+            _JOURNAL_SIZES[file_path] = _replay_journal(file_path, {})[0]
+
+        with open(journal_path(file_path), "ab+") as f:
+            seq = _repair_journal_tail(f)
+            lines = "".join(
+                json.dumps({"room_id": str(room_id), "seq": seq + i, **booking}) + "\n"
+                for i, (room_id, booking) in enumerate(bookings, start=1)
+            )
+            f.write(lines.encode())
+            f.flush()
+            os.fsync(f.fileno())
+        _JOURNAL_SIZES[file_path] += len(bookings)
+
+        if _JOURNAL_SIZES[file_path] >= JOURNAL_COMPACT_THRESHOLD:
+            compact_bookings(file_path)
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """
+    Inode, size and modification time of a file, or None if it is missing.
+    The size catches appends within one tick of a coarse mtime, the inode a
+    file replaced by compaction.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
 
-    with open(file_path, "w") as f:
-        json.dump(bookings, f, indent=4)
+def _files_signature(filepath: Path) -> tuple:
+    """Signatures of the snapshot and its journal."""
+    return (_file_signature(Path(filepath)), _file_signature(journal_path(filepath)))
+
+def get_booking_index(filepath: Path = BOOKINGS_FILE) -> BookingIndex:
+    """
+    Return the booking index of the given file, building it on first use or
+    whenever the snapshot or journal was modified since the index was built.
+    """
+    filepath = Path(filepath)
+    signature = _files_signature(filepath)
+    cached = _BOOKING_INDEXES.get(filepath)
+    if cached and cached[0] == signature:
+        return cached[1]
+    index = BookingIndex.from_bookings(load_bookings(filepath))
+    _BOOKING_INDEXES[filepath] = (signature, index)
+    return index
+
+def _refresh_index_signature(filepath: Path):
+    """Mark the cached index as up to date after an in-place update."""
+    filepath = Path(filepath)
+    cached = _BOOKING_INDEXES.get(filepath)
+    if cached:
+        _BOOKING_INDEXES[filepath] = (_files_signature(filepath), cached[1])
 
 # @tool("check_time_conflict", description="Check if a room has a time conflict for the requested time.")
 def check_time_conflict_tool(
-        existing_bookings: List[Dict[str, Union[str, datetime]]],
+        existing_bookings: Union["BookingStore", BookingIndex, Dict[str, List[Dict[str, Union[str, datetime]]]]],
         room_id: int, start_time:  Union[str, datetime],
         end_time: Optional[Union[str, datetime]] = None, duration_hours: Optional[float]=None,
     ) -> bool:
     """ 
     Check if a room has a time conflict for the requested time. 
     """
-    start_time = datetime.fromisoformat(start_time)
+    if isinstance(existing_bookings, (BookingStore, BookingIndex)):
+        return existing_bookings.has_conflict(
+            room_id, start_time, end_time=end_time, duration_hours=duration_hours
+        )
+
+    if isinstance(start_time, str):
+        start_time = datetime.fromisoformat(start_time)
+    if isinstance(end_time, str):
+        end_time = datetime.fromisoformat(end_time)
     end_time = end_time or (start_time + timedelta(hours=duration_hours))
 
-    room_bookings = existing_bookings.get(room_id, [])
+    room_bookings = existing_bookings.get(str(room_id), [])
     if not room_bookings:
         return False
     for booking in room_bookings:
@@ -63,33 +298,425 @@ def check_time_conflict_tool(
     return False
 
 def get_room_reserved_time_slots(
-        room_id: Union[int, str], 
-        existing_bookings: Dict[str, List[Dict[str, Union[str, datetime]]]]) -> List[Dict]:
-    
-    free_time_slots = []
-    room_id = str(room_id)
-    
-    return free_time_slots
+        room_id: Union[int, str, List[Union[int, str]]],
+        existing_bookings: Union[BookingIndex, Dict[str, List[Dict[str, Union[str, datetime]]]]],
+        window_start: Union[str, datetime], window_end: Union[str, datetime],
+        duration_hours: float = 0,
+    ) -> Union[List[Dict], Dict[str, List[Dict]]]:
+    """
+    Get the free time slots of a room (or a list of rooms) inside the given window
+    that are at least `duration_hours` long. Reserved time, including the `DELAY`
+    buffer after each booking, is merged and subtracted from the window.
+    Returns a list of slots for a single room, or a dict of lists keyed by room id.
+    """
+    if not isinstance(existing_bookings, BookingIndex):
+        existing_bookings = BookingIndex.from_bookings(existing_bookings)
+
+    room_ids = [str(r) for r in room_id] if isinstance(room_id, (list, tuple)) else [str(room_id)]
+    room_intervals = {}
+    for rid in room_ids:
+        intervals = existing_bookings.room_intervals(rid)
+        room_intervals[rid] = ([s for s, _ in intervals], [e for _, e in intervals])
+
+    free_slots = find_free_slots(
+        room_intervals, to_epoch(window_start), to_epoch(window_end),
+        min_duration=int(duration_hours * 3600),
+    )
+    free_time_slots = {
+        rid: [
+            {"start_time": from_epoch(start).isoformat(), "end_time": from_epoch(end).isoformat()}
+            for start, end in slots
+        ]
+        for rid, slots in free_slots.items()
+    }
+    if isinstance(room_id, (list, tuple)):
+        return free_time_slots
+    return free_time_slots[str(room_id)]
+
+
+##==============================================================================
+# BOOKING STORES
+##==============================================================================
+class BookingStore(ABC):
+    """
+    Storage backend for bookings. `book` must check for conflicts and insert
+    the booking atomically, so that concurrent workers can't double-book a room.
+    """
+
+    @abstractmethod
+    def load_all(self) -> Dict[str, List[Dict[str, str]]]:
+        """Return all bookings grouped by room id, as stored in `bookings.json`."""
+
+    @abstractmethod
+    def has_conflict(
+            self, room_id: Union[int, str], start_time: Union[str, datetime],
+            end_time: Optional[Union[str, datetime]] = None,
+            duration_hours: Optional[float] = None,
+        ) -> bool:
+        """Check if the room is already booked at any point of the requested time."""
+
+    @abstractmethod
+    def book(
+            self, room_id: Union[int, str], start_time: str,
+            end_time: str, user_name: str
+        ) -> Optional[Dict]:
+        """Book the room if it is free and return the booking, otherwise None."""
+
+    def book_many(
+            self, bookings: List[Tuple[Union[int, str], str, str, str]]
+        ) -> List[Optional[Dict]]:
+        """
+        Book each (room id, start time, end time, user name) that is free, also
+        of the earlier items of the list, and return the bookings (None for the
+        conflicting items). Backends override this to commit in one write.
+        """
+        return [self.book(room_id, start_time, end_time, user_name)
+                for room_id, start_time, end_time, user_name in bookings]
+
+    def free_rooms(
+            self, room_ids: List[Union[int, str]], start_time: Union[str, datetime],
+            end_time: Optional[Union[str, datetime]] = None,
+            duration_hours: Optional[float] = None,
+        ) -> List[bool]:
+        """Tell for each room whether it is free for the requested time."""
+        return [
+            not self.has_conflict(room_id, start_time, end_time=end_time, duration_hours=duration_hours)
+            for room_id in room_ids
+        ]
+
+
+class JsonBookingStore(BookingStore):
+    """
+    Bookings kept in the JSON snapshot and journal files. Check-and-insert runs
+    under `journal_lock`: a thread lock and an exclusive `flock` on a sidecar lock file.
+    """
+
+    def __init__(self, filepath: Path = BOOKINGS_FILE):
+        self.filepath = Path(filepath)
+
+    def load_all(self) -> Dict[str, List[Dict[str, str]]]:
+        return get_booking_index(self.filepath).to_bookings()
+
+    def has_conflict(self, room_id, start_time, end_time=None, duration_hours=None) -> bool:
+        return get_booking_index(self.filepath).has_conflict(
+            room_id, start_time, end_time=end_time, duration_hours=duration_hours
+        )
+
+    def free_rooms(self, room_ids, start_time, end_time=None, duration_hours=None) -> List[bool]:
+        return get_booking_index(self.filepath).free_rooms(
+            room_ids, start_time, end_time=end_time, duration_hours=duration_hours
+        )
+
+    def book(self, room_id, start_time, end_time, user_name) -> Optional[Dict]:
+        with journal_lock(self.filepath):
+            # The index is reloaded here if another process wrote in the meantime
+            booking_index = get_booking_index(self.filepath)
+            if booking_index.has_conflict(room_id, start_time, end_time=end_time):
+                return None
+            booking = {
+                "start_time": start_time,
+                "end_time": end_time,
+                "booked_by": user_name,
+            }
+            save_bookings_tool(room_id, booking, file_path=self.filepath)
+            booking_index.add(room_id, start_time, end_time, user_name)
+            _refresh_index_signature(self.filepath)
+            return booking
+
+    def book_many(self, bookings) -> List[Optional[Dict]]:
+        with journal_lock(self.filepath):
+            booking_index = get_booking_index(self.filepath)
+            results, accepted = [], []
+            try:
+                for room_id, start_time, end_time, user_name in bookings:
+                    if booking_index.has_conflict(room_id, start_time, end_time=end_time):
+                        results.append(None)
+                        continue
+                    booking = {
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "booked_by": user_name,
+                    }
+                    # Indexed right away so later items of the batch see it
+                    booking_index.add(room_id, start_time, end_time, user_name)
+                    accepted.append((room_id, booking))
+                    results.append(booking)
+                append_bookings(accepted, file_path=self.filepath)
+            except Exception:
+                # The cached index may hold bookings that were not written
+                _BOOKING_INDEXES.pop(self.filepath, None)
+                raise
+            _refresh_index_signature(self.filepath)
+            return results
+
+
+class ShardedJsonBookingStore(BookingStore):
+    """
+    Bookings split into one JSON store per room, or per room-id hash bucket when
+    `num_buckets` is set. Each shard has its own snapshot, journal and locks, so
+    bookings of unrelated rooms are written in parallel.
+    """
+
+    JOURNAL_SUFFIX = ".journal.jsonl"
+
+    def __init__(self, directory: Path = BOOKING_SHARDS_DIR, num_buckets: int = 0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.num_buckets = num_buckets
+        self._shards: Dict[str, JsonBookingStore] = {}
+        self._shards_lock = threading.Lock()
+
+    def shard_name(self, room_id: Union[int, str]) -> str:
+        """Name of the shard holding the room's bookings."""
+        room_id = str(room_id)
+        if self.num_buckets:
+            # crc32 is stable across processes, unlike the built-in hash()
+            return f"bucket_{zlib.crc32(room_id.encode()) % self.num_buckets}"
+        return f"room_{room_id}"
+
+    def _shard(self, room_id: Union[int, str]) -> JsonBookingStore:
+        name = self.shard_name(room_id)
+        shard = self._shards.get(name)
+        if shard is None:
+            with self._shards_lock:
+                shard = self._shards.setdefault(
+                    name, JsonBookingStore(self.directory / f"{name}.json")
+                )
+        return shard
+
+    def _shard_names(self) -> List[str]:
+        """Names of all shards on disk, including those only having a journal."""
+        names = set()
+        for path in self.directory.iterdir():
+            if path.name.endswith(self.JOURNAL_SUFFIX):
+                names.add(path.name[:-len(self.JOURNAL_SUFFIX)])
+            elif path.suffix == ".json":
+                names.add(path.stem)
+        return sorted(names)
+
+    def load_all(self) -> Dict[str, List[Dict[str, str]]]:
+        bookings: Dict[str, List[Dict[str, str]]] = {}
+        for name in self._shard_names():
+            shard_index = get_booking_index(self.directory / f"{name}.json")
+            for room_id, room_bookings in shard_index.to_bookings().items():
+                bookings.setdefault(room_id, []).extend(room_bookings)
+        return bookings
+
+    def has_conflict(self, room_id, start_time, end_time=None, duration_hours=None) -> bool:
+        return self._shard(room_id).has_conflict(
+            room_id, start_time, end_time=end_time, duration_hours=duration_hours
+        )
+
+    def book(self, room_id, start_time, end_time, user_name) -> Optional[Dict]:
+        return self._shard(room_id).book(room_id, start_time, end_time, user_name)
+
+    def book_many(self, bookings) -> List[Optional[Dict]]:
+        """One write per shard touched by the batch."""
+        by_shard: Dict[str, List[int]] = {}
+        for position, item in enumerate(bookings):
+            by_shard.setdefault(self.shard_name(item[0]), []).append(position)
+        results: List[Optional[Dict]] = [None] * len(bookings)
+        for positions in by_shard.values():
+            shard = self._shard(bookings[positions[0]][0])
+            for position, result in zip(positions, shard.book_many([bookings[p] for p in positions])):
+                results[position] = result
+        return results
+
+
+class SqliteBookingStore(BookingStore):
+    """
+    Bookings kept in a SQLite database in WAL mode. Times are stored as epoch
+    seconds next to their ISO strings and indexed on (room_id, start_ts, end_ts).
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            room_id TEXT NOT NULL,
+            start_ts INTEGER NOT NULL,
+            end_ts INTEGER NOT NULL,
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            booked_by TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_room_time ON bookings (room_id, start_ts, end_ts)",
+    ]
+    CONFLICT_QUERY = (
+        "SELECT 1 FROM bookings WHERE room_id = ? AND start_ts < ? AND end_ts > ? LIMIT 1"
+    )
+
+    def __init__(self, db_path: Path = BOOKINGS_DB_FILE, delay: timedelta = DELAY):
+        self.db_path = Path(db_path)
+        self.delay_seconds = int(delay.total_seconds())
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, in autocommit mode so transactions are explicit."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _conflict_args(self, room_id, start_time, end_time=None, duration_hours=None) -> tuple:
+        start = to_epoch(start_time)
+        end = to_epoch(end_time) if end_time is not None else start + int(duration_hours * 3600)
+        # A stored booking blocks the room until `DELAY` after its end
+        return (str(room_id), end, start - self.delay_seconds)
+
+    def load_all(self) -> Dict[str, List[Dict[str, str]]]:
+        bookings: Dict[str, List[Dict[str, str]]] = {}
+        rows = self._connection().execute(
+            "SELECT room_id, start_time, end_time, booked_by FROM bookings ORDER BY id"
+        )
+        for room_id, start_time, end_time, booked_by in rows:
+            bookings.setdefault(room_id, []).append({
+                "start_time": start_time,
+                "end_time": end_time,
+                "booked_by": booked_by,
+            })
+        return bookings
+
+    def has_conflict(self, room_id, start_time, end_time=None, duration_hours=None) -> bool:
+        args = self._conflict_args(room_id, start_time, end_time, duration_hours)
+        return self._connection().execute(self.CONFLICT_QUERY, args).fetchone() is not None
+
+    def book(self, room_id, start_time, end_time, user_name) -> Optional[Dict]:
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front, so the check and the insert
+        # can't interleave with another writer
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            args = self._conflict_args(room_id, start_time, end_time)
+            if conn.execute(self.CONFLICT_QUERY, args).fetchone() is not None:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute(
+                "INSERT INTO bookings (room_id, start_ts, end_ts, start_time, end_time, booked_by) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(room_id), to_epoch(start_time), to_epoch(end_time),
+                 start_time, end_time, user_name),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {
+            "start_time": start_time,
+            "end_time": end_time,
+            "booked_by": user_name,
+        }
+
+    def book_many(self, bookings) -> List[Optional[Dict]]:
+        """Check and insert the whole batch in one transaction."""
+        conn = self._connection()
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for room_id, start_time, end_time, user_name in bookings:
+                # Rows inserted earlier in the transaction are seen by the check
+                args = self._conflict_args(room_id, start_time, end_time)
+                if conn.execute(self.CONFLICT_QUERY, args).fetchone() is not None:
+                    results.append(None)
+                    continue
+                conn.execute(
+                    "INSERT INTO bookings (room_id, start_ts, end_ts, start_time, end_time, booked_by) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (str(room_id), to_epoch(start_time), to_epoch(end_time),
+                     start_time, end_time, user_name),
+                )
+                results.append({
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "booked_by": user_name,
+                })
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def import_bookings(self, bookings: Dict[str, List[Dict[str, str]]]):
+        """Copy bookings from the JSON layout into the database in one transaction."""
+        rows = [
+            (str(room_id), to_epoch(b["start_time"]), to_epoch(b["end_time"]),
+             b["start_time"], b["end_time"], b.get("booked_by"))
+            for room_id, room_bookings in bookings.items() for b in room_bookings
+        ]
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO bookings (room_id, start_ts, end_ts, start_time, end_time, booked_by) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+BOOKING_BACKENDS = {
+    "json": lambda: JsonBookingStore(BOOKINGS_FILE),
+    "sharded": lambda: ShardedJsonBookingStore(BOOKING_SHARDS_DIR, BOOKING_SHARD_BUCKETS),
+    "sqlite": lambda: SqliteBookingStore(BOOKINGS_DB_FILE),
+}
+_BOOKING_STORE: Optional[BookingStore] = None
+
+
+class InstrumentedBookingStore(BookingStore):
+    """Proxy recording the duration of each operation of the wrapped store."""
+
+    def __init__(self, store: BookingStore, backend: str):
+        self.store = store
+        self.backend = backend
+
+    def __getattr__(self, name):
+        # Backend-specific helpers (e.g. `import_bookings`) are passed through
+        return getattr(self.store, name)
+
+    def load_all(self) -> Dict[str, List[Dict[str, str]]]:
+        with STORE_OP_SECONDS.time(backend=self.backend, operation="load_all"):
+            return self.store.load_all()
+
+    def has_conflict(self, room_id, start_time, end_time=None, duration_hours=None) -> bool:
+        with STORE_OP_SECONDS.time(backend=self.backend, operation="has_conflict"):
+            return self.store.has_conflict(room_id, start_time, end_time=end_time, duration_hours=duration_hours)
+
+    def free_rooms(self, room_ids, start_time, end_time=None, duration_hours=None) -> List[bool]:
+        with STORE_OP_SECONDS.time(backend=self.backend, operation="free_rooms"):
+            return self.store.free_rooms(room_ids, start_time, end_time=end_time, duration_hours=duration_hours)
+
+    def book(self, room_id, start_time, end_time, user_name) -> Optional[Dict]:
+        with STORE_OP_SECONDS.time(backend=self.backend, operation="book"):
+            return self.store.book(room_id, start_time, end_time, user_name)
+
+    def book_many(self, bookings) -> List[Optional[Dict]]:
+        with STORE_OP_SECONDS.time(backend=self.backend, operation="book_many"):
+            return self.store.book_many(bookings)
+
+
+def get_booking_store() -> BookingStore:
+    """Return the process-wide booking store selected by `BOOKING_BACKEND`."""
+    global _BOOKING_STORE
+    if _BOOKING_STORE is None:
+        try:
+            store = BOOKING_BACKENDS[BOOKING_BACKEND.lower()]()
+        except KeyError:
+            raise ValueError(f"Unsupported booking backend: {BOOKING_BACKEND}")
+        _BOOKING_STORE = InstrumentedBookingStore(store, BOOKING_BACKEND.lower())
+    return _BOOKING_STORE
 
 
 @tool("book_room", description="Book a room for the specified time and user.")
 def book_room_tool(
         room_id: int, start_time: str, 
         end_time: str, user_name: str
-    ) -> Optional[Booking]:
+    ) -> Optional[Dict]:
     """Book a room for the specified time and user."""
-    existing_bookings = load_bookings()
-    if check_time_conflict_tool(
-        room_id, start_time, duration_hours=int((datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)).total_seconds() / 3600)
-    ):
-        return None
-    booking = Booking(
-        room_id=room_id,
-        start_time=start_time,
-        end_time=end_time,
-        booked_by=user_name,
-    )
-    existing_bookings.append(booking)
-    save_bookings_tool(existing_bookings)
-    return booking
-
+    return get_booking_store().book(room_id, start_time, end_time, user_name)
@@ -0,0 +1,114 @@
+# src/mock_apis/bulk_booking.py
+"""Booking of many meetings at once, without a conversational turn per meeting."""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import BULK_BOOKING_MAX_HOURS
+from mock_apis.booking_index import BookingIndex
+from mock_apis.booking_services import BookingStore, get_booking_store
+from mock_apis.room_catalog import RoomCatalog
+from mock_apis.room_services import get_room_catalog
+
+
+def _parse_time(value: str) -> datetime:
+    """Naive local datetime from an ISO string; times with an offset are converted."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def _parse_times(item: Dict, now: datetime) -> Tuple[datetime, datetime]:
+    """
+    Start and end of an item, from `end_time` or `duration_hours`. The meeting
+    must start in the future and last at most `BULK_BOOKING_MAX_HOURS`.
+    """
+    if not item.get("start_time"):
+        raise ValueError("start_time is required")
+    start = _parse_time(item["start_time"])
+    if item.get("end_time"):
+        end = _parse_time(item["end_time"])
+    elif item.get("duration_hours") is not None:
+        hours = float(item["duration_hours"])
+        if not 0 < hours <= BULK_BOOKING_MAX_HOURS:
+            raise ValueError(f"duration_hours must be between 0 and {BULK_BOOKING_MAX_HOURS:g}")
+        end = start + timedelta(hours=hours)
+    else:
+        raise ValueError("end_time or duration_hours is required")
+    if start <= now:
+        raise ValueError("the meeting must start in the future")
+    if end <= start:
+        raise ValueError("the meeting must end after it starts")
+    if end - start > timedelta(hours=BULK_BOOKING_MAX_HOURS):
+        raise ValueError(f"meetings can last at most {BULK_BOOKING_MAX_HOURS:g} hours")
+    return start, end
+
+def _candidate_rooms(catalog: RoomCatalog, item: Dict) -> List[Dict]:
+    """The requested room, or the rooms meeting the capacity and equipment constraints."""
+    if item.get("room_id") is not None:
+        rooms = [room for room in catalog.rooms if str(room["id"]) == str(item["room_id"])]
+        if not rooms:
+            raise ValueError(f"unknown room {item['room_id']}")
+        return rooms
+    equipments = catalog.vocabulary.resolve_all(item.get("equipments") or [])
+    return catalog.find(capacity=item.get("capacity"), equipments=equipments)
+
+def bulk_book(items: List[Dict], store: Optional[BookingStore] = None,
+              catalog: Optional[RoomCatalog] = None) -> List[Dict]:
+    """
+    Book a list of meetings and return one result per item, in order.
+
+    Each item has `start_time` (ISO, local time unless it has an offset),
+    `end_time` or `duration_hours`, `user_name`, and either a `room_id` or
+    `capacity`/`equipments` constraints. Meetings must start in the future and
+    last at most `BULK_BOOKING_MAX_HOURS`. The first matching room that is
+    free, both in the store and among the earlier items of the list, is taken.
+    All accepted items are then committed through the store's `book_many` in
+    one write, which checks them again under its lock.
+
+    Result statuses: "booked", "invalid" (malformed item), "no_room" (no room
+    meets the constraints), "unavailable" (all matching rooms are busy) and
+    "conflict" (the room was booked by someone else in the meantime).
+    """
+    store = store or get_booking_store()
+    catalog = catalog or get_room_catalog()
+    # Bookings accepted from this list, checked like those of the store
+    pending = BookingIndex()
+    results: List[Dict] = []
+    now = datetime.now()
+    planned: List[Tuple[int, Tuple]] = []
+
+    for position, item in enumerate(items):
+        result = {"index": position}
+        results.append(result)
+        try:
+            if not item.get("user_name"):
+                raise ValueError("user_name is required")
+            start, end = _parse_times(item, now)
+            rooms = _candidate_rooms(catalog, item)
+        except (TypeError, ValueError, OverflowError, AttributeError) as e:
+            result.update({"status": "invalid", "error": str(e)})
+            continue
+        if not rooms:
+            result.update({"status": "no_room", "error": "No room meets the capacity and equipment constraints"})
+            continue
+
+        free = store.free_rooms([room["id"] for room in rooms], start, end_time=end)
+        room = next(
+            (room for room, is_free in zip(rooms, free)
+             if is_free and not pending.has_conflict(room["id"], start, end_time=end)),
+            None,
+        )
+        if room is None:
+            result.update({"status": "unavailable", "error": "All matching rooms are booked at that time"})
+            continue
+        pending.add(room["id"], start, end, item["user_name"])
+        result.update({"room_id": room["id"], "room_name": room["name"]})
+        planned.append((position, (room["id"], start.isoformat(), end.isoformat(), item["user_name"])))
+
+    bookings = store.book_many([booking for _, booking in planned])
+    for (position, _), booking in zip(planned, bookings):
+        if booking is None:
+            results[position].update({"status": "conflict", "error": "The room was booked in the meantime"})
+        else:
+            results[position].update({"status": "booked", "booking": booking})
+    return results
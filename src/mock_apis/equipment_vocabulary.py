@@ -0,0 +1,95 @@
+# src/mock_apis/equipment_vocabulary.py
+"""Resolution of free-form equipment names (e.g. from the LLM) to the catalog's names."""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from config import logger, EQUIPMENT_MATCH_THRESHOLD, EQUIPMENT_MATCH_MARGIN
+
+NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_equipment(name: str) -> str:
+    """Case-folded words, punctuation dropped and plural 's' stripped: "Flip-Charts" -> "flip chart"."""
+    words = NON_ALNUM.sub(" ", name.casefold().replace("&", " and ")).split()
+    return " ".join(word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+                    for word in words)
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EquipmentVocabulary:
+    """
+    Equipment names of the catalog indexed once for resolution:
+      - `keys` maps the normalized form of every name and synonym to its
+        catalog name, so exact, case and plural variants resolve in O(1).
+      - `trigram_index` maps a trigram to the names and synonyms containing it;
+        anything else is scored against the O(k) forms sharing its trigrams and
+        resolved to the most similar catalog name, only if its Dice coefficient
+        is at least `threshold` and leads the next catalog name by `margin`
+        (so "smart tv" is not taken for "Smart Board").
+    """
+
+    def __init__(self, names: Iterable[str], synonyms: Optional[Dict[str, List[str]]] = None,
+                 threshold: float = EQUIPMENT_MATCH_THRESHOLD, margin: float = EQUIPMENT_MATCH_MARGIN):
+        self.names: List[str] = sorted(names)
+        self.threshold = threshold
+        self.margin = margin
+        self.keys: Dict[str, str] = {}
+        for name in self.names:
+            self.keys[normalize_equipment(name)] = name
+        known = set(self.names)
+        for name, aliases in (synonyms or {}).items():
+            if name not in known:
+                # Synonyms of equipment no room has
+                continue
+            for alias in aliases:
+                self.keys.setdefault(normalize_equipment(alias), name)
+
+        self.forms: List[str] = list(self.keys)
+        self.form_trigrams: List[int] = []
+        self.trigram_index: Dict[str, List[int]] = {}
+        for form_id, form in enumerate(self.forms):
+            grams = trigrams(form)
+            self.form_trigrams.append(len(grams))
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(form_id)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Catalog name for `name`, or None when nothing is similar enough."""
+        key = normalize_equipment(name)
+        if key in self.keys:
+            return self.keys[key]
+        grams = trigrams(key)
+        shared = Counter(form_id for gram in grams for form_id in self.trigram_index.get(gram, ()))
+        # Best score per catalog name, over the name and its synonyms
+        scores: Dict[str, float] = {}
+        for form_id, count in shared.items():
+            canonical = self.keys[self.forms[form_id]]
+            score = 2 * count / (len(grams) + self.form_trigrams[form_id])
+            scores[canonical] = max(scores.get(canonical, 0.0), score)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if not ranked or ranked[0][1] < self.threshold:
+            return None
+        best, best_score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if best_score - runner_up < self.margin:
+            logger.info(f"Equipment '{name}' is ambiguous: '{best}' ({best_score:.2f}) "
+                        f"vs '{ranked[1][0]}' ({runner_up:.2f})")
+            return None
+        logger.info(f"Equipment '{name}' resolved to '{best}' by similarity ({best_score:.2f})")
+        return best
+
+    def resolve_all(self, names: List[str]) -> List[str]:
+        """
+        Catalog names for the requested equipments, in order and without
+        duplicates. "nothing" and unresolved names are kept as given.
+        """
+        resolved = []
+        for name in names or []:
+            canonical = name if name == "nothing" else (self.resolve(name) or name)
+            if canonical not in resolved:
+                resolved.append(canonical)
+        return resolved
@@ -0,0 +1,69 @@
+# src/mock_apis/free_slots.py
+"""Vectorized free-slot computation over the booking intervals of many rooms."""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def find_free_slots(
+        room_intervals: Dict[str, Tuple[Sequence[int], Sequence[int]]],
+        window_start: int, window_end: int, min_duration: int = 0,
+    ) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Return the free gaps of at least `min_duration` seconds inside
+    [window_start, window_end) for every room, in one sweep over all rooms.
+
+    `room_intervals` maps a room id to its (starts, ends) epoch arrays, with the
+    `DELAY` buffer already included in the ends (see `BookingIndex.room_intervals`).
+    Intervals may overlap and don't need to be sorted.
+    """
+    room_ids = list(room_intervals)
+    free_slots: Dict[str, List[Tuple[int, int]]] = {room_id: [] for room_id in room_ids}
+    span = window_end - window_start
+    if span <= 0 or not room_ids:
+        return free_slots
+
+    counts = np.array([len(room_intervals[r][0]) for r in room_ids], dtype=np.int64)
+    codes = np.repeat(np.arange(len(room_ids), dtype=np.int64), counts)
+    starts = np.concatenate([np.asarray(room_intervals[r][0], dtype=np.int64) for r in room_ids])
+    ends = np.concatenate([np.asarray(room_intervals[r][1], dtype=np.int64) for r in room_ids])
+
+    # Keep intervals touching the window and clip them to it
+    keep = (ends > window_start) & (starts < window_end)
+    codes = codes[keep]
+    starts = np.maximum(starts[keep], window_start)
+    ends = np.minimum(ends[keep], window_end)
+
+    busy_rooms = np.zeros(len(room_ids), dtype=bool)
+    if len(starts):
+        order = np.lexsort((starts, codes))
+        codes, starts, ends = codes[order], starts[order], ends[order]
+
+        # Running max of ends per room: offsetting each room by more than the
+        # window span keeps the cumulative max from leaking across rooms
+        offsets = codes * (span + 1)
+        covered = np.maximum.accumulate(ends - window_start + offsets) - offsets + window_start
+
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = codes[1:] != codes[:-1]
+        gap_starts = np.empty_like(covered)
+        gap_starts[0] = window_start
+        gap_starts[1:] = covered[:-1]
+        gap_starts[first] = window_start
+
+        is_gap = starts - gap_starts >= max(min_duration, 1)
+        for code, gap_start, gap_end in zip(codes[is_gap], gap_starts[is_gap], starts[is_gap]):
+            free_slots[room_ids[code]].append((int(gap_start), int(gap_end)))
+
+        # Gap between the last booking of each room and the window end
+        last = np.ones(len(codes), dtype=bool)
+        last[:-1] = codes[:-1] != codes[1:]
+        for code, tail_start in zip(codes[last], covered[last]):
+            if window_end - tail_start >= max(min_duration, 1):
+                free_slots[room_ids[code]].append((int(tail_start), window_end))
+        busy_rooms[codes] = True
+
+    if span >= min_duration:
+        for code in np.flatnonzero(~busy_rooms):
+            free_slots[room_ids[code]].append((window_start, window_end))
+    return free_slots
@@ -0,0 +1,114 @@
+# src/mock_apis/occupancy_grid.py
+"""Per-day slot occupancy grid for batched room availability checks."""
+import threading
+from math import ceil
+from collections import OrderedDict
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+DAY_SECONDS = 24 * 3600
+
+
+class OccupancyGrid:
+    """
+    One boolean (rooms x slots) array per day at `slot_minutes` resolution.
+
+    A booking marks every slot it touches, so the grid never misses a conflict:
+    a room reported free is free, a room reported busy may only be busy for part
+    of a boundary slot. Days are materialized on first query through `day_loader`,
+    which returns the (start, end) epoch intervals of every room touching that day;
+    at most `max_days` are kept, the least recently queried are dropped first.
+
+    Queries mutate the grid too (day eviction, row growth), so `mark` and `busy`
+    hold `lock`; the owner takes it as well while changing what `day_loader` reads.
+    """
+
+    def __init__(
+            self, day_loader: Callable[[int, int], Dict[str, List[Tuple[int, int]]]],
+            slot_minutes: int = 15, max_days: int = 90,
+        ):
+        self.day_loader = day_loader
+        self.slot_seconds = slot_minutes * 60
+        self.slots_per_day = ceil(DAY_SECONDS / self.slot_seconds)
+        self.rows: Dict[str, int] = {}
+        self.max_days = max_days
+        self.days: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._allocated_rows = 16
+        self.lock = threading.RLock()
+
+    def _row(self, room_id: str) -> int:
+        """Row of the room, growing every materialized day when a new room shows up."""
+        row = self.rows.get(room_id)
+        if row is None:
+            row = self.rows[room_id] = len(self.rows)
+            if row >= self._allocated_rows:
+                self._allocated_rows *= 2
+                for day, grid in self.days.items():
+                    grown = np.zeros((self._allocated_rows, self.slots_per_day), dtype=bool)
+                    grown[:grid.shape[0]] = grid
+                    self.days[day] = grown
+        return row
+
+    def _slot_range(self, day: int, start: int, end: int) -> Tuple[int, int]:
+        """Slots of `day` touched by [start, end)."""
+        day_start = day * DAY_SECONDS
+        first = (max(start, day_start) - day_start) // self.slot_seconds
+        last = ceil((min(end, day_start + DAY_SECONDS) - day_start) / self.slot_seconds)
+        return first, last
+
+    @staticmethod
+    def _days(start: int, end: int) -> range:
+        return range(start // DAY_SECONDS, (end - 1) // DAY_SECONDS + 1)
+
+    def _day_grid(self, day: int) -> np.ndarray:
+        grid = self.days.get(day)
+        if grid is not None:
+            self.days.move_to_end(day)
+        else:
+            while len(self.days) >= max(1, self.max_days):
+                self.days.popitem(last=False)
+            day_start = day * DAY_SECONDS
+            intervals = self.day_loader(day_start, day_start + DAY_SECONDS)
+            for room_id in intervals:
+                self._row(room_id)
+            grid = np.zeros((self._allocated_rows, self.slots_per_day), dtype=bool)
+            self.days[day] = grid
+            for room_id, room_intervals in intervals.items():
+                row = self.rows[room_id]
+                for start, end in room_intervals:
+                    first, last = self._slot_range(day, start, end)
+                    grid[row, first:last] = True
+        return grid
+
+    def mark(self, room_id: Union[int, str], start: int, end: int):
+        """Mark a new booking on the days that are already materialized."""
+        with self.lock:
+            row = self._row(str(room_id))
+            for day in self._days(start, end):
+                grid = self.days.get(day)
+                if grid is not None:
+                    first, last = self._slot_range(day, start, end)
+                    grid[row, first:last] = True
+
+    def busy(self, room_ids: Sequence[Union[int, str]], start: int, end: int) -> np.ndarray:
+        """
+        Boolean array telling, for each room, whether any slot of [start, end) is occupied.
+        """
+        busy = np.zeros(len(room_ids), dtype=bool)
+        if end <= start:
+            return busy
+        with self.lock:
+            days = self._days(start, end)
+            # Materialize every day first: a day bringing in a new room replaces the
+            # arrays of the others with grown copies
+            for day in days:
+                self._day_grid(day)
+            rows = np.array([self.rows.get(str(room_id), -1) for room_id in room_ids], dtype=np.int64)
+            known = rows >= 0
+            for day in days:
+                # Reloaded (with every known row) if evicted by a query spanning over `max_days`
+                grid = self._day_grid(day)
+                first, last = self._slot_range(day, start, end)
+                busy[known] |= grid[rows[known], first:last].any(axis=1)
+            return busy
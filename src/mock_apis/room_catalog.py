@@ -0,0 +1,165 @@
+# src/mock_apis/room_catalog.py
+"""Indexed in-memory room catalog for capacity and equipment queries."""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from mock_apis.equipment_vocabulary import EquipmentVocabulary
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+# Rooms scored by the first chunk of the `find_similar` scan; each next chunk doubles
+FIRST_SCAN_CHUNK = 4096
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits of each uint64 in `words`."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # SWAR popcount for NumPy < 2.0
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _H01) >> np.uint64(56)
+
+
+class RoomCatalog:
+    """
+    Rooms indexed once for fast lookups.
+
+    Rooms are referred to internally by their position in `rooms`:
+      - `equipment_index` maps an equipment name to the set of room positions having it.
+      - `capacities` / `by_capacity` hold the room capacities sorted ascending and
+        the matching room positions, so "capacity >= N" is a single bisect.
+      - `equipment_bits` gives each equipment name a bit position, and
+        `equipment_masks` holds each room's equipment as a packed bitmask, one
+        row per 64-bit word with rooms in catalog order; with `capacity_array`,
+        similarity scoring is vectorized over any run of rooms.
+      - `vocabulary` resolves free-form equipment names (and `synonyms`) to the
+        names above.
+    """
+
+    def __init__(self, rooms: List[Dict], synonyms: Optional[Dict[str, List[str]]] = None):
+        self.rooms: List[Dict] = list(rooms)
+        self.equipment_index: Dict[str, Set[int]] = {}
+        for pos, room in enumerate(self.rooms):
+            for eq in room.get("equipments", []):
+                self.equipment_index.setdefault(eq, set()).add(pos)
+
+        self.by_capacity: List[int] = sorted(
+            range(len(self.rooms)), key=lambda pos: self.rooms[pos]["capacity"]
+        )
+        self.capacities: List[int] = [self.rooms[pos]["capacity"] for pos in self.by_capacity]
+
+        self.equipment_bits: Dict[str, int] = {eq: bit for bit, eq in enumerate(sorted(self.equipment_index))}
+        num_words = max(1, (len(self.equipment_bits) + 63) // 64)
+        self.capacity_array = np.array([room["capacity"] for room in self.rooms], dtype=np.int64)
+        self.equipment_masks = np.zeros((num_words, len(self.rooms)), dtype=np.uint64)
+        for eq, positions in self.equipment_index.items():
+            word, bit = divmod(self.equipment_bits[eq], 64)
+            self.equipment_masks[word, list(positions)] |= np.uint64(1 << bit)
+        self.vocabulary = EquipmentVocabulary(self.equipment_index, synonyms)
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def _positions_with_capacity(self, capacity: Optional[int]) -> List[int]:
+        """Room positions whose capacity is at least `capacity`."""
+        if not capacity:
+            return self.by_capacity
+        return self.by_capacity[bisect_left(self.capacities, capacity):]
+
+    def _positions_with_equipments(self, equipments: List[str]) -> Optional[Set[int]]:
+        """
+        Room positions having all the equipments, or None when nothing is required.
+        """
+        wanted = {eq for eq in equipments or [] if eq != "nothing"}
+        if not wanted:
+            return None
+        # Intersect the smallest posting sets first
+        postings = sorted((self.equipment_index.get(eq, set()) for eq in wanted), key=len)
+        positions = set(postings[0])
+        for posting in postings[1:]:
+            positions &= posting
+            if not positions:
+                break
+        return positions
+
+    def _to_rooms(self, positions) -> List[Dict]:
+        """Return rooms in catalog order."""
+        return [self.rooms[pos] for pos in sorted(positions)]
+
+    def find(self, capacity: Optional[int] = None, equipments: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Find rooms with capacity >= `capacity` that have all the `equipments`.
+        """
+        by_capacity = self._positions_with_capacity(capacity)
+        by_equipment = self._positions_with_equipments(equipments)
+        if by_equipment is None:
+            return self._to_rooms(by_capacity)
+        if len(by_equipment) < len(by_capacity):
+            min_capacity = capacity or 0
+            return self._to_rooms(
+                pos for pos in by_equipment if self.rooms[pos]["capacity"] >= min_capacity
+            )
+        return self._to_rooms(by_equipment.intersection(by_capacity))
+
+    def equipment_mask(self, equipments: List[str]) -> np.ndarray:
+        """Packed bitmask of the known equipments in the list."""
+        mask = np.zeros(self.equipment_masks.shape[0], dtype=np.uint64)
+        for eq in set(equipments or []):
+            bit = self.equipment_bits.get(eq)
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1 << (bit % 64))
+        return mask
+
+    def find_similar(self, capacity: int, equipments: List[str], top_n: int = 3) -> List[Dict]:
+        """
+        Rank rooms with enough capacity by the number of requested equipments they have.
+        Rooms sharing no equipment with the request are left out; ties keep catalog order.
+
+        Rooms are scored in catalog order, by chunks doubling in size, and the scan
+        stops once the `top_n` best have every requested equipment: no later room
+        can rank above them.
+        """
+        query = self.equipment_mask(equipments)
+        words = np.flatnonzero(query)
+        if not words.size or top_n <= 0:
+            return []
+        full_overlap = int(popcount(query).sum())
+        num_rooms = len(self.rooms)
+        best_positions = best_overlaps = np.empty(0, dtype=np.int64)
+        start, chunk = 0, FIRST_SCAN_CHUNK
+        while start < num_rooms and not (best_overlaps.size == top_n and best_overlaps[-1] == full_overlap):
+            end = min(start + chunk, num_rooms)
+            # Only the words the query has bits in can contribute to the overlap
+            shared = [self.equipment_masks[word, start:end] & query[word] for word in words]
+            if best_overlaps.size == top_n and best_overlaps[-1] == full_overlap - 1:
+                # Only rooms with every requested equipment can still rank higher
+                candidates = shared[0] == query[words[0]]
+                for word, words_shared in zip(words[1:], shared[1:]):
+                    candidates &= words_shared == query[word]
+            else:
+                candidates = shared[0] != 0
+                for words_shared in shared[1:]:
+                    candidates |= words_shared != 0
+            if capacity:
+                candidates &= self.capacity_array[start:end] >= capacity
+            hits = np.flatnonzero(candidates)
+            if hits.size:
+                overlaps = sum(popcount(words_shared[hits]).astype(np.int64) for words_shared in shared)
+                positions = np.concatenate([best_positions, start + hits])
+                overlaps = np.concatenate([best_overlaps, overlaps])
+                # Higher overlap first, then lower catalog position
+                keys = overlaps * (num_rooms + 1) - positions
+                if keys.size > top_n:
+                    top = np.argpartition(-keys, top_n - 1)[:top_n]
+                else:
+                    top = np.arange(keys.size)
+                top = top[np.argsort(-keys[top])]
+                best_positions, best_overlaps = positions[top], overlaps[top]
+            start, chunk = end, chunk * 2
+        return [self.rooms[pos] for pos in best_positions]
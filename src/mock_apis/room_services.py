@@ -1,14 +1,25 @@
 # src/mock_apis/room_services.py
 import json
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
-from config import ROOMS_FILE
+from typing import List, Dict, Union
+from langchain_core.tools import tool
+from config import ROOMS_FILE, EQUIPMENT_SYNONYMS_FILE
 from helper import *
-# from langchain_core.tools import tool
+from mock_apis.room_catalog import RoomCatalog
+
+# Cached catalog per rooms file, rebuilt only when the file changes on disk
+_ROOM_CATALOGS: Dict[Path, tuple] = {}
+# Catalogs of the last room lists passed as lists, by list identity
+_LIST_CATALOGS: "OrderedDict[int, tuple]" = OrderedDict()
+_LIST_CATALOGS_SIZE = 8
 
 def check_room_availability_equipment(room: Dict, equipments: List[str]) -> bool:
     """
-    Check if the room has all the specified equipment.
+    Check if the room has all the specified equipment. The names are compared
+    as given: resolve them once beforehand with `vocabulary.resolve_all` of the
+    room catalog (e.g. "whiteboard" -> "Whiteboard Walls").
     """
     for eq in equipments:
         if eq == "nothing": 
@@ -32,42 +43,67 @@ def load_rooms(filepath: Path = ROOMS_FILE) -> List[Dict]:
     return existing_data
 
 
+@lru_cache(maxsize=4)
+def load_equipment_synonyms(filepath: Path = EQUIPMENT_SYNONYMS_FILE) -> Dict[str, List[str]]:
+    """Synonyms of the catalog's equipment names, by catalog name."""
+    try:
+        with open(filepath, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def get_room_catalog(filepath: Path = ROOMS_FILE) -> RoomCatalog:
+    """
+    Return the indexed room catalog, building it on first use or whenever
+    the rooms file was modified since the catalog was built.
+    """
+    filepath = Path(filepath)
+    mtime = filepath.stat().st_mtime_ns
+    cached = _ROOM_CATALOGS.get(filepath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    catalog = RoomCatalog(load_rooms(filepath) or [], synonyms=load_equipment_synonyms())
+    _ROOM_CATALOGS[filepath] = (mtime, catalog)
+    return catalog
+
+
+def catalog_for(rooms: List[Dict]) -> RoomCatalog:
+    """
+    Catalog of a room list, built once per list. The list is kept referenced so
+    its id isn't reused; a list that grew or shrank since is indexed again, but
+    rooms edited in place are not seen: pass a `RoomCatalog` for changing data.
+    """
+    cached = _LIST_CATALOGS.get(id(rooms))
+    if cached and cached[0] is rooms and cached[1] == len(rooms):
+        _LIST_CATALOGS.move_to_end(id(rooms))
+        return cached[2]
+    catalog = RoomCatalog(rooms)
+    _LIST_CATALOGS[id(rooms)] = (rooms, len(rooms), catalog)
+    while len(_LIST_CATALOGS) > _LIST_CATALOGS_SIZE:
+        _LIST_CATALOGS.popitem(last=False)
+    return catalog
+
+
 # @tool("find_matching_rooms", description="Find rooms that match the required capacity and equipment.")
-def find_matching_rooms_tool(existing_rooms: List[Dict], capacity: int, equipments: List[str]) -> List[Dict]:
+def find_matching_rooms_tool(
+        existing_rooms: Union[RoomCatalog, List[Dict]], capacity: int, equipments: List[str]
+    ) -> List[Dict]:
     """
-    Find rooms that match the required capacity and equipment.
+    Find rooms that match the required capacity and equipment. A plain room list
+    is indexed once and reused across calls (see `catalog_for`).
     """
-    matching_rooms = []
-    for room in existing_rooms:
-        if room['capacity'] >= capacity and check_room_availability_equipment(room, equipments):
-            matching_rooms.append(room)
-    return matching_rooms
+    if not isinstance(existing_rooms, RoomCatalog):
+        existing_rooms = catalog_for(existing_rooms)
+    return existing_rooms.find(capacity=capacity, equipments=equipments)
 
 @tool("find_similar_rooms", description="Find rooms with similar equipment and capacity.")
 def find_similar_rooms_tool(capacity: int, equipments: list, top_n: int = 3) -> List[Dict]:
-    rooms = load_rooms()
-    scored_rooms = []
-    for room in rooms:
-        if room.capacity >= capacity:
-            overlap = len(set(room.equipments) & set(equipments))
-            scored_rooms.append((overlap, room))
-    scored_rooms.sort(reverse=True, key=lambda x: x[0])
-    return [room for overlap, room in scored_rooms if overlap > 0][:top_n]
+    return get_room_catalog().find_similar(capacity, equipments, top_n=top_n)
 
 @tool("find_rooms_by_equipments", description="Find rooms that have all the specified equipment.")
-def find_rooms_by_equipments_tool(equipments: List[str]) -> List[Room]:
-    rooms = load_rooms()
-    matching_rooms = []
-    for room in rooms:
-        if all(feature in room.equipments for feature in equipments):
-            matching_rooms.append(room)
-    return matching_rooms
+def find_rooms_by_equipments_tool(equipments: List[str]) -> List[Dict]:
+    return get_room_catalog().find(equipments=equipments)
 
 @tool("find_rooms_by_capacity", description="Find rooms that have a capacity greater than or equal to the specified value.")
-def find_rooms_by_capacity_tool(capacity: int) -> List[Room]:
-    rooms = load_rooms()
-    matching_rooms = []
-    for room in rooms:
-        if room.capacity >= capacity:
-            matching_rooms.append(room)
-    return matching_rooms
+def find_rooms_by_capacity_tool(capacity: int) -> List[Dict]:
+    return get_room_catalog().find(capacity=capacity)
@@ -0,0 +1,206 @@
+# src/session_store.py
+"""
+Server-side Flask sessions. Only a signed session id travels in the cookie;
+the session data (agent state, message objects) stays on the server.
+"""
+import time
+import uuid
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from config import SESSION_BACKEND, SESSION_CACHE_SIZE, SESSIONS_DB_FILE
+
+
+class SessionBackend(ABC):
+    """Storage of session data keyed by session id, with per-entry expiry."""
+
+    @abstractmethod
+    def get(self, sid: str) -> Optional[Dict]:
+        """Return the session data, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, sid: str, data: Dict, expires_at: float):
+        """Store the session data until `expires_at` (epoch seconds)."""
+
+    @abstractmethod
+    def delete(self, sid: str):
+        """Drop the session."""
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    In-process LRU of session dicts. Values are kept as live objects, so message
+    objects are not serialized between turns. Sessions are lost on restart and
+    not shared between worker processes.
+    """
+
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._data[sid]
+                return None
+            self._data.move_to_end(sid)
+            return entry[1]
+
+    def set(self, sid: str, data: Dict, expires_at: float):
+        with self._lock:
+            self._data[sid] = (expires_at, data)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, sid: str):
+        with self._lock:
+            self._data.pop(sid, None)
+
+
+class SqliteSessionBackend(SessionBackend):
+    """
+    Sessions pickled into a SQLite table, shared by all worker processes and
+    surviving restarts. Expired rows are purged every `purge_every` writes.
+    The data never leaves the server, so pickle is safe here.
+    """
+
+    def __init__(self, db_path: Path = SESSIONS_DB_FILE, purge_every: int = 100):
+        self.db_path = Path(db_path)
+        self.purge_every = purge_every
+        self._writes = 0
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "sid TEXT PRIMARY KEY, expires_at REAL NOT NULL, data BLOB NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE sid = ? AND expires_at >= ?", (sid, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, sid: str, data: Dict, expires_at: float):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (sid, expires_at, data) VALUES (?, ?, ?)",
+            (sid, expires_at, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+
+    def delete(self, sid: str):
+        self._connection().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+
+    def __init__(self, initial: Optional[Dict] = None, sid: Optional[str] = None, new: bool = False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid or str(uuid.uuid4())
+        self.new = new
+        self.modified = False
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Flask session interface storing sessions in a `SessionBackend`. Entries expire
+    after `PERMANENT_SESSION_LIFETIME`; the cookie is only sent for new sessions.
+    """
+
+    salt = "server-side-session"
+
+    def __init__(self, backend: SessionBackend):
+        self.backend = backend
+
+    def _signer(self, app) -> Signer:
+        return Signer(app.secret_key, salt=self.salt)
+
+    def sign_sid(self, app, sid: str) -> str:
+        return self._signer(app).sign(sid).decode()
+
+    def unsign_sid(self, app, cookie_value: Optional[str]) -> Optional[str]:
+        if not cookie_value:
+            return None
+        try:
+            return self._signer(app).unsign(cookie_value).decode()
+        except BadSignature:
+            return None
+
+    def expires_at(self, app) -> float:
+        return time.time() + app.permanent_session_lifetime.total_seconds()
+
+    def open_session(self, app, request) -> ServerSideSession:
+        sid = self.unsign_sid(app, request.cookies.get(self.get_cookie_name(app)))
+        if sid:
+            data = self.backend.get(sid)
+            if data is not None:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(new=True)
+
+    def persist(self, app, session: ServerSideSession):
+        """Store the session now, e.g. from a streamed response after headers were sent."""
+        self.backend.set(session.sid, dict(session), self.expires_at(app))
+
+    def save_session(self, app, session: ServerSideSession, response):
+        cookie_name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if session.modified:
+                self.backend.delete(session.sid)
+                response.delete_cookie(cookie_name, domain=domain, path=path)
+            return
+
+        if session.modified or session.new:
+            self.persist(app, session)
+        if session.new:
+            response.set_cookie(
+                cookie_name,
+                self.sign_sid(app, session.sid),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+SESSION_BACKENDS = {
+    "memory": lambda: MemorySessionBackend(SESSION_CACHE_SIZE),
+    "sqlite": lambda: SqliteSessionBackend(SESSIONS_DB_FILE),
+}
+
+def create_session_interface(backend: str = SESSION_BACKEND) -> ServerSideSessionInterface:
+    """Build the session interface for the backend selected by `SESSION_BACKEND`."""
+    try:
+        return ServerSideSessionInterface(SESSION_BACKENDS[backend.lower()]())
+    except KeyError:
+        raise ValueError(f"Unsupported session backend: {backend}")
@@ -0,0 +1,87 @@
+# src/startup_profile.py
+"""
+Startup-time profile of the Flask app: import time per module.
+
+Runs `import app` in a fresh interpreter with `-X importtime` and aggregates the
+report, so cold-start regressions can be tracked across commits.
+
+    python src/startup_profile.py --top 25
+    python src/startup_profile.py --module app --json logs/startup_profile.json
+"""
+import re
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+SRC_DIR = Path(__file__).resolve().parent
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(module: str = "app") -> Dict:
+    """
+    Import `module` in a subprocess and return the per-module import times in ms.
+    """
+    started = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    modules: List[Dict] = []
+    for line in started.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    if started.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{started.stderr[-2000:]}")
+
+    top_level = [m for m in modules if m["depth"] == 0]
+    return {
+        "module": module,
+        "total_ms": sum(m["cumulative_ms"] for m in top_level),
+        "modules": modules,
+    }
+
+
+def package_breakdown(modules: List[Dict]) -> Dict[str, float]:
+    """Self time summed by top-level package (e.g. all of `langchain_groq.*`)."""
+    totals: Dict[str, float] = {}
+    for m in modules:
+        package = m["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + m["self_ms"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=20, help="Number of rows to print")
+    parser.add_argument("--json", type=Path, help="Write the full profile to this file")
+    args = parser.parse_args()
+
+    profile = profile_imports(args.module)
+    profile["packages"] = package_breakdown(profile["modules"])
+
+    print(f"Total import time of '{args.module}': {profile['total_ms']:.1f} ms\n")
+    print(f"{'package':<40} {'self ms':>10}")
+    for package, self_ms in list(profile["packages"].items())[:args.top]:
+        print(f"{package:<40} {self_ms:>10.1f}")
+    print(f"\n{'module':<60} {'cumulative ms':>14}")
+    slowest = sorted(profile["modules"], key=lambda m: m["cumulative_ms"], reverse=True)
+    for m in slowest[:args.top]:
+        print(f"{m['module']:<60} {m['cumulative_ms']:>14.1f}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(profile, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+// Stream the agent reply token by token from /booking/stream (Server-Sent Events).
+// Falls back to the regular form POST when the browser can't read streamed bodies or the
+// stream request never reaches the server.
+const AGENT_ICON = "https://cdn-icons-png.flaticon.com/512/16869/16869849.png";
+const USER_ICON = "https://cdn0.iconfinder.com/data/icons/user-interface-706/24/User_Icon-512.png";
+
+function appendMessage(type, text) {
+    const chatWindow = document.getElementById("chatWindow");
+    const message = document.createElement("div");
+    message.className = `message ${type === "human" ? "user-message" : "agent-message"}`;
+
+    const icon = document.createElement("div");
+    icon.className = "message-icon";
+    const img = document.createElement("img");
+    img.src = type === "human" ? USER_ICON : AGENT_ICON;
+    img.alt = "icon";
+    icon.appendChild(img);
+
+    const content = document.createElement("div");
+    content.className = "message-content";
+    content.textContent = text;
+
+    message.appendChild(icon);
+    message.appendChild(content);
+    chatWindow.appendChild(message);
+    chatWindow.scrollTop = chatWindow.scrollHeight;
+    return content;
+}
+
+function parseEvent(rawEvent) {
+    let event = "message";
+    let data = "";
+    for (const line of rawEvent.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+    }
+    return { event, data: data ? JSON.parse(data) : {} };
+}
+
+// The server got the turn (non-2xx reply or a failure mid-stream): resending it would replay it
+class StreamError extends Error {}
+
+const OUT_OF_SERVICE = "Sorry! we are out of service now.";
+
+async function streamBooking(form, body, reply) {
+    let streamed = "";
+
+    // A rejected fetch means nothing reached the server: the caller may fall back
+    const response = await fetch(form.dataset.streamUrl, {
+        method: "POST",
+        body: body,
+        headers: { Accept: "text/event-stream" },
+    });
+    if (!response.ok) throw new StreamError(`Streaming request failed with HTTP ${response.status}`);
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+                const { event, data } = parseEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                if (event === "token") {
+                    streamed += data.content;
+                    reply.textContent = streamed;
+                } else if (event === "message" || event === "error") {
+                    reply.textContent = data.content || streamed;
+                }
+                reply.closest(".chat-body").scrollTop = reply.closest(".chat-body").scrollHeight;
+            }
+        }
+    } catch (error) {
+        throw new StreamError(error.message);
+    }
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    const form = document.getElementById("chatForm");
+    const input = document.getElementById("userInput");
+    if (!form || !form.dataset.streamUrl || !window.ReadableStream || !window.fetch) return;
+
+    form.addEventListener("submit", async (event) => {
+        event.preventDefault();
+        const userInput = input.value.trim();
+        if (!userInput) return;
+        const body = new FormData(form);
+        input.value = "";
+        input.disabled = true;
+        appendMessage("human", userInput);
+        const reply = appendMessage("agent", "…");
+        try {
+            await streamBooking(form, body, reply);
+        } catch (error) {
+            if (error instanceof StreamError) {
+                reply.textContent = OUT_OF_SERVICE;
+            } else {
+                // Nothing was received: fall back to the regular request. Disabled
+                // fields are left out of a submission, so re-enable the input first
+                input.disabled = false;
+                input.value = userInput;
+                form.submit();
+            }
+        } finally {
+            input.disabled = false;
+            input.focus();
+        }
+    });
+});
@@ -0,0 +1,18 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The modules import each other from src/, as when the app runs from there
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# config.py reads these at import time
+for name in ("PROJECT_NAME", "FLASK_SECRET_KEY", "GROQ_API_KEY", "GROQ_MODEL_NAME",
+             "OLLAMA_MODEL_NAME", "OLLAMA_API_KEY", "GEMINI_MODEL_NAME", "GEMINI_API_KEY",
+             "LANGCHAIN_ENDPOINT", "LANGCHAIN_API_KEY"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("TEMPERATURE", "0")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+# Never write to the bookings of data/
+os.environ["BOOKINGS_FILE"] = os.path.join(tempfile.mkdtemp(prefix="booking-tests-"), "bookings.json")
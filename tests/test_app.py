@@ -0,0 +1,233 @@
+import json
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from mock_apis import booking_services
+from mock_apis.booking_services import InstrumentedBookingStore, JsonBookingStore
+
+
+class FakeBookingModel(BaseChatModel):
+    """
+    Local stand-in for the LLM: answers the extraction prompt with `parsed` as
+    JSON and any other prompt (the room listing) with `listing`, word by word
+    when streamed.
+    """
+
+    parsed: dict = {}
+    listing: str = "Here are the rooms I found for you"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-booking"
+
+    def _reply(self, messages) -> str:
+        if "available rooms" in messages[-1].content:
+            return self.listing
+        return json.dumps(self.parsed)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for word in self._reply(messages).split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+MODEL = FakeBookingModel()
+# Not well-formed enough for the fast path, so the (fake) LLM is called
+USER_INPUT = "Could you sort out a room for our planning meeting, same as usual?"
+
+
+def parsed_request(days: int = 3, hour: int = 10, capacity: int = 4, equipments=("Projector",)) -> dict:
+    start = (datetime.now() + timedelta(days=days)).replace(hour=hour, minute=0, second=0, microsecond=0)
+    return {
+        "start_date": start.strftime("%Y-%m-%d"),
+        "start_time": start.strftime("%I:%M:%S %p"),
+        "duration_hours": 1,
+        "capacity": capacity,
+        "equipments": list(equipments),
+        "user_name": "Heba",
+        "clarification_needed": False,
+        "clarification_question": None,
+    }
+
+
+@pytest.fixture(scope="module")
+def app_module():
+    import helper
+    from config import LLM_ROUTER_PROVIDERS
+    for name in LLM_ROUTER_PROVIDERS:
+        helper.register_llm_provider(name, lambda temp: MODEL)
+    import app
+    return app
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh JSON booking store behind `get_booking_store`."""
+    store = InstrumentedBookingStore(JsonBookingStore(tmp_path / "bookings.json"), "json")
+    monkeypatch.setattr(booking_services, "_BOOKING_STORE", store)
+    return store
+
+
+@pytest.fixture
+def client(app_module, store):
+    from booking_agent.llm_cache import PARSE_CACHE
+    PARSE_CACHE.clear()
+    MODEL.parsed = parsed_request()
+    return app_module.app.test_client()
+
+
+def test_workflow_compiles():
+    from booking_agent.workflow import create_workflow
+    assert create_workflow() is not None
+    assert create_workflow(use_async=True) is not None
+
+
+def test_pages(client):
+    assert client.get("/").status_code == 200
+    assert client.get("/booking").status_code == 200
+    assert client.get("/reset").status_code == 302
+
+
+def test_booking_books_the_first_free_matching_room(client, store):
+    response = client.post("/booking", data={"user_input": USER_INPUT})
+    assert response.status_code == 200
+    assert "successfully booked" in response.get_data(as_text=True)
+    bookings = store.load_all()
+    assert sum(len(room_bookings) for room_bookings in bookings.values()) == 1
+
+
+def test_booking_asks_for_missing_fields(client, store):
+    MODEL.parsed = {**parsed_request(), "start_date": None, "clarification_needed": True,
+                    "clarification_question": "Which day should I book?"}
+    response = client.post("/booking", data={"user_input": USER_INPUT})
+    assert response.status_code == 200
+    assert "Which day should I book?" in response.get_data(as_text=True)
+    assert store.load_all() == {}
+
+
+def test_booking_reports_when_no_room_is_close(client, store):
+    MODEL.parsed = parsed_request(capacity=1000)
+    response = client.post("/booking", data={"user_input": USER_INPUT})
+    assert response.status_code == 200
+    assert "couldn&#39;t find any rooms" in response.get_data(as_text=True)
+    assert store.load_all() == {}
+
+
+def test_booking_books_an_alternative_room(client, store):
+    # No room has both, the most similar one is booked instead
+    MODEL.parsed = parsed_request(equipments=("Smart Board", "Karaoke Machine"))
+    response = client.post("/booking", data={"user_input": USER_INPUT})
+    assert response.status_code == 200
+    assert "successfully booked" in response.get_data(as_text=True)
+    assert sum(len(room_bookings) for room_bookings in store.load_all().values()) == 1
+
+
+def test_booking_stream(client):
+    response = client.post("/booking/stream", data={"user_input": USER_INPUT})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert "event: message" in response.get_data(as_text=True)
+
+
+def test_booking_bulk(client):
+    start = (datetime.now() + timedelta(days=5)).replace(hour=9, minute=0, second=0, microsecond=0)
+    response = client.post("/booking/bulk", json={"items": [
+        {"room_id": 1, "start_time": start.isoformat(), "duration_hours": 1, "user_name": "Heba"},
+    ]})
+    assert response.status_code == 200
+    assert response.get_json()["booked"] == 1
+
+
+def test_metrics(client):
+    client.post("/booking", data={"user_input": USER_INPUT})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert 'booking_agent_node_duration_seconds_count{node="confirm_booking_node"}' in body
+    assert 'booking_agent_request_duration_seconds_count{endpoint="booking"}' in body
+
+
+def test_booking_async(app_module, store):
+    pytest.importorskip("asgiref")
+    httpx = pytest.importorskip("httpx")
+    import asgi
+    MODEL.parsed = parsed_request(days=4)
+
+    async def post():
+        transport = httpx.ASGITransport(app=asgi.application)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.post("/booking/async", json={"user_input": USER_INPUT})
+
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    assert "successfully booked" in response.json()["response"]
+
+
+def sse_events(body: str) -> list:
+    """(event, data) pairs of a Server-Sent Events body."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_booking_stream_sends_tokens_then_the_reply_and_saves_the_session(client, app_module, monkeypatch):
+    from booking_agent import nodes
+    monkeypatch.setattr(nodes, "ROOM_LISTING_MODE", "llm")
+    backend = app_module.app.session_interface.backend
+    saves = []
+    store_session = backend.set
+
+    def record_save(sid, data, expires_at):
+        saves.append([message.content for message in data["agent_state"]["messages"]])
+        store_session(sid, data, expires_at)
+    monkeypatch.setattr(backend, "set", record_save)
+
+    response = client.post("/booking/stream", data={"user_input": USER_INPUT})
+    events = sse_events(response.get_data(as_text=True))
+
+    # Tokens of the room listing first, then the final reply once the workflow ended
+    names = [name for name, _ in events]
+    assert names == ["token"] * (len(names) - 1) + ["message"]
+    assert "".join(data["content"] for name, data in events[:-1]).strip() == MODEL.listing
+    reply = events[-1][1]["content"]
+    assert "successfully booked" in reply
+    # The session holding the reply is stored once, after the stream
+    assert sum(reply in messages for messages in saves) == 1
+    assert saves[-1][-1] == reply
+    assert saves[-1][0] == USER_INPUT
+
+
+def test_booking_stream_reports_errors(client, app_module, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("workflow down")
+    monkeypatch.setattr(app_module.workflow, "stream", fail)
+    events = sse_events(client.post("/booking/stream", data={"user_input": USER_INPUT}).get_data(as_text=True))
+    assert [name for name, _ in events] == ["error"]
+
+
+def test_booking_bulk_rejects_malformed_bodies(client):
+    assert client.post("/booking/bulk", data="items").status_code == 400
+    assert client.post("/booking/bulk", json={"items": {"room_id": 1}}).status_code == 400
+    assert client.post("/booking/bulk", json={"items": [1, 2]}).status_code == 400
+
+
+def test_booking_bulk_caps_the_number_of_items(client, app_module, store, monkeypatch):
+    monkeypatch.setattr(app_module, "BULK_BOOKING_MAX_ITEMS", 2)
+    start = (datetime.now() + timedelta(days=5)).replace(hour=9, minute=0, second=0, microsecond=0)
+    items = [{"room_id": 1, "start_time": (start + timedelta(hours=hour)).isoformat(),
+              "duration_hours": 1, "user_name": "Heba"} for hour in range(0, 6, 2)]
+    response = client.post("/booking/bulk", json={"items": items})
+    assert response.status_code == 400
+    assert "At most 2 items" in response.get_json()["error"]
+    assert store.load_all() == {}
+    response = client.post("/booking/bulk", json={"items": items[:2]})
+    assert response.get_json()["booked"] == 2
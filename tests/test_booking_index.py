@@ -0,0 +1,128 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock_apis.booking_index import BookingIndex, RoomIntervals, to_epoch, from_epoch
+from mock_apis.booking_services import check_time_conflict_tool
+
+START = datetime(2030, 3, 4, 8, 0)
+
+
+def random_intervals(rng, count, horizon=10_000, longest=600):
+    intervals = []
+    for _ in range(count):
+        start = rng.randrange(horizon)
+        intervals.append((start, start + rng.randint(1, longest)))
+    return intervals
+
+
+def random_bookings(rng, rooms=5, per_room=40, days=3):
+    bookings = {}
+    for room_id in range(1, rooms + 1):
+        room_bookings = bookings.setdefault(str(room_id), [])
+        for _ in range(rng.randint(0, per_room)):
+            start = START + timedelta(minutes=15 * rng.randrange(days * 96))
+            room_bookings.append({
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(minutes=15 * rng.randint(1, 16))).isoformat(),
+                "booked_by": rng.choice(["Heba", "Omar", None]),
+            })
+    return bookings
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_room_intervals_match_brute_force(seed):
+    rng = random.Random(seed)
+    stored = random_intervals(rng, 200)
+    room = RoomIntervals()
+    for start, end in stored:
+        room.add(start, end)
+    assert room.intervals() == sorted(stored, key=lambda interval: interval[0])
+    for start, end in random_intervals(rng, 500):
+        expected = sorted((s, e) for s, e in stored if s < end and e > start)
+        assert room.overlaps(start, end) == bool(expected)
+        assert sorted(room.overlapping(start, end)) == expected
+
+
+def test_room_intervals_touching_ends_do_not_overlap():
+    room = RoomIntervals()
+    room.add(100, 200)
+    assert not room.overlaps(200, 300)
+    assert not room.overlaps(0, 100)
+    assert room.overlaps(199, 300)
+    assert room.overlapping(150, 160) == [(100, 200)]
+
+
+def test_a_long_early_interval_is_found_past_later_ones():
+    room = RoomIntervals()
+    for start, end in [(0, 1000), (10, 20), (30, 40)]:
+        room.add(start, end)
+    assert room.overlaps(500, 600)
+    assert room.overlapping(500, 600) == [(0, 1000)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_booking_index_matches_the_dict_check(seed):
+    rng = random.Random(seed)
+    bookings = random_bookings(rng)
+    index = BookingIndex.from_bookings(bookings)
+    for _ in range(500):
+        room_id = str(rng.randint(1, 6))
+        start = START + timedelta(minutes=5 * rng.randrange(3 * 24 * 12))
+        hours = rng.choice([0.25, 0.5, 1, 2, 5])
+        # The dict form is the original linear scan, DELAY included
+        expected = check_time_conflict_tool(bookings, room_id, start, duration_hours=hours)
+        assert index.has_conflict(room_id, start, duration_hours=hours) == expected
+        assert check_time_conflict_tool(index, room_id, start.isoformat(), duration_hours=hours) == expected
+
+
+def test_booking_index_add_is_seen_by_later_checks():
+    index = BookingIndex.from_bookings({})
+    start = START.isoformat()
+    end = (START + timedelta(hours=1)).isoformat()
+    assert not index.has_conflict(1, start, end_time=end)
+    index.add(1, start, end, "Heba")
+    assert index.has_conflict("1", start, end_time=end)
+    # Blocked until DELAY after the end
+    assert index.has_conflict(1, START + timedelta(minutes=70), duration_hours=1)
+    assert not index.has_conflict(1, START + timedelta(minutes=90), duration_hours=1)
+    assert not index.has_conflict(2, start, end_time=end)
+
+
+def test_epoch_round_trip():
+    assert from_epoch(to_epoch(START)) == START
+    assert to_epoch(START.isoformat()) == to_epoch(START)
+
+
+def by_start(bookings):
+    return {room_id: sorted(room_bookings, key=lambda b: b["start_time"])
+            for room_id, room_bookings in bookings.items() if room_bookings}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_from_bookings_equals_successive_adds(seed):
+    rng = random.Random(seed)
+    bookings = random_bookings(rng)
+    bulk = BookingIndex.from_bookings(bookings)
+    one_by_one = BookingIndex()
+    for room_id, room_bookings in bookings.items():
+        for booking in room_bookings:
+            one_by_one.add(room_id, booking["start_time"], booking["end_time"], booking["booked_by"])
+    assert set(bulk.rooms) == set(one_by_one.rooms)
+    for room_id, room in bulk.rooms.items():
+        assert room.intervals() == one_by_one.rooms[room_id].intervals()
+        assert list(room.max_ends) == list(one_by_one.rooms[room_id].max_ends)
+    assert bulk.to_bookings() == one_by_one.to_bookings()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_to_bookings_round_trips_and_interns_users(seed):
+    rng = random.Random(seed)
+    bookings = random_bookings(rng)
+    index = BookingIndex.from_bookings(bookings)
+    assert index.to_bookings() == by_start(bookings)
+    # One table entry per distinct name, however many bookings share it
+    names = {b["booked_by"] for room_bookings in bookings.values() for b in room_bookings}
+    assert sorted(index.users, key=str) == sorted(names, key=str)
+    assert BookingIndex.from_bookings(index.to_bookings()).to_bookings() == index.to_bookings()
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime, timedelta
+
+from mock_apis import booking_services
+from mock_apis.booking_services import (
+    SNAPSHOT_SEQ_KEY, append_bookings, compact_bookings, journal_path, load_bookings,
+)
+
+START = datetime(2030, 3, 4, 8, 0)
+
+
+def booking(hour: int, user: str = "Heba") -> dict:
+    start = START + timedelta(hours=hour)
+    return {"start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=1)).isoformat(),
+            "booked_by": user}
+
+
+def journal_lines(filepath) -> list:
+    return [json.loads(line) for line in journal_path(filepath).read_text().splitlines()]
+
+
+def test_appends_are_numbered_and_replayed(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    append_bookings([("1", booking(0)), ("2", booking(1))], file_path=filepath)
+    append_bookings([("1", booking(2))], file_path=filepath)
+    assert [entry["seq"] for entry in journal_lines(filepath)] == [1, 2, 3]
+    assert load_bookings(filepath) == {"1": [booking(0), booking(2)], "2": [booking(1)]}
+
+
+def test_torn_tail_is_skipped_then_repaired(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    append_bookings([("1", booking(0))], file_path=filepath)
+    # Crash in the middle of the next append
+    with open(journal_path(filepath), "a") as f:
+        f.write('{"room_id": "1", "seq": 2, "start_ti')
+    assert load_bookings(filepath) == {"1": [booking(0)]}
+
+    append_bookings([("1", booking(3))], file_path=filepath)
+    assert [entry["seq"] for entry in journal_lines(filepath)] == [1, 2]
+    assert load_bookings(filepath) == {"1": [booking(0), booking(3)]}
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    append_bookings([("1", booking(0)), ("2", booking(1))], file_path=filepath)
+    compact_bookings(filepath)
+    snapshot = json.loads(filepath.read_text())
+    assert snapshot[SNAPSHOT_SEQ_KEY] == 2
+    assert journal_lines(filepath) == [{"seq": 2}]
+
+    # Numbering carries on after the header
+    append_bookings([("1", booking(2))], file_path=filepath)
+    assert journal_lines(filepath)[-1]["seq"] == 3
+    assert load_bookings(filepath) == {"1": [booking(0), booking(2)], "2": [booking(1)]}
+
+
+def test_replay_skips_entries_already_in_the_snapshot(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    append_bookings([("1", booking(0)), ("1", booking(1))], file_path=filepath)
+    journal = journal_path(filepath).read_text()
+    compact_bookings(filepath)
+    # Crash after the snapshot was swapped in, before the journal was cleared
+    journal_path(filepath).write_text(journal)
+    assert load_bookings(filepath) == {"1": [booking(0), booking(1)]}
+
+    append_bookings([("2", booking(2))], file_path=filepath)
+    assert journal_lines(filepath)[-1]["seq"] == 3
+    assert load_bookings(filepath) == {"1": [booking(0), booking(1)], "2": [booking(2)]}
+
+
+def test_compacts_at_the_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(booking_services, "JOURNAL_COMPACT_THRESHOLD", 3)
+    filepath = tmp_path / "bookings.json"
+    for hour in range(4):
+        append_bookings([("1", booking(hour))], file_path=filepath)
+    assert json.loads(filepath.read_text())[SNAPSHOT_SEQ_KEY] == 3
+    assert [entry.get("room_id") for entry in journal_lines(filepath)] == [None, "1"]
+    assert load_bookings(filepath) == {"1": [booking(hour) for hour in range(4)]}
+
+
+def test_entries_without_sequence_numbers_are_replayed(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    filepath.write_text(json.dumps({"1": [booking(0)]}))
+    journal_path(filepath).write_text(json.dumps({"room_id": "1", **booking(1)}) + "\n")
+    assert load_bookings(filepath) == {"1": [booking(0), booking(1)]}
+    append_bookings([("1", booking(2))], file_path=filepath)
+    assert load_bookings(filepath) == {"1": [booking(0), booking(1), booking(2)]}
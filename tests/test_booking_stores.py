@@ -0,0 +1,133 @@
+import os
+import json
+import random
+import threading
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import DELAY
+from mock_apis.booking_services import (
+    JsonBookingStore, ShardedJsonBookingStore, SqliteBookingStore,
+    get_booking_index, journal_path,
+)
+
+START = datetime(2030, 3, 4, 8, 0)
+STORES = {
+    "json": lambda tmp_path: JsonBookingStore(tmp_path / "bookings.json"),
+    "sharded": lambda tmp_path: ShardedJsonBookingStore(tmp_path / "shards"),
+    "bucketed": lambda tmp_path: ShardedJsonBookingStore(tmp_path / "buckets", num_buckets=2),
+    "sqlite": lambda tmp_path: SqliteBookingStore(tmp_path / "bookings.db"),
+}
+
+
+def at(minutes: int) -> str:
+    return (START + timedelta(minutes=minutes)).isoformat()
+
+
+def conflicts(bookings, start: str, end: str) -> bool:
+    """Reference check: a booking blocks its room until `DELAY` after its end."""
+    start, end = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    return any(
+        start < datetime.fromisoformat(b["end_time"]) + DELAY and end > datetime.fromisoformat(b["start_time"])
+        for b in bookings
+    )
+
+
+@pytest.fixture(params=list(STORES))
+def store(request, tmp_path):
+    return STORES[request.param](tmp_path)
+
+
+def test_book_matches_the_reference(store):
+    rng = random.Random(7)
+    expected = {}
+    for _ in range(300):
+        room_id = str(rng.randint(1, 4))
+        start = 15 * rng.randint(0, 200)
+        start_time, end_time = at(start), at(start + 15 * rng.randint(1, 12))
+        booked = store.book(room_id, start_time, end_time, "Heba")
+        room_bookings = expected.setdefault(room_id, [])
+        assert (booked is None) == conflicts(room_bookings, start_time, end_time)
+        if booked:
+            room_bookings.append(booked)
+        probe = 15 * rng.randint(0, 200)
+        assert store.has_conflict(room_id, at(probe), duration_hours=1) == conflicts(
+            room_bookings, at(probe), at(probe + 60))
+    stored = store.load_all()
+    assert {room_id: sorted(b["start_time"] for b in bookings) for room_id, bookings in stored.items()} == \
+        {room_id: sorted(b["start_time"] for b in bookings) for room_id, bookings in expected.items() if bookings}
+
+
+def test_book_many_checks_items_against_each_other(store):
+    store.book("1", at(0), at(60), "Omar")
+    results = store.book_many([
+        ("1", at(30), at(90), "Heba"),    # overlaps the stored booking
+        ("2", at(0), at(60), "Heba"),
+        ("2", at(60), at(120), "Heba"),   # inside the DELAY after the previous item
+        ("2", at(120), at(180), "Heba"),
+        ("3", at(0), at(60), "Heba"),
+    ])
+    assert [result is not None for result in results] == [False, True, False, True, True]
+    assert sorted(len(bookings) for bookings in store.load_all().values()) == [1, 1, 2]
+
+
+def test_concurrent_threads_book_a_slot_once(store):
+    barrier = threading.Barrier(8)
+    results = []
+
+    def book(user):
+        barrier.wait()
+        results.append(store.book("7", at(0), at(60), f"user-{user}"))
+    threads = [threading.Thread(target=book, args=(user,)) for user in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(result is not None for result in results) == 1
+    assert len(store.load_all()["7"]) == 1
+
+
+def _book_in_child(args):
+    kind, tmp_path, user = args
+    store = STORES[kind](tmp_path)
+    return store.book("7", at(0), at(60), f"user-{user}") is not None
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_concurrent_processes_book_a_slot_once(kind, tmp_path):
+    STORES[kind](tmp_path)
+    with multiprocessing.get_context("fork").Pool(6) as pool:
+        booked = pool.map(_book_in_child, [(kind, tmp_path, user) for user in range(12)])
+    assert sum(booked) == 1
+    assert len(STORES[kind](tmp_path).load_all()["7"]) == 1
+
+
+def test_index_sees_an_append_within_the_same_mtime(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    JsonBookingStore(filepath).book("1", at(0), at(60), "Heba")
+    assert not get_booking_index(filepath).has_conflict("2", at(0), at(60))
+
+    # Another process appends within the same tick of a coarse clock
+    journal = journal_path(filepath)
+    stat = journal.stat()
+    with open(journal, "a") as f:
+        f.write(json.dumps({"room_id": "2", "seq": 2, "start_time": at(0), "end_time": at(60),
+                            "booked_by": "Omar"}) + "\n")
+    os.utime(journal, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert get_booking_index(filepath).has_conflict("2", at(0), at(60))
+
+
+def test_index_sees_a_replaced_snapshot_of_the_same_size_and_mtime(tmp_path):
+    filepath = tmp_path / "bookings.json"
+    filepath.write_text(json.dumps({"1": [{"start_time": at(0), "end_time": at(60), "booked_by": "Heba"}]}))
+    assert get_booking_index(filepath).to_bookings()["1"][0]["booked_by"] == "Heba"
+
+    # Same length and mtime, but a new file swapped in (as compaction does)
+    stat = filepath.stat()
+    replacement = tmp_path / "bookings.json.tmp"
+    replacement.write_text(json.dumps({"1": [{"start_time": at(0), "end_time": at(60), "booked_by": "Omar"}]}))
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, filepath)
+    assert get_booking_index(filepath).to_bookings()["1"][0]["booked_by"] == "Omar"
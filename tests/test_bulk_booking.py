@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock_apis.booking_services import JsonBookingStore
+from mock_apis.bulk_booking import bulk_book
+from mock_apis.room_catalog import RoomCatalog
+
+ROOMS = [
+    {"id": 1, "name": "Small", "capacity": 4, "equipments": ["Projector"]},
+    {"id": 2, "name": "Medium", "capacity": 8, "equipments": ["Projector", "Whiteboard"]},
+    {"id": 3, "name": "Large", "capacity": 20, "equipments": ["Whiteboard"]},
+]
+START = (datetime.now() + timedelta(days=7)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+
+def at(hours: float = 0) -> str:
+    return (START + timedelta(hours=hours)).isoformat()
+
+
+def item(**fields) -> dict:
+    return {"user_name": "Heba", "start_time": at(), "duration_hours": 1, **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JsonBookingStore(tmp_path / "bookings.json")
+
+
+@pytest.fixture
+def catalog():
+    return RoomCatalog(ROOMS)
+
+
+def statuses(results):
+    return [result["status"] for result in results]
+
+
+def test_books_the_first_free_matching_room(store, catalog):
+    results = bulk_book([item(capacity=6, equipments=["projector"])], store=store, catalog=catalog)
+    assert statuses(results) == ["booked"]
+    assert results[0]["room_id"] == 2
+    assert store.load_all() == {"2": [results[0]["booking"]]}
+
+
+@pytest.mark.parametrize("fields, error", [
+    ({"user_name": None}, "user_name is required"),
+    ({"start_time": None}, "start_time is required"),
+    ({"start_time": "next tuesday"}, "Invalid isoformat"),
+    ({"duration_hours": None}, "end_time or duration_hours is required"),
+    ({"duration_hours": 0}, "duration_hours must be between"),
+    ({"duration_hours": 1e300}, "duration_hours must be between"),
+    ({"duration_hours": None, "end_time": at(30)}, "at most 24 hours"),
+    ({"duration_hours": None, "end_time": at(-1)}, "must end after it starts"),
+    ({"start_time": (datetime.now() - timedelta(hours=1)).isoformat()}, "start in the future"),
+    ({"start_time": "9999-12-31T23:00:00"}, "out of range"),
+    ({"room_id": 99}, "unknown room 99"),
+])
+def test_rejects_invalid_items(store, catalog, fields, error):
+    results = bulk_book([item(**{"room_id": 1, **fields})], store=store, catalog=catalog)
+    assert statuses(results) == ["invalid"]
+    assert error in results[0]["error"]
+    assert store.load_all() == {}
+
+
+def test_converts_times_with_an_offset_to_local_time(store, catalog):
+    aware = START.astimezone()
+    results = bulk_book([item(room_id=1, start_time=aware.isoformat())], store=store, catalog=catalog)
+    assert statuses(results) == ["booked"]
+    assert results[0]["booking"]["start_time"] == START.isoformat()
+
+
+def test_no_room_meets_the_constraints(store, catalog):
+    results = bulk_book([item(capacity=50), item(equipments=["Karaoke Machine"])], store=store, catalog=catalog)
+    assert statuses(results) == ["no_room", "no_room"]
+
+
+def test_unavailable_when_every_matching_room_is_booked(store, catalog):
+    store.book(3, at(), at(2), "Omar")
+    results = bulk_book([item(capacity=10), item(room_id=3, start_time=at(1))], store=store, catalog=catalog)
+    assert statuses(results) == ["unavailable", "unavailable"]
+
+
+def test_items_of_the_same_list_do_not_overlap(store, catalog):
+    results = bulk_book([
+        item(equipments=["Whiteboard"]),
+        item(equipments=["Whiteboard"], start_time=at(0.5)),
+        item(equipments=["Whiteboard"]),
+        item(room_id=1),
+        item(room_id=1, start_time=at(0.5)),
+    ], store=store, catalog=catalog)
+    assert statuses(results) == ["booked", "booked", "unavailable", "booked", "unavailable"]
+    assert [result.get("room_id") for result in results] == [2, 3, None, 1, None]
+    assert sorted(store.load_all()) == ["1", "2", "3"]
+
+
+def test_conflict_when_the_room_was_booked_in_the_meantime(store, catalog, monkeypatch):
+    # Another worker books room 1 after the availability check, before the write
+    free_rooms = store.free_rooms
+
+    def free_rooms_then_booked_elsewhere(room_ids, start_time, end_time=None, duration_hours=None):
+        free = free_rooms(room_ids, start_time, end_time=end_time, duration_hours=duration_hours)
+        store.book(1, at(), at(1), "Omar")
+        return free
+    monkeypatch.setattr(store, "free_rooms", free_rooms_then_booked_elsewhere)
+
+    results = bulk_book([item(room_id=1)], store=store, catalog=catalog)
+    assert statuses(results) == ["conflict"]
+    assert store.load_all()["1"] == [{"start_time": at(), "end_time": at(1), "booked_by": "Omar"}]
+
+
+def test_one_result_per_item_in_order(store, catalog):
+    results = bulk_book([item(room_id=1), item(user_name=None), item(capacity=50), item(room_id=1)],
+                        store=store, catalog=catalog)
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert statuses(results) == ["booked", "invalid", "no_room", "unavailable"]
@@ -0,0 +1,73 @@
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from booking_agent.context_manager import build_conversation_context, estimate_tokens, update_summary
+from config import CONTEXT_RECENT_MESSAGES, CONTEXT_SUMMARY_LINE_CHARS, CONTEXT_TOKEN_BUDGET
+
+
+def conversation(turns: int, words: int = 20) -> list:
+    messages = []
+    for turn in range(turns):
+        messages.append(HumanMessage(content=f"user turn {turn} " + "word " * words))
+        messages.append(SystemMessage(content=f"agent turn {turn} " + "reply " * words))
+    return messages
+
+
+def state_for(messages, parsed_request=None) -> dict:
+    return {"messages": messages, "conversation_summary": None, "summarized_messages": None,
+            "parsed_request": parsed_request}
+
+
+def test_short_conversations_are_kept_verbatim():
+    state = state_for(conversation(2), {"capacity": 5, "user_name": "Heba", "equipments": []})
+    context = build_conversation_context(state)
+    assert "EARLIER CONVERSATION" not in context
+    assert context.startswith("DETAILS SO FAR: capacity=5, user_name=Heba\n")
+    assert context.endswith(f"AGENT: {state['messages'][-1].content}")
+    assert state["summarized_messages"] == 0
+
+
+def test_older_turns_are_folded_into_the_summary_once():
+    messages = conversation(10)
+    state = state_for(messages)
+    build_conversation_context(state)
+    folded = len(messages) - CONTEXT_RECENT_MESSAGES
+    assert state["summarized_messages"] == folded
+    assert state["conversation_summary"][0].startswith("USER: user turn 0")
+
+    summary_before = list(state["conversation_summary"])
+    messages.append(HumanMessage(content="one more"))
+    build_conversation_context(state)
+    # Only the message that just left the window is added
+    assert state["summarized_messages"] == folded + 1
+    assert state["conversation_summary"][:len(summary_before)] == summary_before
+    assert len(state["conversation_summary"]) == len(summary_before) + 1
+
+
+def test_summary_lines_are_truncated():
+    state = state_for(conversation(8, words=200))
+    update_summary(state)
+    assert all(len(line) <= CONTEXT_SUMMARY_LINE_CHARS for line in state["conversation_summary"])
+    assert state["conversation_summary"][0].endswith("...")
+
+
+def test_summary_rolls_within_half_the_budget():
+    state = state_for(conversation(200))
+    update_summary(state)
+    assert estimate_tokens("\n".join(state["conversation_summary"])) <= CONTEXT_TOKEN_BUDGET // 2
+    # The newest folded turns are the ones kept
+    assert state["conversation_summary"][-1].startswith("AGENT: agent turn 196")
+
+
+def test_context_stays_within_the_budget():
+    for turns, words, budget in [(30, 20, 300), (3, 400, 200), (50, 50, 1500)]:
+        state = state_for(conversation(turns, words), {"start_date": "2030-03-04"})
+        context = build_conversation_context(state, token_budget=budget)
+        latest = f"AGENT: {state['messages'][-1].content}"
+        assert context.endswith(latest)
+        if estimate_tokens(latest) <= budget // 2:
+            assert estimate_tokens(context) <= budget
+
+
+def test_latest_message_is_kept_over_budget():
+    state = state_for([HumanMessage(content="x" * 4000)])
+    assert build_conversation_context(state, token_budget=10) == "USER: " + "x" * 4000
@@ -0,0 +1,69 @@
+import pytest
+
+from mock_apis.equipment_vocabulary import EquipmentVocabulary, normalize_equipment
+from mock_apis.room_services import load_equipment_synonyms, load_rooms
+
+
+@pytest.fixture(scope="module")
+def vocabulary():
+    names = {name for room in load_rooms() for name in room["equipments"]}
+    return EquipmentVocabulary(names, load_equipment_synonyms())
+
+
+@pytest.mark.parametrize("requested, expected", [
+    # Exact, case and plural variants
+    ("Projector", "Projector"),
+    ("PROJECTORS", "Projector"),
+    ("post it", "Post-Its"),
+    ("flipchart", "Flipcharts"),
+    # Synonyms
+    ("beamer", "Projector"),
+    ("whiteboard", "Whiteboard Walls"),
+    ("microphone", "Mics"),
+    ("tv", "TV Monitor"),
+    # Typos, by trigram similarity
+    ("4K projecter", "4K Projector"),
+    ("projecter", "Projector"),
+    ("video conferance", "Video Conferencing"),
+    ("smartbord", "Smart Board"),
+    ("coffe machine", "Coffee Machine"),
+    # Not similar enough to anything, or too close to several names
+    ("smart tv", None),
+    ("wireless mic", None),
+    ("helicopter pad", None),
+    ("", None),
+])
+def test_resolve(vocabulary, requested, expected):
+    assert vocabulary.resolve(requested) == expected
+
+
+def test_normalize_equipment():
+    assert normalize_equipment("Flip-Charts") == "flip chart"
+    # Short words keep their 's'
+    assert normalize_equipment("Post-Its") == "post its"
+    assert normalize_equipment("  Glass  ") == "glass"
+    assert normalize_equipment("Bus") == "bus"
+    assert normalize_equipment("Tables & Chairs") == "table and chair"
+
+
+def test_threshold_and_margin():
+    names = ["Projector", "Protractor"]
+    # "projektor" shares enough trigrams with Projector only
+    assert EquipmentVocabulary(names).resolve("projektor") == "Projector"
+    assert EquipmentVocabulary(names, threshold=0.99).resolve("projektor") is None
+    # "projtor" is about as close to both names: the margin refuses to pick one
+    strict = EquipmentVocabulary(names, threshold=0.0, margin=0.5)
+    assert strict.resolve("projtor") is None
+    assert EquipmentVocabulary(names, threshold=0.0, margin=0.0).resolve("projtor") in names
+
+
+def test_synonyms_of_missing_equipment_are_ignored():
+    vocabulary = EquipmentVocabulary(["Projector"], {"Projector": ["beamer"], "Fireplace": ["hearth"]})
+    assert vocabulary.resolve("beamer") == "Projector"
+    assert vocabulary.resolve("hearth") is None
+
+
+def test_resolve_all_keeps_order_nothing_and_unknown_names(vocabulary):
+    requested = ["beamer", "Projector", "nothing", "helicopter pad", "TV"]
+    assert vocabulary.resolve_all(requested) == ["Projector", "nothing", "helicopter pad", "TV Monitor"]
+    assert vocabulary.resolve_all(None) == []
@@ -0,0 +1,87 @@
+from datetime import date, datetime
+
+import pytest
+
+from booking_agent.fast_parser import (
+    extract_date, extract_duration, extract_equipments, extract_time, fast_parse_request,
+)
+
+NOW = datetime(2030, 3, 4, 9, 0)  # a Monday
+VOCABULARY = ["Projector", "4K Projector", "Whiteboard", "Video Conference"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Book a room tomorrow at 2 PM for 2 hours for 5 people with a projector, my name is Heba Ali",
+     {"start_date": "2030-03-05", "start_time": "02:00:00 PM", "duration_hours": 2.0, "capacity": 5,
+      "equipments": ["Projector"], "user_name": "Heba Ali"}),
+    ("I'm Omar. 2030-03-10 at 9:30am, for 45 minutes, 3 attendees, no equipment needed",
+     {"start_date": "2030-03-10", "start_time": "09:30:00 AM", "duration_hours": 0.75, "capacity": 3,
+      "equipments": ["nothing"], "user_name": "Omar"}),
+    ("On Friday at noon for half an hour, 8 people, 4K projector and whiteboard, booked by Sara",
+     {"start_date": "2030-03-08", "start_time": "12:00:00 PM", "duration_hours": 0.5, "capacity": 8,
+      "equipments": ["4K Projector", "Whiteboard"], "user_name": "Sara"}),
+    ("March 12th 4 p.m. for an hour, 12 guests, video conference, under the name of Lina",
+     {"start_date": "2030-03-12", "start_time": "04:00:00 PM", "duration_hours": 1, "capacity": 12,
+      "equipments": ["Video Conference"], "user_name": "Lina"}),
+    ("1st of April at 10 AM for three hours for 6 pax without any equipment, name: Karim",
+     {"start_date": "2030-04-01", "start_time": "10:00:00 AM", "duration_hours": 3, "capacity": 6,
+      "equipments": ["nothing"], "user_name": "Karim"}),
+])
+def test_accepts_complete_requests(text, expected):
+    request = fast_parse_request(text, NOW, VOCABULARY)
+    assert request is not None
+    assert request.model_dump(include=set(expected)) == expected
+    assert request.clarification_needed is False
+
+
+@pytest.mark.parametrize("text", [
+    # A field is missing
+    "Book a room tomorrow for 2 hours for 5 people with a projector, my name is Heba",
+    "Book a room tomorrow at 2 PM for 5 people with a projector, my name is Heba",
+    "Book a room tomorrow at 2 PM for 2 hours with a projector, my name is Heba",
+    "Book a room tomorrow at 2 PM for 2 hours for 5 people, my name is Heba",
+    "Book a room tomorrow at 2 PM for 2 hours for 5 people with a projector",
+    # A field is given twice
+    "Tomorrow or Friday at 2 PM for 2 hours for 5 people with a projector, my name is Heba",
+    "Tomorrow at 2 PM or 3 PM for 2 hours for 5 people with a projector, my name is Heba",
+    "Tomorrow at 2 PM for 2 hours for 5 people or 6 people with a projector, my name is Heba",
+    "Tomorrow at 2 PM for 5 people with a projector, my name is Heba, I am Omar",
+    # Ambiguous or invalid
+    "Next Friday at 2 PM for 2 hours for 5 people with a projector, my name is Heba",
+    "Tomorrow at 14 PM for 2 hours for 5 people with a projector, my name is Heba",
+    "Tomorrow at 2 for 2 hours for 5 people with a projector, my name is Heba",
+    "February 30 at 2 PM for 2 hours for 5 people with a projector, my name is Heba",
+    "Tomorrow at 2 PM for 0 hours for 5 people with a projector, my name is Heba",
+    "Tomorrow at 2 PM for 2 hours for 0 people with a projector, my name is Heba",
+    # In the past
+    "Today at 8 AM for 2 hours for 5 people with a projector, my name is Heba",
+])
+def test_rejects_incomplete_or_ambiguous_requests(text):
+    assert fast_parse_request(text, NOW, VOCABULARY) is None
+
+
+def test_extract_date_forms():
+    today = NOW.date()
+    assert extract_date("today", today) == today
+    assert extract_date("the day after tomorrow", today) == date(2030, 3, 6)
+    # A weekday is always in the future, even the same weekday as today
+    assert extract_date("on monday", today) == date(2030, 3, 11)
+    # Past month days roll over to next year
+    assert extract_date("Jan 5", today) == date(2031, 1, 5)
+    assert extract_date("5 Jan", today) == date(2031, 1, 5)
+    # The same date written twice is still one date
+    assert extract_date("tomorrow, 2030-03-05", today) == date(2030, 3, 5)
+    assert extract_date("2030-13-01", today) is None
+
+
+def test_extract_time_duration_and_equipment():
+    assert extract_time("at 12:05 a.m.") == "12:05:00 AM"
+    assert extract_time("at 10:75 am") is None
+    assert extract_time("at noon, that is 12 PM") == "12:00:00 PM"
+    assert extract_duration("for 90 mins") == 1.5
+    assert extract_duration("for 1 hour, that is for 60 minutes") == 1
+    assert extract_duration("for two hours or for three hours") is None
+    # The longer name wins and is not read again as the shorter one
+    assert extract_equipments("a 4k projector please", VOCABULARY) == ["4K Projector"]
+    assert extract_equipments("projectors", VOCABULARY) is None
+    assert extract_equipments("no room", VOCABULARY) is None
@@ -0,0 +1,103 @@
+import copy
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock_apis import booking_services
+from mock_apis.booking_index import BookingIndex
+from mock_apis.booking_services import (
+    InstrumentedBookingStore, JsonBookingStore, get_room_reserved_time_slots,
+)
+from mock_apis.free_slots import find_free_slots
+
+START = datetime(2030, 3, 4, 8, 0)
+
+
+def brute_force_free_slots(starts, ends, window_start, window_end, min_duration):
+    """Maximal free runs of whole seconds inside the window."""
+    free = [True] * (window_end - window_start)
+    for start, end in zip(starts, ends):
+        for t in range(max(start, window_start), min(end, window_end)):
+            free[t - window_start] = False
+    slots, run_start = [], None
+    for offset, is_free in enumerate(free + [False]):
+        if is_free and run_start is None:
+            run_start = offset
+        elif not is_free and run_start is not None:
+            if offset - run_start >= max(min_duration, 1):
+                slots.append((window_start + run_start, window_start + offset))
+            run_start = None
+    return slots
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_free_slots_matches_brute_force(seed):
+    rng = random.Random(seed)
+    room_intervals = {}
+    for room_id in range(rng.randint(1, 6)):
+        starts, ends = [], []
+        for _ in range(rng.randint(0, 12)):
+            start = rng.randrange(-50, 1000)
+            starts.append(start)
+            ends.append(start + rng.randint(1, 150))
+        room_intervals[str(room_id)] = (starts, ends)
+    window_start = rng.randrange(0, 300)
+    window_end = window_start + rng.randint(0, 700)
+    min_duration = rng.choice([0, 1, 10, 60, 200])
+
+    free_slots = find_free_slots(room_intervals, window_start, window_end, min_duration=min_duration)
+    assert set(free_slots) == set(room_intervals)
+    for room_id, (starts, ends) in room_intervals.items():
+        assert sorted(free_slots[room_id]) == brute_force_free_slots(
+            starts, ends, window_start, window_end, min_duration)
+
+
+def test_find_free_slots_edge_cases():
+    assert find_free_slots({}, 0, 100) == {}
+    assert find_free_slots({"1": ([], [])}, 100, 100) == {"1": []}
+    assert find_free_slots({"1": ([], [])}, 0, 100, min_duration=101) == {"1": []}
+    # Touching and overlapping bookings leave no gap between them
+    assert find_free_slots({"1": ([10, 20, 25], [20, 30, 40])}, 0, 100) == {"1": [(0, 10), (40, 100)]}
+
+
+def test_reserved_time_slots_include_the_delay():
+    bookings = {"1": [{"start_time": START.isoformat(),
+                       "end_time": (START + timedelta(hours=1)).isoformat(), "booked_by": "Heba"}]}
+    window_end = START + timedelta(hours=4)
+    slots = get_room_reserved_time_slots(1, bookings, START - timedelta(hours=2), window_end, duration_hours=1)
+    assert slots == [
+        {"start_time": (START - timedelta(hours=2)).isoformat(), "end_time": START.isoformat()},
+        {"start_time": (START + timedelta(hours=1.5)).isoformat(), "end_time": window_end.isoformat()},
+    ]
+    by_room = get_room_reserved_time_slots(["1", 2], BookingIndex.from_bookings(bookings),
+                                           START, START + timedelta(hours=2), duration_hours=1)
+    assert by_room == {"1": [], "2": [{"start_time": START.isoformat(),
+                                       "end_time": (START + timedelta(hours=2)).isoformat()}]}
+
+
+def test_suggest_alternative_times(tmp_path, monkeypatch):
+    from booking_agent import nodes
+    from booking_agent.prompt_config import DEFAULT_AGENT_STATE
+
+    store = InstrumentedBookingStore(JsonBookingStore(tmp_path / "bookings.json"), "json")
+    monkeypatch.setattr(booking_services, "_BOOKING_STORE", store)
+    start = (datetime.now() + timedelta(days=2)).replace(hour=10, minute=0, second=0, microsecond=0)
+    store.book(1, start.isoformat(), (start + timedelta(hours=2)).isoformat(), "Omar")
+    rooms = [{"id": 1, "name": "Executive Suite", "capacity": 8, "equipments": []},
+             {"id": 2, "name": "Tech Hub", "capacity": 12, "equipments": []}]
+
+    state = copy.deepcopy(DEFAULT_AGENT_STATE)
+    state.update({
+        "parsed_request": {"start_date": start.strftime("%Y-%m-%d"), "start_time": start.strftime("%I:%M:%S %p"),
+                           "duration_hours": 1, "capacity": 4, "equipments": [], "user_name": "Heba"},
+        "matching_rooms": rooms,
+        "unavailable_rooms": rooms[:1],
+    })
+    state = nodes.suggest_alternative_times(state)
+    assert state["error_message"] is None
+    # Busy until 12:00, plus the 30 minutes buffer
+    assert "Executive Suite: free from" in state["llm_response"]
+    assert f"{start + timedelta(hours=2.5):%a %d %b %I:%M %p}" in state["llm_response"]
+    assert "Tech Hub" not in state["llm_response"]
+    assert state["messages"][-1].content == state["llm_response"]
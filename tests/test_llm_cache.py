@@ -0,0 +1,61 @@
+import pytest
+
+from booking_agent import llm_cache
+from booking_agent.llm_cache import LRUTTLCache, normalize_context, parse_cache_key
+from config import PARSE_CACHE_TIME_BUCKET_MINUTES
+
+BUCKET = PARSE_CACHE_TIME_BUCKET_MINUTES * 60
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_evicts_the_least_recently_used(clock):
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+    assert stats["hit_rate"] == 0.75
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUTTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    clock[0] += 60
+    assert cache.get("a") == 1
+    clock[0] += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = LRUTTLCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_key_buckets_the_current_time():
+    context = "Book a room  at 2 PM\nfor Heba"
+    start = 1_900_000_000 // BUCKET * BUCKET
+    key = parse_cache_key(context, "2030-03-04", start)
+    assert parse_cache_key(context, "2030-03-04", start + BUCKET - 1) == key
+    assert parse_cache_key(context, "2030-03-04", start + BUCKET) != key
+    assert parse_cache_key(context, "2030-03-04", start - 1) != key
+    assert parse_cache_key(context, "2030-03-05", start) != key
+
+
+def test_key_ignores_case_and_whitespace_only():
+    assert normalize_context("  Book a ROOM\n\tat 2 PM ") == "book a room at 2 pm"
+    assert parse_cache_key("Book a room for Heba", "2030-03-04", 0) == \
+        parse_cache_key("book  a room\nfor heba ", "2030-03-04", 0)
+    assert parse_cache_key("Book a room for Heba", "2030-03-04", 0) != \
+        parse_cache_key("Book a room for Omar", "2030-03-04", 0)
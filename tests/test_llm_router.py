@@ -0,0 +1,170 @@
+# tests/test_llm_router.py
+import time
+import asyncio
+import threading
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from booking_agent.llm_router import LLMRouter, NoProviderAvailable, ProviderHealth
+
+
+class FakeProvider:
+    """Local stand-in for a chat model: answers, fails or blocks on demand."""
+
+    def __init__(self, name, fail=False, gate=None):
+        self.name = name
+        self.fail = fail
+        self.gate = gate
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, input):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if self.gate is not None:
+                self.gate.wait(5)
+            else:
+                time.sleep(0.01)
+        finally:
+            with self._lock:
+                self.running -= 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return f"{self.name}: {input}"
+
+    def loader(self):
+        return RunnableLambda(self)
+
+
+def make_router(*providers, acquire_timeout=1.0, **health):
+    return LLMRouter(
+        {provider.name: provider.loader for provider in providers},
+        health_factory=lambda: ProviderHealth(**health),
+        acquire_timeout=acquire_timeout,
+    )
+
+
+def test_prefers_first_provider():
+    primary, fallback = FakeProvider("primary"), FakeProvider("fallback")
+    router = make_router(primary, fallback)
+    assert router.invoke("hi") == "primary: hi"
+    assert fallback.calls == 0
+
+
+def test_fails_over_to_next_provider():
+    primary, fallback = FakeProvider("primary", fail=True), FakeProvider("fallback")
+    router = make_router(primary, fallback)
+    assert router.invoke("hi") == "fallback: hi"
+    assert router.stats()["primary"]["error_rate"] == 1.0
+
+
+def test_raises_when_every_provider_fails():
+    router = make_router(FakeProvider("a", fail=True), FakeProvider("b", fail=True))
+    with pytest.raises(NoProviderAvailable, match="a is down"):
+        router.invoke("hi")
+
+
+def test_circuit_opens_after_consecutive_failures():
+    primary = FakeProvider("primary", fail=True)
+    router = make_router(primary, failure_threshold=2, cooldown=60)
+    for _ in range(2):
+        with pytest.raises(NoProviderAvailable):
+            router.invoke("hi")
+    assert router.stats()["primary"]["state"] == "open"
+    # An open circuit rejects calls without reaching the provider
+    with pytest.raises(NoProviderAvailable, match="circuits open"):
+        router.invoke("hi")
+    assert primary.calls == 2
+
+
+def test_open_circuit_is_skipped_for_the_fallback():
+    primary, fallback = FakeProvider("primary", fail=True), FakeProvider("fallback")
+    router = make_router(primary, fallback, failure_threshold=1, cooldown=60)
+    assert router.invoke("hi") == "fallback: hi"
+    assert router.invoke("hi") == "fallback: hi"
+    assert primary.calls == 1
+
+
+def test_half_open_trial_closes_the_circuit():
+    primary = FakeProvider("primary", fail=True)
+    router = make_router(primary, failure_threshold=1, cooldown=0.05)
+    with pytest.raises(NoProviderAvailable):
+        router.invoke("hi")
+    assert router.stats()["primary"]["state"] == "open"
+    time.sleep(0.06)
+    assert router.stats()["primary"]["state"] == "half_open"
+    primary.fail = False
+    assert router.invoke("hi") == "primary: hi"
+    assert router.stats()["primary"]["state"] == "closed"
+
+
+def test_failed_trial_reopens_the_circuit():
+    primary = FakeProvider("primary", fail=True)
+    router = make_router(primary, failure_threshold=1, cooldown=0.05)
+    with pytest.raises(NoProviderAvailable):
+        router.invoke("hi")
+    time.sleep(0.06)
+    with pytest.raises(NoProviderAvailable):
+        router.invoke("hi")
+    assert primary.calls == 2
+    assert router.stats()["primary"]["state"] == "open"
+
+
+def test_call_waits_for_a_slot_at_the_in_flight_cap():
+    gate = threading.Event()
+    provider = FakeProvider("only", gate=gate)
+    router = make_router(provider, max_in_flight=1, acquire_timeout=2.0)
+    results = []
+    first = threading.Thread(target=lambda: results.append(router.invoke("first")))
+    first.start()
+    while router.stats()["only"]["in_flight"] == 0:
+        time.sleep(0.001)
+    second = threading.Thread(target=lambda: results.append(router.invoke("second")))
+    second.start()
+    time.sleep(0.05)
+    # The second call is queued, not rejected, and never exceeds the cap
+    assert provider.calls == 1
+    gate.set()
+    first.join(2)
+    second.join(2)
+    assert sorted(results) == ["only: first", "only: second"]
+    assert router.stats()["only"]["in_flight"] == 0
+
+
+def test_call_gives_up_after_the_acquire_timeout():
+    gate = threading.Event()
+    router = make_router(FakeProvider("only", gate=gate), max_in_flight=1, acquire_timeout=0.05)
+    first = threading.Thread(target=router.invoke, args=("first",))
+    first.start()
+    while router.stats()["only"]["in_flight"] == 0:
+        time.sleep(0.001)
+    try:
+        with pytest.raises(NoProviderAvailable):
+            router.invoke("second")
+    finally:
+        gate.set()
+        first.join(2)
+
+
+def test_ainvoke_fails_over():
+    router = make_router(FakeProvider("primary", fail=True), FakeProvider("fallback"))
+    assert asyncio.run(router.ainvoke("hi")) == "fallback: hi"
+
+
+def test_batch_items_each_take_an_in_flight_slot():
+    provider = FakeProvider("only")
+    router = make_router(provider, max_in_flight=2)
+    results = router.batch([str(i) for i in range(6)])
+    assert results == [f"only: {i}" for i in range(6)]
+    assert provider.max_running <= 2
+
+
+def test_batch_items_fail_over_on_their_own():
+    router = make_router(FakeProvider("primary", fail=True), FakeProvider("fallback"))
+    assert router.batch(["a", "b"]) == ["fallback: a", "fallback: b"]
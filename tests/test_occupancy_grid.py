@@ -0,0 +1,106 @@
+import random
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock_apis.booking_index import BookingIndex, to_epoch
+from mock_apis.occupancy_grid import DAY_SECONDS
+
+START = datetime(2030, 3, 4)
+
+
+def random_index(rng, rooms, days, max_days, per_room=30):
+    index = BookingIndex(max_days=max_days)
+    bookings = {}
+    for room_id in rng.sample(range(1, rooms * 3), rooms):
+        for _ in range(rng.randint(0, per_room)):
+            start = START + timedelta(minutes=5 * rng.randrange(days * 288))
+            end = start + timedelta(minutes=5 * rng.randint(1, 48))
+            index.add(room_id, start, end)
+            bookings.setdefault(str(room_id), []).append((to_epoch(start), to_epoch(end) + index.delay_seconds))
+    return index, bookings
+
+
+def overlaps(intervals, start, end):
+    return any(s < end and e > start for s, e in intervals)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("max_days", [1, 3, 90])
+def test_free_rooms_match_brute_force(seed, max_days):
+    rng = random.Random(seed)
+    index, bookings = random_index(rng, rooms=rng.randint(1, 40), days=8, max_days=max_days)
+    room_ids = [str(room_id) for room_id in range(1, 121)]
+    for _ in range(60):
+        start = START + timedelta(minutes=5 * rng.randrange(8 * 288))
+        end = start + timedelta(minutes=5 * rng.randint(1, 288 * rng.choice([1, 1, 5])))
+        queried = rng.sample(room_ids, rng.randint(1, 30))
+        expected = [not overlaps(bookings.get(room_id, []), to_epoch(start), to_epoch(end)) for room_id in queried]
+        assert index.free_rooms(queried, start, end_time=end) == expected
+        # The grid may only flag more rooms than really busy, never fewer
+        busy = index.grid.busy(queried, to_epoch(start), to_epoch(end))
+        assert all(flagged for flagged, free in zip(busy, expected) if not free)
+        assert len(index.grid.days) <= max(1, max_days)
+
+
+def test_query_spanning_more_days_than_kept():
+    index = BookingIndex(max_days=2)
+    # Room 1 is first seen on the first day, room 2 on the last one
+    index.add(1, START + timedelta(hours=9), START + timedelta(hours=10))
+    index.add(2, START + timedelta(days=4, hours=9), START + timedelta(days=4, hours=10))
+    start, end = to_epoch(START), to_epoch(START + timedelta(days=5))
+    assert list(index.grid.busy(["1", "2", "3"], start, end)) == [True, True, False]
+    assert index.free_rooms(["1", "2", "3"], START, end_time=START + timedelta(days=5)) == [False, False, True]
+
+
+def test_bookings_added_after_a_day_was_materialized():
+    index = BookingIndex()
+    day_start, day_end = START + timedelta(hours=8), START + timedelta(hours=18)
+    assert index.free_rooms(["1", "2"], day_start, end_time=day_end) == [True, True]
+    index.add(2, START + timedelta(hours=12), START + timedelta(hours=13))
+    # Many new rooms grow the rows of the materialized day
+    for room_id in range(100, 140):
+        index.add(room_id, START + timedelta(hours=8), START + timedelta(hours=9))
+    assert index.free_rooms(["1", "2", "120"], day_start, end_time=day_end) == [True, False, False]
+    assert index.free_rooms(["2"], START + timedelta(hours=14), duration_hours=1) == [True]
+
+
+def test_boundary_slots_are_rechecked_exactly():
+    index = BookingIndex()
+    index.add(1, START + timedelta(hours=9), START + timedelta(hours=9, minutes=5))
+    # Same 15-minute slot as the buffer end (09:35), but after it
+    assert index.free_rooms(["1"], START + timedelta(hours=9, minutes=40), duration_hours=1) == [True]
+    assert list(index.grid.busy(["1"], to_epoch(START + timedelta(hours=9, minutes=40)),
+                                to_epoch(START + timedelta(hours=10, minutes=40)))) == [True]
+
+
+def test_empty_or_inverted_ranges_are_free():
+    index = BookingIndex()
+    index.add(1, START, START + timedelta(hours=1))
+    assert list(index.grid.busy(["1"], to_epoch(START), to_epoch(START))) == [False]
+    assert not index.grid.busy(["1"], to_epoch(START) + DAY_SECONDS, to_epoch(START)).any()
+
+
+def test_concurrent_adds_and_queries_agree_with_the_index():
+    index = BookingIndex(max_days=2)
+    errors = []
+
+    def book(worker):
+        rng = random.Random(worker)
+        for i in range(200):
+            room_id = f"{worker}-{i}"
+            start = START + timedelta(days=rng.randrange(5), hours=rng.randrange(20))
+            try:
+                index.add(room_id, start, start + timedelta(hours=1))
+                if index.free_rooms([room_id], start, duration_hours=1) != [False]:
+                    errors.append(room_id)
+            except Exception as e:  # row growth racing a write used to raise IndexError
+                errors.append(repr(e))
+
+    threads = [threading.Thread(target=book, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from mock_apis.room_catalog import RoomCatalog
+
+EQUIPMENTS = [f"Equipment {i}" for i in range(70)]  # more than one 64-bit word
+
+
+def random_rooms(rng, count):
+    return [
+        {"id": room_id, "name": f"Room {room_id}", "capacity": rng.choice([2, 4, 8, 10, 20]),
+         "equipments": rng.sample(EQUIPMENTS[:rng.choice([3, 10, 70])], rng.randint(0, 3))}
+        for room_id in range(1, count + 1)
+    ]
+
+
+def brute_force_similar(rooms, capacity, equipments, top_n):
+    wanted = set(equipments)
+    scored = [(len(wanted & set(room["equipments"])), -pos) for pos, room in enumerate(rooms)
+              if room["capacity"] >= (capacity or 0)]
+    scored = sorted((score for score in scored if score[0] > 0), reverse=True)
+    return [rooms[-pos] for _, pos in scored[:top_n]]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_find_similar_matches_brute_force(seed):
+    rng = random.Random(seed)
+    # Enough rooms for the scan to go through several chunks
+    rooms = random_rooms(rng, rng.choice([1, 50, 20_000]))
+    catalog = RoomCatalog(rooms)
+    for _ in range(40):
+        capacity = rng.choice([None, 0, 4, 10, 21])
+        equipments = rng.sample(EQUIPMENTS, rng.randint(1, 4)) + rng.choice([[], ["nothing"], ["Unknown"]])
+        top_n = rng.choice([0, 1, 3, 10])
+        assert catalog.find_similar(capacity, equipments, top_n=top_n) == \
+            brute_force_similar(rooms, capacity, equipments, top_n)
+
+
+def test_find_similar_ties_keep_catalog_order():
+    rooms = [{"id": i, "name": f"Room {i}", "capacity": capacity, "equipments": ["Projector"]}
+             for i, capacity in enumerate([20, 2, 10, 4, 8])]
+    catalog = RoomCatalog(rooms)
+    assert [room["id"] for room in catalog.find_similar(4, ["Projector"])] == [0, 2, 3]
+    assert catalog.find_similar(4, ["nothing"]) == []
+    assert catalog.find_similar(4, []) == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rooms = random_rooms(rng, 300)
+    catalog = RoomCatalog(rooms)
+    for _ in range(100):
+        capacity = rng.choice([None, 4, 10, 21])
+        equipments = rng.sample(EQUIPMENTS[:10], rng.randint(0, 2)) + rng.choice([[], ["nothing"]])
+        expected = [room for room in rooms if room["capacity"] >= (capacity or 0)
+                    and set(equipments) - {"nothing"} <= set(room["equipments"])]
+        assert catalog.find(capacity, equipments) == expected
+
+
+def test_room_lists_are_indexed_once():
+    from mock_apis.room_services import catalog_for, find_matching_rooms_tool
+
+    rooms = random_rooms(random.Random(0), 50)
+    catalog = catalog_for(rooms)
+    assert catalog_for(rooms) is catalog
+    assert find_matching_rooms_tool(rooms, capacity=10, equipments=[]) == \
+        [room for room in rooms if room["capacity"] >= 10]
+    assert catalog_for(rooms) is catalog
+
+    # A list that grew, or an equal copy, is indexed on its own
+    rooms.append({"id": 51, "name": "Room 51", "capacity": 30, "equipments": []})
+    assert find_matching_rooms_tool(rooms, capacity=10, equipments=[])[-1]["id"] == 51
+    assert catalog_for(rooms) is not catalog
+    assert catalog_for(list(rooms)) is not catalog_for(rooms)
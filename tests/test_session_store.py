@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from flask import Flask, session
+
+from session_store import (
+    MemorySessionBackend, ServerSideSessionInterface, SqliteSessionBackend, create_session_interface,
+)
+
+BACKENDS = {
+    "memory": lambda tmp_path: MemorySessionBackend(maxsize=8),
+    "sqlite": lambda tmp_path: SqliteSessionBackend(tmp_path / "sessions.db", purge_every=2),
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, tmp_path):
+    return BACKENDS[request.param](tmp_path)
+
+
+def test_backend_stores_until_expiry(backend):
+    backend.set("a", {"messages": ["hi"]}, time.time() + 60)
+    backend.set("old", {"messages": []}, time.time() - 1)
+    assert backend.get("a") == {"messages": ["hi"]}
+    assert backend.get("old") is None
+    assert backend.get("missing") is None
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_sqlite_purges_expired_rows(tmp_path):
+    backend = SqliteSessionBackend(tmp_path / "sessions.db", purge_every=2)
+    backend.set("old", {}, time.time() - 1)
+    backend.set("new", {}, time.time() + 60)
+    count = backend._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    assert count == 1
+    # Another connection, as another worker process would open, sees the same sessions
+    assert SqliteSessionBackend(tmp_path / "sessions.db").get("new") == {}
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemorySessionBackend(maxsize=2)
+    expires_at = time.time() + 60
+    backend.set("a", {"n": 1}, expires_at)
+    backend.set("b", {"n": 2}, expires_at)
+    backend.get("a")
+    backend.set("c", {"n": 3}, expires_at)
+    assert backend.get("b") is None
+    assert backend.get("a") == {"n": 1}
+    # Live objects are kept, not copies
+    assert backend.get("c") is backend.get("c")
+
+
+def make_app(backend):
+    app = Flask(__name__)
+    app.secret_key = "test-secret"
+    app.session_interface = ServerSideSessionInterface(backend)
+
+    @app.route("/count")
+    def count():
+        session["count"] = session.get("count", 0) + 1
+        return str(session["count"])
+
+    @app.route("/clear")
+    def clear():
+        session.clear()
+        return ""
+    return app
+
+
+def test_session_round_trips_through_the_cookie(backend):
+    app = make_app(backend)
+    client = app.test_client()
+    assert client.get("/count").get_data(as_text=True) == "1"
+    cookie = client.get_cookie("session")
+    sid = ServerSideSessionInterface(backend).unsign_sid(app, cookie.value)
+    assert backend.get(sid) == {"count": 1}
+    # The cookie only carries the signed id and is not sent again
+    response = client.get("/count")
+    assert response.get_data(as_text=True) == "2"
+    assert "Set-Cookie" not in response.headers
+    assert backend.get(sid) == {"count": 2}
+
+    client.get("/clear")
+    assert backend.get(sid) is None
+
+
+def test_tampered_cookie_starts_a_new_session(backend):
+    app = make_app(backend)
+    client = app.test_client()
+    client.get("/count")
+    sid = ServerSideSessionInterface(backend).unsign_sid(app, client.get_cookie("session").value)
+    client.set_cookie("session", sid + ".forged")
+    assert client.get("/count").get_data(as_text=True) == "1"
+    assert ServerSideSessionInterface(backend).unsign_sid(app, None) is None
+
+
+def test_create_session_interface_rejects_unknown_backends():
+    assert isinstance(create_session_interface("Memory").backend, MemorySessionBackend)
+    with pytest.raises(ValueError):
+        create_session_interface("redis")